@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import argparse
 import pygame
 import os
 
@@ -36,7 +37,23 @@ def create_block_images():
     pygame.quit()
     print("🎨 Imagens dos blocos criadas com sucesso!")
 
+def pack_assets(output_path):
+    from game.asset_pack import write_pack
+
+    count, size = write_pack(output_path)
+    print(f"📦 {count} arquivos de images/ e sounds/ empacotados em {output_path} ({size / 1024:.0f} KB)")
+
 if __name__ == "__main__":
-    if not os.path.exists("images"):
-        os.makedirs("images")
-    create_block_images()
+    from game.asset_pack import DEFAULT_PACK_PATH
+
+    parser = argparse.ArgumentParser(description="Gera as imagens dos blocos ou o pacote de assets do jogo")
+    parser.add_argument("--pack", nargs="?", const=DEFAULT_PACK_PATH, default=None, metavar="ARQUIVO",
+                        help=f"empacota images/ e sounds/ em um único arquivo (padrão: {DEFAULT_PACK_PATH})")
+    args = parser.parse_args()
+
+    if args.pack:
+        pack_assets(args.pack)
+    else:
+        if not os.path.exists("images"):
+            os.makedirs("images")
+        create_block_images()
@@ -0,0 +1,82 @@
+import hashlib
+import os
+import struct
+import pygame
+
+CACHE_VERSION = 1
+CACHE_MAGIC = b"BOOMSPR"
+CACHE_HEADER = struct.Struct("<7sBHH4s")
+
+def default_cache_dir():
+    base = os.environ.get("BOOM_CACHE_DIR")
+    if not base:
+        base = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                            "boom_terra_ooo")
+    return os.path.join(base, "sprites")
+
+class SpriteCache:
+    def __init__(self, cache_dir=None, enabled=True, assets=None):
+        self.assets = assets
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.enabled = enabled and os.environ.get("BOOM_SPRITE_CACHE", "1") != "0"
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, path, variant, size, pixel_format="RGBA"):
+        try:
+            mtime = self.assets.mtime(path) if self.assets else os.stat(path).st_mtime_ns
+        except (OSError, KeyError):
+            return None
+
+        return (os.path.abspath(path), mtime, tuple(size) if isinstance(size, (tuple, list)) else size,
+                variant, pixel_format)
+
+    def entry_path(self, key):
+        digest = hashlib.sha1(repr((CACHE_VERSION,) + key).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest + ".spr")
+
+    def load(self, key):
+        if not self.enabled or key is None:
+            return None
+
+        try:
+            with open(self.entry_path(key), "rb") as cache_file:
+                header = cache_file.read(CACHE_HEADER.size)
+                magic, version, width, height, pixel_format = CACHE_HEADER.unpack(header)
+                pixels = cache_file.read()
+        except (OSError, struct.error):
+            self.misses += 1
+            return None
+
+        pixel_format = pixel_format.rstrip(b"\0").decode("ascii")
+        if magic != CACHE_MAGIC or version != CACHE_VERSION or pixel_format != key[4]:
+            self.misses += 1
+            return None
+
+        if len(pixels) != width * height * len(pixel_format):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return pygame.image.frombytes(pixels, (width, height), pixel_format)
+
+    def store(self, key, surface):
+        if not self.enabled or key is None:
+            return False
+
+        pixel_format = key[4]
+        width, height = surface.get_size()
+        header = CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, width, height, pixel_format.encode("ascii"))
+
+        path = self.entry_path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, "wb") as cache_file:
+                cache_file.write(header)
+                cache_file.write(pygame.image.tobytes(surface, pixel_format))
+            os.replace(temp_path, path)
+        except OSError:
+            return False
+
+        return True
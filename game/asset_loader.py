@@ -0,0 +1,165 @@
+import heapq
+import itertools
+import threading
+import time
+
+LOAD_PRIORITY_URGENT = -1
+LOAD_PRIORITY_MENU = 0
+LOAD_PRIORITY_MATCH = 1
+LOAD_PRIORITY_THEMES = 2
+LOAD_PRIORITY_LAST = 3
+
+class AssetGroup:
+    def __init__(self, name, priority, requests, finalize, lazy=False):
+        self.name = name
+        self.priority = priority
+        self.requests = list(requests)
+        self.keys = [(path, variant) for path, variant, _ in self.requests]
+        self.finalize = finalize
+        self.requested = not lazy
+        self.finalized = False
+
+class AssetLoader:
+    def __init__(self, decode, workers=1):
+        self.decode = decode
+        self.workers = max(1, workers)
+        self.groups = {}
+        self.results = {}
+        self.claimed = set()
+        self.decoded = set()
+        self.queue = []
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.threads = []
+        self.closed = False
+
+    def add_group(self, name, priority, requests, finalize, lazy=False):
+        # Grupos lazy só entram na fila quando alguém pede por eles (prioritize/wait)
+        group = AssetGroup(name, priority, requests, finalize, lazy)
+        self.groups[name] = group
+        if group.requested:
+            self.enqueue(group, priority)
+        return group
+
+    def enqueue(self, group, priority):
+        with self.condition:
+            for path, variant, size in group.requests:
+                if (path, variant) not in self.claimed:
+                    heapq.heappush(self.queue, (priority, next(self.sequence), path, variant, size))
+            self.condition.notify_all()
+
+    def start(self):
+        if self.threads:
+            return
+        for index in range(self.workers):
+            thread = threading.Thread(target=self.worker, name=f"asset-loader-{index}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def worker(self):
+        while True:
+            with self.condition:
+                while not self.closed and not self.queue:
+                    self.condition.wait()
+                if self.closed:
+                    return
+                _, _, path, variant, size = heapq.heappop(self.queue)
+                key = (path, variant)
+                if key in self.claimed:
+                    continue
+                self.claimed.add(key)
+
+            try:
+                result = self.decode(path, variant, size)
+            except Exception as e:
+                print(f"⚠️ Falha ao decodificar {path} em segundo plano: {e}")
+                result = None
+
+            with self.condition:
+                self.results[key] = result
+                self.decoded.add(key)
+                self.condition.notify_all()
+
+    def take(self, key):
+        # Chave em andamento num worker: espera o resultado em vez de decodificar duas vezes.
+        # Chave ainda na fila: fica reservada para quem chamou e o worker a descarta
+        with self.condition:
+            while key in self.claimed and key not in self.decoded and not self.closed:
+                self.condition.wait()
+            if key not in self.claimed:
+                self.claimed.add(key)
+                self.decoded.add(key)
+            return self.results.pop(key, None)
+
+    def prioritize(self, names, priority=LOAD_PRIORITY_URGENT):
+        for name in names:
+            group = self.groups.get(name)
+            if group is None or group.finalized:
+                continue
+            if not group.requested or priority < group.priority:
+                group.requested = True
+                group.priority = min(priority, group.priority)
+                self.enqueue(group, group.priority)
+
+    def is_decoded(self, group):
+        if not self.threads:
+            return True
+        with self.condition:
+            return self.decoded.issuperset(group.keys)
+
+    def is_ready(self, names):
+        return all(self.groups[name].finalized for name in names if name in self.groups)
+
+    def pending_groups(self):
+        return [group for group in self.groups.values() if group.requested and not group.finalized]
+
+    def finalize(self, group):
+        if group.finalized:
+            return
+        group.finalized = True
+        group.finalize()
+
+    def pump(self, budget_ms=4.0):
+        started = time.perf_counter()
+        finalized = 0
+
+        for group in sorted(self.pending_groups(), key=lambda group: group.priority):
+            if not self.is_decoded(group):
+                continue
+            self.finalize(group)
+            finalized += 1
+            if (time.perf_counter() - started) * 1000 >= budget_ms:
+                break
+
+        return finalized
+
+    def wait(self, names, timeout=None):
+        names = [name for name in names if name in self.groups]
+        self.prioritize(names)
+        deadline = None if timeout is None else time.perf_counter() + timeout
+
+        for name in names:
+            group = self.groups[name]
+            with self.condition:
+                while self.threads and not self.closed and not self.decoded.issuperset(group.keys):
+                    remaining = None if deadline is None else deadline - time.perf_counter()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self.condition.wait(0.05 if remaining is None else min(0.05, remaining))
+            self.finalize(group)
+
+        return True
+
+    def progress(self):
+        requested = [group for group in self.groups.values() if group.requested]
+        done = len([group for group in requested if group.finalized])
+        return done, len(requested)
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.queue = []
+            self.condition.notify_all()
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
@@ -0,0 +1,173 @@
+import io
+import json
+import mmap
+import os
+import struct
+import pygame
+
+PACK_MAGIC = b"BOOMPAK\0"
+PACK_VERSION = 1
+PACK_HEADER = struct.Struct("<8sII")
+PACK_ALIGNMENT = 16
+PACK_DIRECTORIES = ["images", "sounds"]
+DEFAULT_PACK_PATH = "assets.pak"
+
+def normalize_asset_path(path):
+    return os.path.normpath(path).replace(os.sep, "/")
+
+def align(offset):
+    return offset + (-offset % PACK_ALIGNMENT)
+
+class BlobReader(io.RawIOBase):
+    def __init__(self, view):
+        self.view = view
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), len(self.view) - self.position)
+        if size <= 0:
+            return 0
+        buffer[:size] = self.view[self.position:self.position + size]
+        self.position += size
+        return size
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self.position = offset
+        elif whence == io.SEEK_CUR:
+            self.position += offset
+        else:
+            self.position = len(self.view) + offset
+        self.position = max(0, self.position)
+        return self.position
+
+    def tell(self):
+        return self.position
+
+class AssetPack:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(self.data)
+
+        magic, version, index_size = PACK_HEADER.unpack_from(self.data, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            self.close()
+            raise ValueError(f"Pacote de assets inválido: {path}")
+
+        index_start = PACK_HEADER.size
+        self.index = json.loads(bytes(self.buffer[index_start:index_start + index_size]).decode("utf-8"))
+        self.data_start = align(index_start + index_size)
+
+    def __contains__(self, path):
+        return normalize_asset_path(path) in self.index
+
+    def view(self, path):
+        offset, length, _ = self.index[normalize_asset_path(path)]
+        start = self.data_start + offset
+        return self.buffer[start:start + length]
+
+    def open(self, path):
+        return BlobReader(self.view(path))
+
+    def mtime(self, path):
+        return self.index[normalize_asset_path(path)][2]
+
+    def close(self):
+        if self.buffer is not None:
+            self.buffer.release()
+            self.buffer = None
+        if self.data is not None:
+            self.data.close()
+            self.data = None
+        self.file.close()
+
+def collect_asset_files(root=".", directories=PACK_DIRECTORIES):
+    files = []
+    for directory in directories:
+        base = os.path.join(root, directory)
+        for folder, _, names in os.walk(base):
+            for name in sorted(names):
+                full_path = os.path.join(folder, name)
+                files.append((normalize_asset_path(os.path.relpath(full_path, root)), full_path))
+    return sorted(files)
+
+def write_pack(output_path=DEFAULT_PACK_PATH, root=".", directories=PACK_DIRECTORIES):
+    files = collect_asset_files(root, directories)
+
+    index = {}
+    offset = 0
+    for asset_path, full_path in files:
+        size = os.path.getsize(full_path)
+        index[asset_path] = [offset, size, os.stat(full_path).st_mtime_ns]
+        offset = align(offset + size)
+
+    index_bytes = json.dumps(index, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+    temp_path = output_path + ".tmp"
+    with open(temp_path, "wb") as pack_file:
+        pack_file.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(index_bytes)))
+        pack_file.write(index_bytes)
+        pack_file.write(b"\0" * (align(pack_file.tell()) - pack_file.tell()))
+
+        for asset_path, full_path in files:
+            with open(full_path, "rb") as asset_file:
+                blob = asset_file.read()
+            pack_file.write(blob)
+            pack_file.write(b"\0" * (align(len(blob)) - len(blob)))
+
+    os.replace(temp_path, output_path)
+    return len(files), os.path.getsize(output_path)
+
+class AssetSource:
+    def __init__(self, pack_path=None):
+        self.pack = None
+
+        pack_path = pack_path or os.environ.get("BOOM_ASSET_PACK", DEFAULT_PACK_PATH)
+        if pack_path and os.path.exists(pack_path):
+            try:
+                self.pack = AssetPack(pack_path)
+                print(f"📦 Pacote de assets carregado: {pack_path} ({len(self.pack.index)} arquivos)")
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Pacote de assets ignorado ({pack_path}): {e}")
+                self.pack = None
+
+    def exists(self, path):
+        if self.pack is not None and path in self.pack:
+            return True
+        return os.path.exists(path)
+
+    def open(self, path):
+        if self.pack is not None and path in self.pack:
+            return self.pack.open(path)
+        return open(path, "rb")
+
+    def mtime(self, path):
+        if self.pack is not None and path in self.pack:
+            return self.pack.mtime(path)
+        return os.stat(path).st_mtime_ns
+
+    def load_image(self, path):
+        if self.pack is not None and path in self.pack:
+            return pygame.image.load(self.pack.open(path), path)
+        return pygame.image.load(path)
+
+    def load_sound(self, path):
+        if self.pack is not None and path in self.pack:
+            return pygame.mixer.Sound(file=self.pack.open(path))
+        return pygame.mixer.Sound(path)
+
+_default_source = None
+
+def get_asset_source():
+    global _default_source
+    if _default_source is None:
+        _default_source = AssetSource()
+    return _default_source
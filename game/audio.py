@@ -1,7 +1,27 @@
 import pygame
 import numpy as np
-import math
-import random
+import logging
+from collections import OrderedDict
+from .asset_pack import get_asset_source
+from .voice_pool import VoicePool
+from .music import ChiptuneMusic
+from .tracer import get_tracer
+
+logger = logging.getLogger(__name__)
+
+SOUND_CACHE_SIZE = 32
+SFX_VOICES = 6
+MUSIC_CHANNEL = 1
+
+# nome: (prioridade, vozes simultâneas)
+SOUND_VOICES = {
+    'victory': (4, 1),
+    'game_over': (4, 1),
+    'explosion': (3, 3),
+    'bomb_place': (2, 2),
+    'powerup': (2, 1),
+    'menu': (1, 1)
+}
 
 class AudioManager:
     def __init__(self):
@@ -12,17 +32,24 @@ class AudioManager:
         if not pygame.mixer.get_init():
             pygame.mixer.init(frequency=self.sample_rate, size=-16, channels=2, buffer=512)
         
-        self.sfx_channel = pygame.mixer.Channel(0)
-        self.music_channel = pygame.mixer.Channel(1)
+        if pygame.mixer.get_num_channels() < SFX_VOICES + 1:
+            pygame.mixer.set_num_channels(SFX_VOICES + 1)
+        
+        self.music_channel = pygame.mixer.Channel(MUSIC_CHANNEL)
+        self.voices = VoicePool([i for i in range(SFX_VOICES + 1) if i != MUSIC_CHANNEL])
+        self.music = ChiptuneMusic(self.sample_rate)
         
         self.custom_sounds = {}
-        self.load_custom_sounds()
+        self.sound_cache = OrderedDict()
+        self.tracer = get_tracer()
+        with self.tracer.span('AudioManager.load_custom_sounds'):
+            self.load_custom_sounds()
         
-        print("🔊 Sistema de áudio inicializado")
+        logger.info("🔊 Sistema de áudio inicializado")
     
     def load_custom_sounds(self):
         
-        import os
+        assets = get_asset_source()
         
         sound_files = {
             'bomb_place': 'sounds/client_public_sound_bomb_0.wav',
@@ -31,88 +58,98 @@ class AudioManager:
         
         for sound_name, file_path in sound_files.items():
             try:
-                if os.path.exists(file_path):
-                    self.custom_sounds[sound_name] = pygame.mixer.Sound(file_path)
-                    print(f"🔊 Som personalizado carregado: {sound_name} -> {file_path}")
+                if assets.exists(file_path):
+                    self.custom_sounds[sound_name] = assets.load_sound(file_path)
+                    logger.info("🔊 Som personalizado carregado: %s -> %s", sound_name, file_path)
                 else:
-                    print(f"⚠️ Arquivo de som não encontrado: {file_path}")
+                    logger.warning("⚠️ Arquivo de som não encontrado: %s", file_path)
                     self.custom_sounds[sound_name] = None
             except Exception as e:
-                print(f"❌ Erro ao carregar som {sound_name}: {e}")
+                logger.error("❌ Erro ao carregar som %s: %s", sound_name, e)
                 self.custom_sounds[sound_name] = None
     
+    def cached_sound(self, key, synthesize):
+        sound = self.sound_cache.get(key)
+        if sound is not None:
+            self.sound_cache.move_to_end(key)
+            return sound
+        
+        with self.tracer.span('AudioManager.synthesize', {'sound': repr(key)}):
+            sound = synthesize()
+        self.sound_cache[key] = sound
+        if len(self.sound_cache) > SOUND_CACHE_SIZE:
+            self.sound_cache.popitem(last=False)
+        return sound
+    
+    def make_stereo_sound(self, arr):
+        arr = (arr * 32767).astype(np.int16)
+        return pygame.sndarray.make_sound(np.column_stack((arr, arr)))
+    
     def generate_tone(self, frequency, duration, wave_type='sine', volume=0.5):
+        return self.cached_sound(('tone', frequency, duration, wave_type, volume),
+                                 lambda: self.synthesize_tone(frequency, duration, wave_type, volume))
+    
+    def synthesize_tone(self, frequency, duration, wave_type='sine', volume=0.5):
         frames = int(duration * self.sample_rate)
-        arr = np.zeros(frames)
+        t = np.arange(frames) / self.sample_rate
         
-        for i in range(frames):
-            t = float(i) / self.sample_rate
-            
-            if wave_type == 'sine':
-                arr[i] = volume * math.sin(2 * math.pi * frequency * t)
-            elif wave_type == 'square':
-                arr[i] = volume * (1 if math.sin(2 * math.pi * frequency * t) > 0 else -1)
-            elif wave_type == 'sawtooth':
-                arr[i] = volume * (2 * (t * frequency - math.floor(t * frequency + 0.5)))
-            elif wave_type == 'triangle':
-                arr[i] = volume * (2 * abs(2 * (t * frequency - math.floor(t * frequency + 0.5))) - 1)
+        if wave_type == 'sine':
+            arr = volume * np.sin(2 * np.pi * frequency * t)
+        elif wave_type == 'square':
+            arr = volume * np.where(np.sin(2 * np.pi * frequency * t) > 0, 1.0, -1.0)
+        elif wave_type == 'sawtooth':
+            arr = volume * (2 * (t * frequency - np.floor(t * frequency + 0.5)))
+        elif wave_type == 'triangle':
+            arr = volume * (2 * np.abs(2 * (t * frequency - np.floor(t * frequency + 0.5))) - 1)
+        else:
+            arr = np.zeros(frames)
 
         fade_frames = min(frames // 20, 1000)
-        for i in range(fade_frames):
-            fade_factor = i / fade_frames
-            arr[i] *= fade_factor
-            arr[frames - 1 - i] *= fade_factor
+        if fade_frames > 0:
+            fade = np.arange(fade_frames) / fade_frames
+            arr[:fade_frames] *= fade
+            arr[frames - fade_frames:] *= fade[::-1]
 
-        arr = (arr * 32767).astype(np.int16)
-
-        stereo_arr = np.zeros((frames, 2), dtype=np.int16)
-        stereo_arr[:, 0] = arr
-        stereo_arr[:, 1] = arr
-        
-        return pygame.sndarray.make_sound(stereo_arr)
+        return self.make_stereo_sound(arr)
     
     def generate_noise(self, duration, volume=0.3):
+        return self.cached_sound(('noise', None, duration, 'noise', volume),
+                                 lambda: self.synthesize_noise(duration, volume))
+    
+    def synthesize_noise(self, duration, volume=0.3):
         frames = int(duration * self.sample_rate)
         arr = np.random.uniform(-1, 1, frames) * volume
         
         fade_frames = frames // 4
-        for i in range(fade_frames):
-            fade_factor = 1 - (i / fade_frames)
-            arr[frames - fade_frames + i] *= fade_factor
-        
-     
-        arr = (arr * 32767).astype(np.int16)
-
-        stereo_arr = np.zeros((frames, 2), dtype=np.int16)
-        stereo_arr[:, 0] = arr
-        stereo_arr[:, 1] = arr
+        if fade_frames > 0:
+            arr[frames - fade_frames:] *= 1 - np.arange(fade_frames) / fade_frames
         
-        return pygame.sndarray.make_sound(stereo_arr)
+        return self.make_stereo_sound(arr)
     
     def generate_sweep(self, start_freq, end_freq, duration, volume=0.4):
+        return self.cached_sound(('sweep', (start_freq, end_freq), duration, 'sine', volume),
+                                 lambda: self.synthesize_sweep(start_freq, end_freq, duration, volume))
+    
+    def synthesize_sweep(self, start_freq, end_freq, duration, volume=0.4):
        
         frames = int(duration * self.sample_rate)
-        arr = np.zeros(frames)
-        
-        for i in range(frames):
-            t = float(i) / self.sample_rate
-            progress = i / frames
-            frequency = start_freq + (end_freq - start_freq) * progress
-            arr[i] = volume * math.sin(2 * math.pi * frequency * t)
-        
-     
-        for i in range(frames):
-            envelope = math.sin(math.pi * i / frames)  
-            arr[i] *= envelope
-  
-        arr = (arr * 32767).astype(np.int16)
+        i = np.arange(frames)
+        t = i / self.sample_rate
+        frequency = start_freq + (end_freq - start_freq) * (i / frames)
+        arr = volume * np.sin(2 * np.pi * frequency * t)
         
-
-        stereo_arr = np.zeros((frames, 2), dtype=np.int16)
-        stereo_arr[:, 0] = arr
-        stereo_arr[:, 1] = arr
+        arr *= np.sin(np.pi * i / frames)
         
-        return pygame.sndarray.make_sound(stereo_arr)
+        return self.make_stereo_sound(arr)
+    
+    def update(self):
+        self.voices.new_tick()
+        if self.background_music_playing:
+            self.music.update(self.music_channel)
+    
+    def play_sfx(self, name, sound):
+        priority, max_voices = SOUND_VOICES[name]
+        return self.voices.play(name, sound, priority, max_voices)
     
     def play_bomb_sound(self):
         
@@ -122,15 +159,15 @@ class AudioManager:
         try:
             
             if self.custom_sounds.get('bomb_place'):
-                self.sfx_channel.play(self.custom_sounds['bomb_place'])
-                print("🔊 Tocando som personalizado da bomba")
+                self.play_sfx('bomb_place', self.custom_sounds['bomb_place'])
+                logger.debug("🔊 Tocando som personalizado da bomba")
             else:
                 
                 sound = self.generate_tone(150, 0.2, 'square', 0.3)
-                self.sfx_channel.play(sound)
-                print("🔊 Tocando som gerado da bomba")
+                self.play_sfx('bomb_place', sound)
+                logger.debug("🔊 Tocando som gerado da bomba")
         except Exception as e:
-            print(f"❌ Erro ao tocar som da bomba: {e}")
+            logger.error("❌ Erro ao tocar som da bomba: %s", e)
     
     def play_explosion_sound(self):
         
@@ -140,15 +177,15 @@ class AudioManager:
         try:
            
             if self.custom_sounds.get('explosion'):
-                self.sfx_channel.play(self.custom_sounds['explosion'])
-                print("💥 Tocando som personalizado da explosão")
+                self.play_sfx('explosion', self.custom_sounds['explosion'])
+                logger.debug("💥 Tocando som personalizado da explosão")
             else:
               
                 noise = self.generate_noise(0.5, 0.4)
-                self.sfx_channel.play(noise)
-                print("💥 Tocando som gerado da explosão")
+                self.play_sfx('explosion', noise)
+                logger.debug("💥 Tocando som gerado da explosão")
         except Exception as e:
-            print(f"❌ Erro ao tocar som da explosão: {e}")
+            logger.error("❌ Erro ao tocar som da explosão: %s", e)
     
     def play_powerup_sound(self):
        
@@ -158,9 +195,9 @@ class AudioManager:
         try:
             
             sound = self.generate_sweep(440, 880, 0.3, 0.3)
-            self.sfx_channel.play(sound)
+            self.play_sfx('powerup', sound)
         except Exception as e:
-            print(f"Erro ao tocar som do power-up: {e}")
+            logger.error("Erro ao tocar som do power-up: %s", e)
     
     def play_game_over_sound(self):
        
@@ -170,9 +207,9 @@ class AudioManager:
         try:
            
             sound = self.generate_sweep(440, 110, 1.0, 0.4)
-            self.sfx_channel.play(sound)
+            self.play_sfx('game_over', sound)
         except Exception as e:
-            print(f"Erro ao tocar som de game over: {e}")
+            logger.error("Erro ao tocar som de game over: %s", e)
     
     def play_victory_sound(self):
       
@@ -182,9 +219,9 @@ class AudioManager:
         try:
           
             sound = self.generate_sweep(440, 880, 0.8, 0.4)
-            self.sfx_channel.play(sound)
+            self.play_sfx('victory', sound)
         except Exception as e:
-            print(f"Erro ao tocar som de vitória: {e}")
+            logger.error("Erro ao tocar som de vitória: %s", e)
     
     def play_menu_sound(self):
         
@@ -194,9 +231,9 @@ class AudioManager:
         try:
          
             sound = self.generate_tone(800, 0.1, 'sine', 0.2)
-            self.sfx_channel.play(sound)
+            self.play_sfx('menu', sound)
         except Exception as e:
-            print(f"Erro ao tocar som do menu: {e}")
+            logger.error("Erro ao tocar som do menu: %s", e)
     
     def start_background_music(self):
       
@@ -205,19 +242,21 @@ class AudioManager:
         
         try:
           
+            self.music.start()
             self.background_music_playing = True
-            print("🎵 Música de fundo iniciada")
+            logger.info("🎵 Música de fundo iniciada")
         except Exception as e:
-            print(f"Erro ao iniciar música de fundo: {e}")
+            logger.error("Erro ao iniciar música de fundo: %s", e)
     
     def stop_background_music(self):
         
         try:
+            self.music.stop()
             self.music_channel.stop()
             self.background_music_playing = False
-            print("🎵 Música de fundo parada")
+            logger.info("🎵 Música de fundo parada")
         except Exception as e:
-            print(f"Erro ao parar música de fundo: {e}")
+            logger.error("Erro ao parar música de fundo: %s", e)
     
     def toggle_mute(self):
         
@@ -225,24 +264,24 @@ class AudioManager:
         
         if self.is_muted:
             self.stop_background_music()
-            self.sfx_channel.stop()
-            print("🔇 Áudio mutado")
+            self.voices.stop()
+            logger.info("🔇 Áudio mutado")
         else:
-            print("🔊 Áudio ativado")
+            logger.info("🔊 Áudio ativado")
         
         return not self.is_muted  
     
     def stop_all_sounds(self):
         
         try:
-            self.sfx_channel.stop()
+            self.voices.stop()
             self.stop_background_music()
         except Exception as e:
-            print(f"Erro ao parar todos os sons: {e}")
+            logger.error("Erro ao parar todos os sons: %s", e)
     
     def cleanup(self):
         
         self.stop_all_sounds()
-        print("🔊 Sistema de áudio finalizado")
+        logger.info("🔊 Sistema de áudio finalizado")
 
 
@@ -1,126 +1,93 @@
 import pygame
+import logging
 import sys
-import random
 from .constants import *
 from .sprites import SpriteManager
 from .audio import AudioManager
 from .ui import UI
-from .game_map import GameMap
-from .entities import Player, Enemy, Bomb, Explosion
+from .simulation import GameSimulation
+from .profiler import get_profiler
+from .tracer import get_tracer
+from .replay import ReplayRecorder
+from .snapshot import take_snapshot, restore_snapshot
 
-class EnemyBombCoordinator:
-    def __init__(self):
-        self.current_bomber = None
-        self.bomb_cooldown_time = 0
-        
-    def can_enemy_place_bomb(self, enemy, enemies, bombs, game_map):
-        if self.current_bomber is not None and self.current_bomber != enemy:
-            return False
-            
-        if pygame.time.get_ticks() < self.bomb_cooldown_time:
-            return False
-            
-        return self.is_safe_to_bomb(enemy, enemies, bombs, game_map)
-    
-    def register_bomb_placement(self, enemy):
-        self.current_bomber = enemy
-        self.bomb_cooldown_time = pygame.time.get_ticks() + 3000
-        
-    def clear_current_bomber(self):
-        if self.current_bomber and pygame.time.get_ticks() > self.bomb_cooldown_time:
-            self.current_bomber = None
-    
-    def is_safe_to_bomb(self, enemy, enemies, bombs, game_map):
-        grid_x, grid_y = enemy.get_grid_pos()
-        
-        safe_escape_routes = 0
-        for direction in range(4):
-            dx, dy = Direction.DELTAS[direction]
-            
-            for distance in range(1, 5):
-                test_x = grid_x + dx * distance
-                test_y = grid_y + dy * distance
-                
-                if not (0 <= test_x < COLS and 0 <= test_y < ROWS):
-                    break
-                
-                if not game_map.is_walkable(test_x, test_y):
-                    break
-                
-                will_be_safe = True
-                
-                for bomb in bombs:
-                    if self.is_position_in_bomb_range(test_x, test_y, bomb):
-                        will_be_safe = False
-                        break
-                
-                if (test_x == grid_x and abs(test_y - grid_y) <= enemy.bomb_range) or \
-                   (test_y == grid_y and abs(test_x - grid_x) <= enemy.bomb_range):
-                    if distance <= 3:
-                        will_be_safe = False
-                
-                if will_be_safe:
-                    safe_escape_routes += 1
-                    break
-        
-        return safe_escape_routes >= 2
-    
-    def is_position_in_bomb_range(self, x, y, bomb):
-        if y == bomb.grid_y:
-            distance = abs(x - bomb.grid_x)
-            if distance <= bomb.explosion_range:
-                return True
-        
-        if x == bomb.grid_x:
-            distance = abs(y - bomb.grid_y)
-            if distance <= bomb.explosion_range:
-                return True
-        
-        return False
+logger = logging.getLogger(__name__)
 
 class BombermanGame:
-    def __init__(self, screen):
+    def __init__(self, screen, time_scale=1, render_every=1, dirty_rects=False, profile=False, trace=None,
+                 record=None):
         self.screen = screen
+        self.tracer = get_tracer()
+        if trace and not self.tracer.enabled:
+            self.tracer.start(trace)
         self.clock = pygame.time.Clock()
         self.running = True
+        self.time_scale = time_scale
+        self.render_every = max(1, render_every)
+        self.frame_count = 0
+        
+        self.dirty_rects = dirty_rects
+        self.full_redraw = True
+        self.previous_dirty_rects = []
+        self.previous_hud = None
+        
+        self.profiler = get_profiler()
+        if profile:
+            self.profiler.set_enabled(True)
+        self.show_profiler = self.profiler.enabled
+        self.previous_overlay = None
+        self.recorder = ReplayRecorder(record) if record else None
         
     
         self.state = GameState.START
-        self.score = 0
-        self.level = 1
-        self.sprite_manager = SpriteManager()
-        self.audio_manager = AudioManager()
+        with self.tracer.span('BombermanGame.startup'):
+            self.sprite_manager = SpriteManager(background_loading=True)
+            self.audio_manager = AudioManager()
         self.ui = UI(screen)
-        self.game_map = GameMap(self.sprite_manager)
+        self.simulation = GameSimulation(self.sprite_manager)
         
        
         self.selected_character = Characters.FINN
         self.selected_character_index = 0
+        self.match_assets = []
         
-        
-        self.player = None
-        self.enemies = []
-        self.bombs = []
-        self.explosions = []
        
         self.keys = {}
         self.key_pressed = {}
+        self.bomb_requested = False
         
-        self.enemy_bomb_coordinator = EnemyBombCoordinator()
-        
-        print("🎮 Jogo BOOM na Terra de Ooo inicializado!")
+        logger.info("🎮 Jogo BOOM na Terra de Ooo inicializado!")
     
     def run(self):
        
-        while self.running:
-            dt = self.clock.tick(FPS)
+        # Mesmo se o laço levantar, o replay e o trace gravados até aqui vão para o disco
+        try:
+            while self.running:
+                if self.time_scale == 0:
+                    dt = self.clock.tick()
+                else:
+                    dt = self.clock.tick(FPS)
+                self.frame_count += 1
+                self.profiler.begin_frame()
+                
+                with self.profiler.section('handle_events'):
+                    self.handle_events()
+                with self.profiler.section('update'):
+                    self.update(dt)
+                
+                if self.frame_count % self.render_every == 0:
+                    with self.profiler.section('render'):
+                        self.render()
+                self.profiler.end_frame()
             
-            self.handle_events()
-            self.update(dt)
-            self.render()
-        
-        
-        self.audio_manager.cleanup()
+            if self.profiler.enabled:
+                logger.info("%s", "\n".join(self.profiler.summary_lines()))
+        finally:
+            self.audio_manager.cleanup()
+            self.sprite_manager.cleanup()
+            self.tracer.save()
+            if self.recorder:
+                self.recorder.save()
     
     def handle_events(self):
        
@@ -169,9 +136,13 @@ class BombermanGame:
                 
         elif self.state == GameState.PLAYING:
             if key == pygame.K_SPACE:
-                self.place_bomb()
+                self.bomb_requested = True
             elif key == pygame.K_p:
                 self.toggle_pause()
+            elif key == pygame.K_f:
+                self.cycle_time_scale()
+            elif key == pygame.K_F3:
+                self.toggle_profiler_overlay()
             elif key == pygame.K_ESCAPE:
                 self.state = GameState.START
                 self.audio_manager.stop_background_music()
@@ -284,55 +255,51 @@ class BombermanGame:
     def update(self, dt):
         
         self.ui.update(dt)
+        self.audio_manager.update()
+        self.sprite_manager.pump_loading()
         
         
         self.key_pressed = {}
         
         if self.state == GameState.PLAYING:
-            self.update_game(dt)
+            if self.time_scale == 0:
+                self.update_game(SIM_STEP_MS)
+            else:
+                for _ in range(self.time_scale):
+                    self.update_game(dt)
+                    if self.state != GameState.PLAYING:
+                        break
         elif self.state == GameState.CHARACTER_SELECT:
             
-            for enemy in self.enemies:
-                enemy.update(dt, self.game_map, self.player, self.bombs, self.enemy_bomb_coordinator)
+            self.simulation.step_preview(dt)
     
     def update_game(self, dt):
         
         self.sprite_manager.update_animations()
         
+        inputs = self.read_player_inputs()
+        if self.recorder:
+            self.recorder.record_tick(inputs, dt)
+        events = self.simulation.step(inputs, dt)
+        self.bomb_requested = False
         
-        self.update_player(dt)
-        
-        
-        self.enemy_bomb_coordinator.clear_current_bomber()
-        
-        for enemy in self.enemies[:]:  
-            if enemy.alive:
-                enemy.update(dt, self.game_map, self.player, self.bombs, self.enemy_bomb_coordinator)
-        
-        
-        self.update_bombs(dt)
-        
-        
-        self.update_explosions(dt)
-        
-        
-        if self.game_map.update_powerups(dt, self.player):
-            self.score += 50
-            self.audio_manager.play_powerup_sound()
-        
-        
-        self.check_collisions()
+        for event in events:
+            if event == 'bomb_placed':
+                self.audio_manager.play_bomb_sound()
+            elif event == 'explosion':
+                self.audio_manager.play_explosion_sound()
+            elif event == 'powerup':
+                self.audio_manager.play_powerup_sound()
         
+        if self.simulation.outcome and self.recorder:
+            self.recorder.end_level()
         
-        self.check_win_lose_conditions()
+        if self.simulation.outcome == GameState.GAME_OVER:
+            self.game_over()
+        elif self.simulation.outcome == GameState.VICTORY:
+            self.victory()
     
-    def update_player(self, dt):
-        
-        if not self.player:
-            return
-        
-        self.player.update(dt)
-        
+    def read_player_inputs(self):
         
         dx, dy = 0, 0
         if self.keys.get(pygame.K_a) or self.keys.get(pygame.K_LEFT):
@@ -343,159 +310,16 @@ class BombermanGame:
             dy = -1
         if self.keys.get(pygame.K_s) or self.keys.get(pygame.K_DOWN):
             dy = 1
-            
-        
-        if dx != 0 or dy != 0:
-            self.player.move(dx, dy, self.game_map, self.bombs)
-    
-    def update_bombs(self, dt):
-       
-        for bomb in self.bombs[:]:  
-            should_explode = bomb.update(dt, self.game_map, self.player)
-            
-            if should_explode:
-                
-                explosion = bomb.explode(self.game_map)
-                self.explosions.append(explosion)
-                self.bombs.remove(bomb)
-                print(f"💥 Bomba explodiu! Bombas restantes: {len([b for b in self.bombs if b.owner == self.player.character])}/{self.player.max_bombs}")
-                self.audio_manager.play_explosion_sound()
-    
-    def update_explosions(self, dt):
-        
-        for explosion in self.explosions[:]: 
-            explosion_ended = explosion.update(dt, self.game_map)
-            if explosion_ended:
-                self.explosions.remove(explosion)
-    
-    def check_collisions(self):
-        
-        if not self.player:
-            return
-        
-        player_rect = self.player.get_rect()
-        
-        
-        for explosion in self.explosions:
-           
-            bomb_pixel_x = explosion.bomb_x * TILE_SIZE
-            bomb_pixel_y = explosion.bomb_y * TILE_SIZE
-            
-            if self.game_map.can_explosion_reach_player(bomb_pixel_x, bomb_pixel_y, self.player.x, self.player.y):
-                
-                player_grid_x = int(self.player.x // TILE_SIZE)
-                player_grid_y = int(self.player.y // TILE_SIZE)
-                
-                for tile_x, tile_y in explosion.tiles:
-                    if tile_x == player_grid_x and tile_y == player_grid_y:
-                        self.player_hit()
-                        return
-        
-        
-        for enemy in self.enemies:
-            if enemy.alive and player_rect.colliderect(enemy.get_rect()):
-                
-                if self.game_map.has_clear_line_of_sight(self.player.x, self.player.y, enemy.x, enemy.y):
-                    self.player_hit()
-                    return
-        
-       
-        for enemy in self.enemies[:]:
-            if not enemy.alive:
-                continue
-            
-            for explosion in self.explosions:
-               
-                bomb_pixel_x = explosion.bomb_x * TILE_SIZE
-                bomb_pixel_y = explosion.bomb_y * TILE_SIZE
-                
-                if self.game_map.can_explosion_reach_player(bomb_pixel_x, bomb_pixel_y, enemy.x, enemy.y):
-                  
-                    enemy_grid_x = int(enemy.x // TILE_SIZE)
-                    enemy_grid_y = int(enemy.y // TILE_SIZE)
-                    
-                    for tile_x, tile_y in explosion.tiles:
-                        if tile_x == enemy_grid_x and tile_y == enemy_grid_y:
-                            enemy.alive = False
-                            self.score += 100
-                            break
-    
-    def check_win_lose_conditions(self):
-        
-        if not self.player:
-            return
-        
-        
-        if self.player.lives <= 0:
-            self.game_over()
-        
         
-        alive_enemies = [enemy for enemy in self.enemies if enemy.alive]
-        if len(alive_enemies) == 0:
-            self.victory()
-    
-    def place_bomb(self):
-        
-        if not self.player:
-            return
-        
-        
-        player_bombs = [bomb for bomb in self.bombs if bomb.owner == self.player.character]
-        if len(player_bombs) >= self.player.max_bombs:
-            print(f"🚫 Limite de bombas atingido! ({len(player_bombs)}/{self.player.max_bombs})")
-            return
-        
-        
-        grid_x, grid_y = self.player.get_grid_pos()
-        
-        
-        for bomb in self.bombs:
-            if bomb.grid_x == grid_x and bomb.grid_y == grid_y:
-                return
-        
-        
-        new_bomb = Bomb(grid_x, grid_y, self.player.bomb_range, self.player.character)
-        self.bombs.append(new_bomb)
-        print(f"💣 Bomba criada! Total: {len([b for b in self.bombs if b.owner == self.player.character])}/{self.player.max_bombs}")
-        
-        
-        self.audio_manager.play_bomb_sound()
-    
-    def player_hit(self):
-        
-        if not self.player:
-            return
-        
-        self.player.lives -= 1
-        
-        if self.player.lives > 0:
-            
-            self.player.x = 1 * TILE_SIZE  
-            self.player.y = 2 * TILE_SIZE  
-        else:
-            self.game_over()
+        return {'dx': dx, 'dy': dy, 'bomb': self.bomb_requested}
     
     def start_character_select(self):
         
         self.state = GameState.CHARACTER_SELECT
         
-        
-        self.game_map.generate_level(1)
-        
-        
-        self.player = Player(1, 2, self.selected_character)
-        
-        
-        self.enemies = []
-        enemy_characters = [char for char in Characters.ALL if char != self.selected_character]
-        positions = self.game_map.get_valid_spawn_positions()
-        
-        for i, character in enumerate(enemy_characters[:3]):
-            if positions:
-                pos = random.choice(positions)
-                positions.remove(pos)
-                enemy = Enemy(pos[0], pos[1], character)
-                self.enemies.append(enemy)
+        if self.recorder:
+            self.recorder.end_level()
+        self.simulation.spawn_preview(self.selected_character, self.get_enemy_characters())
         
         self.audio_manager.play_menu_sound()
     
@@ -504,79 +328,53 @@ class BombermanGame:
         self.state = GameState.PLAYING
         
        
-        if self.level == 1:
-            self.score = 0
-        
-   
-        self.game_map.generate_level(self.level)
- 
-        self.player = Player(1, 2, self.selected_character)
-        
-      
-        self.create_enemies()
-        
-    
-        self.bombs = []
-        self.explosions = []
+        if self.simulation.level == 1:
+            self.simulation.score = 0
+        
+        self.simulation.start_level(self.simulation.level, self.selected_character, self.get_enemy_characters())
+        if self.recorder:
+            self.recorder.start_level(self.simulation)
+        
+        characters = [self.simulation.player.character] + [enemy.character for enemy in self.simulation.enemies]
+        self.match_assets = self.sprite_manager.match_asset_groups(characters, self.simulation.level)
+        self.sprite_manager.request_assets(self.match_assets)
+        self.sprite_manager.prefetch_theme(self.simulation.level + 1)
+        self.bomb_requested = False
       
         self.audio_manager.start_background_music()
         
-        print(f"🎮 Jogo iniciado - Nível {self.level}")
+        logger.info("🎮 Jogo iniciado - Nível %s", self.simulation.level)
     
-    def create_enemies(self):
-        
-        self.enemies = []
-        
-       
-        enemy_characters = [char for char in Characters.ALL if char != self.selected_character]
-        
-      
-        corner_positions = [
-            (COLS - 2, 1),       
-            (1, ROWS - 2),        
-            (COLS - 2, ROWS - 2), 
-        ]
-        
-        corner_names = ["superior direito", "inferior esquerdo", "inferior direito"]
-        
-        print(f"🎯 Criando inimigos nas posições garantidas dos cantos:")
-        
-       
-        for i, character in enumerate(enemy_characters[:3]): 
-            if i < len(corner_positions):
-                pos = corner_positions[i]
-                x, y = pos
-                
-               
-                if (0 <= x < COLS and 0 <= y < ROWS and 
-                    self.game_map.is_walkable(x, y)):
-                    
-                    enemy = Enemy(x, y, character)
-                    self.enemies.append(enemy)
-                    corner_name = corner_names[i]
-                    print(f"🤖 Inimigo {character} criado no canto {corner_name}: ({x}, {y}) ✅")
-                else:
-                    print(f"❌ ERRO: Posição ({x}, {y}) ainda não é walkable - verificar geração do mapa")
-            else:
-                print(f"⚠️ Limite de posições atingido - {character} não foi criado")
+    def snapshot(self):
         
-        print(f"🎯 Total de inimigos criados: {len(self.enemies)}")
+        return take_snapshot(self.simulation)
+    
+    def restore_snapshot(self, data):
+        
+        # Um estado restaurado no meio do nível não pode ser reproduzido a partir do início dele
+        if self.recorder:
+            self.recorder.end_level()
+        
+        previous_level = self.simulation.level
+        restore_snapshot(data, self.simulation)
+        if self.simulation.level != previous_level:
+            self.sprite_manager.set_map_theme(self.sprite_manager.get_theme_for_level(self.simulation.level))
+        
+        characters = [self.simulation.player.character] + [enemy.character for enemy in self.simulation.enemies]
+        self.match_assets = self.sprite_manager.match_asset_groups(characters, self.simulation.level)
+        self.sprite_manager.request_assets(self.match_assets)
+        self.bomb_requested = False
+        self.full_redraw = True
+        self.state = GameState.PLAYING
+    
+    def get_enemy_characters(self):
         
-        if len(self.enemies) == 0:
-            pass
-        elif len(self.enemies) < 3:
-            pass
+        return [char for char in Characters.ALL if char != self.selected_character]
     
     def restart_game(self):
        
-        self.level = 1
-        self.score = 0
-        self.start_game()
-    
-    def next_level(self):
-      
-        self.level += 1
-        self.score += 500 * self.level 
+        self.simulation.level = 1
+        self.simulation.score = 0
         self.start_game()
     
     def game_over(self):
@@ -584,14 +382,31 @@ class BombermanGame:
         self.state = GameState.GAME_OVER
         self.audio_manager.stop_background_music()
         self.audio_manager.play_game_over_sound()
-        print(f"💀 Game Over - Pontuação: {self.score}, Nível: {self.level}")
+        logger.info("💀 Game Over - Pontuação: %s, Nível: %s", self.simulation.score, self.simulation.level)
     
     def victory(self):
         
         self.state = GameState.VICTORY
-        self.score += 500 * self.level
         self.audio_manager.play_victory_sound()
-        print(f"🏆 Vitória - Nível {self.level} completo!")
+        logger.info("🏆 Vitória - Nível %s completo!", self.simulation.level)
+    
+    def cycle_time_scale(self):
+        
+        if self.time_scale in TIME_SCALES:
+            index = (TIME_SCALES.index(self.time_scale) + 1) % len(TIME_SCALES)
+        else:
+            index = 0
+        self.time_scale = TIME_SCALES[index]
+        
+        label = "sem limite" if self.time_scale == 0 else f"{self.time_scale}x"
+        logger.info("⏩ Velocidade da simulação: %s", label)
+    
+    def toggle_profiler_overlay(self):
+        
+        self.show_profiler = not self.show_profiler
+        if self.show_profiler and not self.profiler.enabled:
+            self.profiler.set_enabled(True)
+        self.full_redraw = True
     
     def toggle_pause(self):
        
@@ -607,7 +422,7 @@ class BombermanGame:
         self.audio_manager.stop_background_music()
         
     def next_level(self):
-        self.level += 1
+        self.simulation.level += 1
         self.start_game()
     
     def render(self):
@@ -626,27 +441,79 @@ class BombermanGame:
             self.render_game()
             
         elif self.state == GameState.GAME_OVER:
-            self.ui.draw_game_over_screen(self.score, self.level)
+            self.ui.draw_game_over_screen(self.simulation.score, self.simulation.level)
             
         elif self.state == GameState.VICTORY:
-            self.ui.draw_victory_screen(self.score)
+            self.ui.draw_victory_screen(self.simulation.score)
         
     
         mute_button = self.ui.draw_mute_button(self.audio_manager.is_muted)
         
-        pygame.display.flip()
+        if self.show_profiler and self.state in [GameState.PLAYING, GameState.PAUSED]:
+            overlay = self.profiler.draw_overlay(self.screen)
+        else:
+            overlay = None
+        
+        with self.profiler.section('display.flip'):
+            if self.dirty_rects and self.state == GameState.PLAYING:
+                rects = self.collect_dirty_rects(mute_button)
+                for rect in (overlay, self.previous_overlay):
+                    if rect:
+                        rects.append(rect)
+                self.previous_overlay = overlay
+                if self.full_redraw:
+                    pygame.display.flip()
+                else:
+                    pygame.display.update(rects)
+                self.full_redraw = False
+            else:
+                pygame.display.flip()
+                self.full_redraw = True
+    
+    def collect_dirty_rects(self, mute_button):
+        
+        simulation = self.simulation
+        rects = []
+        
+        entities = [enemy for enemy in simulation.enemies if enemy.alive]
+        if simulation.player:
+            entities.append(simulation.player)
+        
+        for entity in entities:
+            rects.append(pygame.Rect(int(entity.x), int(entity.y), TILE_SIZE, TILE_SIZE).inflate(2, 2))
+        
+        for bomb in simulation.bombs:
+            rects.append(pygame.Rect(bomb.x, bomb.y, TILE_SIZE, TILE_SIZE))
+        
+        for explosion in simulation.explosions:
+            for tile_x, tile_y in explosion.tiles:
+                rects.append(pygame.Rect(tile_x * TILE_SIZE, tile_y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+        
+        for powerup in simulation.game_map.powerups:
+            rects.append(pygame.Rect(powerup.x, powerup.y, TILE_SIZE, TILE_SIZE))
+        
+        player = simulation.player
+        hud = (simulation.score, player.lives if player else 0, simulation.level,
+               player.max_bombs if player else 0, self.audio_manager.is_muted)
+        if hud != self.previous_hud or self.full_redraw:
+            rects.append(pygame.Rect(0, 0, SCREEN_WIDTH, 40))
+            rects.append(mute_button.inflate(30, 0).union(mute_button.move(0, 30)))
+            self.previous_hud = hud
+        
+        dirty = rects + self.previous_dirty_rects
+        self.previous_dirty_rects = rects
+        return dirty
     
     def render_game(self):
-       
-        if not self.sprite_manager.draw_background_map(self.screen):
-            
-            self.screen.fill((34, 139, 34))
         
+        simulation = self.simulation
+        self.sprite_manager.wait_until_ready(self.match_assets)
         
-        self.game_map.render(self.screen, self.sprite_manager)
+        with self.profiler.section('GameMap.render'):
+            simulation.game_map.render(self.screen, self.sprite_manager)
         
        
-        for bomb in self.bombs:
+        for bomb in simulation.bombs:
             self.sprite_manager.draw_sprite(
                 self.screen, "bomb", bomb.x, bomb.y, TILE_SIZE, 
                 blinking=bomb.blinking,
@@ -654,15 +521,16 @@ class BombermanGame:
             )
         
       
-        if self.player:
+        player = simulation.player
+        if player:
             self.sprite_manager.draw_character(
-                self.screen, self.player.character, self.player.x, self.player.y,
-                is_moving=self.player.is_moving,
-                direction=self.player.direction
+                self.screen, player.character, player.x, player.y,
+                is_moving=player.is_moving,
+                direction=player.direction
             )
         
        
-        for enemy in self.enemies:
+        for enemy in simulation.enemies:
             if enemy.alive:
                 enemy_direction = getattr(enemy, 'direction', None)
                 self.sprite_manager.draw_character(
@@ -672,11 +540,10 @@ class BombermanGame:
                 )
         
         
-        bombs_count = self.player.max_bombs if self.player else 0
-        self.ui.draw_game_screen(self.score, self.player.lives if self.player else 0, self.level, bombs_count)
+        bombs_count = player.max_bombs if player else 0
+        with self.profiler.section('HUD render'):
+            self.ui.draw_game_screen(simulation.score, player.lives if player else 0, simulation.level, bombs_count)
         
        
         if self.state == GameState.PAUSED:
             self.ui.draw_pause_overlay()
-
-
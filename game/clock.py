@@ -0,0 +1,21 @@
+import pygame
+
+class SimulationClock:
+    def __init__(self, start_ticks=0):
+        self.ticks = start_ticks
+
+    def advance(self, dt):
+        self.ticks += dt
+        return self.ticks
+
+    def reset(self, start_ticks=0):
+        self.ticks = start_ticks
+
+    def get_ticks(self):
+        return self.ticks
+
+class WallClock:
+    def get_ticks(self):
+        return pygame.time.get_ticks()
+
+WALL_CLOCK = WallClock()
@@ -7,6 +7,8 @@ ROWS = SCREEN_HEIGHT // TILE_SIZE
 PLAYER_SPEED = 2
 ENEMY_SPEED = 1
 FPS = 60
+SIM_STEP_MS = 1000 // FPS
+TIME_SCALES = [1, 2, 4, 0]
 
 BOMB_TIMER = 3000
 EXPLOSION_DURATION = 500
@@ -0,0 +1,127 @@
+import numpy as np
+from .constants import *
+
+NO_THREAT = 1 << 30
+
+class DangerMap:
+    def __init__(self, game_map, bombs=(), current_time=0, explosions=()):
+        self.game_map = game_map
+
+        self.threats = np.zeros((ROWS, COLS), dtype=np.uint8)
+        self.detonation = np.full((ROWS, COLS), NO_THREAT, dtype=np.int32)
+        self.source_distance = np.full((ROWS, COLS), NO_THREAT, dtype=np.int32)
+
+        # Alcance das explosões por (x, y, alcance), válido enquanto a grade não muda
+        self.blast_cache = {}
+        self.blast_version = game_map.version
+
+        self.reset(bombs, current_time, explosions)
+
+    def reset(self, bombs=(), current_time=0, explosions=()):
+        # Reconstrói nos mesmos arrays, sem alocar um mapa novo a cada tick
+        self.current_time = current_time
+        self.threats.fill(0)
+        self.detonation.fill(NO_THREAT)
+        self.source_distance.fill(NO_THREAT)
+
+        self.windows = {}
+        self.bomb_cells = {}
+
+        if self.blast_version != self.game_map.version:
+            self.blast_cache = {}
+            self.blast_version = self.game_map.version
+
+        for bomb in bombs:
+            self.add_bomb(bomb)
+
+        for explosion in explosions:
+            remaining = max(0, EXPLOSION_DURATION - (current_time - explosion.timer))
+            for x, y in explosion.tiles:
+                self.mark_cell(x, y, 0, remaining, 0)
+
+    def blast_cells(self, grid_x, grid_y, explosion_range):
+        key = (grid_x, grid_y, explosion_range)
+        if self.blast_version == self.game_map.version and key in self.blast_cache:
+            return self.blast_cache[key]
+
+        cells = [(grid_x, grid_y)]
+
+        for direction in range(4):
+            dx, dy = Direction.DELTAS[direction]
+
+            for i in range(1, explosion_range + 1):
+                x = grid_x + dx * i
+                y = grid_y + dy * i
+
+                if not (0 <= x < COLS and 0 <= y < ROWS):
+                    break
+
+                tile_type = self.game_map.get_tile(x, y)
+
+                if tile_type == TileType.WALL:
+                    break
+
+                cells.append((x, y))
+
+                if tile_type == TileType.BRICK:
+                    break
+
+        if self.blast_version == self.game_map.version:
+            self.blast_cache[key] = cells
+        return cells
+
+    def add_bomb(self, bomb, time_left=None):
+        if time_left is None:
+            time_left = BOMB_TIMER - (self.current_time - bomb.timer)
+        time_left = max(0, time_left)
+
+        cells = self.blast_cells(bomb.grid_x, bomb.grid_y, bomb.explosion_range)
+        self.bomb_cells[id(bomb)] = frozenset(cells)
+
+        for x, y in cells:
+            distance = abs(x - bomb.grid_x) + abs(y - bomb.grid_y)
+            self.mark_cell(x, y, time_left, time_left + EXPLOSION_DURATION, distance)
+
+        return cells
+
+    def mark_cell(self, x, y, start, end, distance):
+        self.threats[y, x] += 1
+        if start < self.detonation[y, x]:
+            self.detonation[y, x] = start
+        if distance < self.source_distance[y, x]:
+            self.source_distance[y, x] = distance
+        self.windows.setdefault((x, y), []).append((start, end))
+
+    def covers(self, bomb, x, y):
+        cells = self.bomb_cells.get(id(bomb))
+        if cells is None:
+            cells = self.bomb_cells[id(bomb)] = frozenset(
+                self.blast_cells(bomb.grid_x, bomb.grid_y, bomb.explosion_range)
+            )
+        return (x, y) in cells
+
+    def in_bounds(self, x, y):
+        return 0 <= x < COLS and 0 <= y < ROWS
+
+    def is_dangerous(self, x, y):
+        return self.in_bounds(x, y) and self.threats.item(y, x) > 0
+
+    def threat_count(self, x, y):
+        if not self.in_bounds(x, y):
+            return 0
+        return self.threats.item(y, x)
+
+    def time_to_blast(self, x, y):
+        if not self.in_bounds(x, y):
+            return None
+        time_left = self.detonation.item(y, x)
+        return None if time_left == NO_THREAT else time_left
+
+    def distance_to_source(self, x, y):
+        if not self.in_bounds(x, y):
+            return None
+        distance = self.source_distance.item(y, x)
+        return None if distance == NO_THREAT else distance
+
+    def safe_mask(self):
+        return self.threats == 0
@@ -1,7 +1,16 @@
 import pygame
+import logging
 import math
 import random
 from .constants import *
+from .clock import WALL_CLOCK
+from .danger_map import DangerMap
+from .flow_field import build_player_field, build_safe_field, build_brick_field
+from .escape_planner import plan_escape
+
+logger = logging.getLogger(__name__)
+
+DIRECTION_ARROWS = ['↑', '→', '↓', '←']
 
 class Player:
     def __init__(self, x, y, character=Characters.FINN):
@@ -48,7 +57,8 @@ class Player:
         return pygame.Rect(self.x, self.y, TILE_SIZE, TILE_SIZE)
 
 class Enemy:
-    def __init__(self, x, y, character=Characters.JAKE):
+    def __init__(self, x, y, character=Characters.JAKE, clock=None):
+        self.clock = clock or WALL_CLOCK
         self.x = x * TILE_SIZE
         self.y = y * TILE_SIZE
         self.character = character
@@ -62,20 +72,29 @@ class Enemy:
         self.bomb_range = 2
         self.last_bomb_time = 0
         self.bomb_cooldown = random.randint(2000, 3000)
-        self.spawn_time = pygame.time.get_ticks()
+        self.spawn_time = self.clock.get_ticks()
         self.mode = "explore"
-        self.last_direction_change = pygame.time.get_ticks()
+        self.last_direction_change = self.clock.get_ticks()
         
         self.escape_direction = None
         self.escape_mode_until = 0
+        self.danger_map = None
+        self.player_field = None
+        self.safe_field = None
+        self.brick_field = None
         
-        print(f"🤖 Inimigo {character} criado com cooldown inicial de {self.bomb_cooldown}ms")
+        logger.debug("🤖 Inimigo %s criado com cooldown inicial de %sms", character, self.bomb_cooldown)
         
-    def update(self, dt, game_map, player, bombs, bomb_coordinator=None):
+    def update(self, dt, game_map, player, bombs, bomb_coordinator=None, danger_map=None,
+               player_field=None, safe_field=None, brick_field=None):
         if not self.alive:
             return
         
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
+        self.danger_map = danger_map or DangerMap(game_map, bombs, current_time)
+        self.player_field = player_field or build_player_field(game_map, player)
+        self.safe_field = safe_field or build_safe_field(game_map, self.danger_map)
+        self.brick_field = brick_field or build_brick_field(game_map)
         
         self.check_powerup_collection(game_map)
         
@@ -110,78 +129,46 @@ class Enemy:
                     reason = "exploração aleatória"
                 
                 if should_place_bomb:
-                    if bomb_coordinator and bomb_coordinator.can_enemy_place_bomb(self, [], bombs, game_map):
-                        safe_escape_routes = self.analyze_safe_escape_routes(game_map, bombs, grid_x, grid_y)
+                    if bomb_coordinator and bomb_coordinator.can_enemy_place_bomb(self, [], bombs, game_map, self.danger_map):
+                        escape_route = self.plan_bomb_escape(game_map, grid_x, grid_y)
                         
-                        if len(safe_escape_routes) >= 1:
+                        if escape_route is not None:
                             if self.place_bomb(game_map, bombs, current_time):
                                 bomb_coordinator.register_bomb_placement(self)
-                                best_route = safe_escape_routes[0]
-                                self.escape_direction = best_route['direction']
+                                self.escape_direction = escape_route['direction']
                                 self.escape_mode_until = current_time + 4000
-                                print(f"💣✅ {self.character} colocou bomba coordenada para {reason}")
+                                logger.debug("💣✅ %s colocou bomba coordenada para %s", self.character, reason)
                             
                             self.bomb_cooldown = random.randint(3000, 5000)
                         else:
-                            print(f"💣❌ {self.character} cancelou - sem rotas seguras")
-                            self.bomb_cooldown = random.randint(1000, 2000)
+                            logger.debug("💣❌ %s cancelou - sem rotas seguras", self.character)
+                            self.bomb_cooldown = time_since_last_bomb + random.randint(1000, 2000)
                     else:
                         if bomb_coordinator:
-                            print(f"💣⏳ {self.character} aguardando vez para colocar bomba")
-                        self.bomb_cooldown = random.randint(500, 1500)
+                            logger.debug("💣⏳ %s aguardando vez para colocar bomba", self.character)
+                        # O cooldown conta desde a última bomba: sem somar o tempo já passado, tentaria de novo no próximo quadro
+                        self.bomb_cooldown = time_since_last_bomb + random.randint(500, 1500)
         
         self.update_movement(game_map, bombs, player, current_time)
     
-    def analyze_safe_escape_routes(self, game_map, bombs, grid_x, grid_y):
-        safe_routes = []
+    def plan_escape(self, game_map, grid_x, grid_y, with_own_bomb=False):
+        pending_blasts = []
+        if with_own_bomb:
+            own_blast = frozenset(self.danger_map.blast_cells(grid_x, grid_y, self.bomb_range))
+            pending_blasts.append((own_blast, BOMB_TIMER, BOMB_TIMER + EXPLOSION_DURATION))
         
-        for direction in range(4):
-            dx, dy = Direction.DELTAS[direction]
-            
-            for distance in range(1, 5):
-                test_x = grid_x + dx * distance
-                test_y = grid_y + dy * distance
-                
-                if not (0 <= test_x < COLS and 0 <= test_y < ROWS):
-                    break
-                
-                if not game_map.is_walkable(test_x, test_y):
-                    break
-                
-                is_safe = True
-                
-                for bomb in bombs:
-                    if self.is_position_dangerous(test_x, test_y, bomb):
-                        is_safe = False
-                        break
-                
-                if (test_x == grid_x and abs(test_y - grid_y) <= self.bomb_range) or \
-                   (test_y == grid_y and abs(test_x - grid_x) <= self.bomb_range):
-                    if distance <= 3:
-                        is_safe = False
-                
-                if is_safe:
-                    safe_routes.append({
-                        'direction': direction,
-                        'position': (test_x, test_y),
-                        'distance': distance
-                    })
-                    break
+        misalignment = abs(self.x - grid_x * TILE_SIZE) + abs(self.y - grid_y * TILE_SIZE)
+        start_delay = math.ceil(misalignment / max(self.speed, 1)) * SIM_STEP_MS
         
-        return safe_routes
+        return plan_escape(game_map, self.danger_map, grid_x, grid_y, self.speed,
+                           start_delay, pending_blasts)
     
-    def is_position_dangerous(self, x, y, bomb):
-        if y == bomb.grid_y:
-            distance = abs(x - bomb.grid_x)
-            if distance <= bomb.explosion_range:
-                return True
-        
-        if x == bomb.grid_x:
-            distance = abs(y - bomb.grid_y)
-            if distance <= bomb.explosion_range:
-                return True
-        
-        return False
+    def plan_bomb_escape(self, game_map, grid_x, grid_y):
+        # Mesmo critério na decisão e na colocação: só vale rota que começa andando
+        escape_route = self.plan_escape(game_map, grid_x, grid_y, with_own_bomb=True)
+        if escape_route is None or escape_route['direction'] is None:
+            return None
+        return escape_route
     
     def check_powerup_collection(self, game_map):
         grid_x, grid_y = self.get_grid_pos()
@@ -203,36 +190,23 @@ class Enemy:
     
     def assess_danger_level(self, bombs, current_time):
         grid_x, grid_y = self.get_grid_pos()
-        max_danger = 0
-        
+        time_left = self.danger_map.time_to_blast(grid_x, grid_y)
+
+        if time_left is not None:
+            if time_left < 1000:
+                return 3
+            elif time_left < 2000:
+                return 2
+            elif self.danger_map.distance_to_source(grid_x, grid_y) <= 1:
+                return 2
+            return 1
+
         for bomb in bombs:
-            danger = 0
-            
-            if self.is_position_in_bomb_range(grid_x, grid_y, bomb):
-                time_left = BOMB_TIMER - (pygame.time.get_ticks() - bomb.timer)
-                manhattan_distance = abs(bomb.grid_x - grid_x) + abs(bomb.grid_y - grid_y)
-                
-                if time_left < 1000:
-                    danger = 3
-                elif time_left < 2000:
-                    danger = 2
-                elif manhattan_distance <= 1:
-                    danger = 2
-                else:
-                    danger = 1
-                
-                if bomb.owner == self.character and hasattr(self, 'post_bomb_grace_time'):
-                    if current_time < self.post_bomb_grace_time:
-                        danger = max(0, danger - 1)
-            
-            else:
-                manhattan_distance = abs(bomb.grid_x - grid_x) + abs(bomb.grid_y - grid_y)
-                if manhattan_distance <= 2 and bomb.owner != self.character:
-                    danger = 1
-            
-            max_danger = max(max_danger, danger)
-        
-        return max_danger
+            manhattan_distance = abs(bomb.grid_x - grid_x) + abs(bomb.grid_y - grid_y)
+            if manhattan_distance <= 2 and bomb.owner != self.character:
+                return 1
+
+        return 0
     
     def calculate_distance_to_player(self, player):
         distance_pixels = math.sqrt(
@@ -296,11 +270,7 @@ class Enemy:
         
         grid_x, grid_y = self.get_grid_pos()
         
-        escape_routes = self.count_escape_routes(game_map, bombs, grid_x, grid_y)
-        if escape_routes < 2:
-            return False
-        
-        if not self.can_escape_own_bomb(game_map, bombs, grid_x, grid_y):
+        if self.plan_bomb_escape(game_map, grid_x, grid_y) is None:
             return False
         
         for bomb in bombs:
@@ -340,66 +310,21 @@ class Enemy:
         
         if 2 <= distance_to_player <= 4:
             if self.will_bomb_hit_player(grid_x, grid_y, player_grid_x, player_grid_y):
-                if self.count_escape_routes(game_map, bombs, grid_x, grid_y) >= 1:
+                if self.plan_bomb_escape(game_map, grid_x, grid_y) is not None:
                     return random.random() < self.aggression_level * 1.5
         
         strategic_bricks = self.count_strategic_bricks(game_map, grid_x, grid_y)
         if strategic_bricks >= 1:
             if distance_to_player <= 5:
-                if self.count_escape_routes(game_map, bombs, grid_x, grid_y) >= 1:
+                if self.plan_bomb_escape(game_map, grid_x, grid_y) is not None:
                     return random.random() < self.aggression_level
         
         if distance_to_player <= 3:
-            if self.count_escape_routes(game_map, bombs, grid_x, grid_y) >= 2:
+            if self.plan_bomb_escape(game_map, grid_x, grid_y) is not None:
                 return random.random() < (self.aggression_level * 0.5)
         
         return False
 
-    def can_safely_escape_from_bomb(self, game_map, bombs, bomb_grid_x, bomb_grid_y):
-        grid_x, grid_y = self.get_grid_pos()
-        
-        immediate_exits = 0
-        for direction in range(4):
-            dx, dy = Direction.DELTAS[direction]
-            check_x = grid_x + dx
-            check_y = grid_y + dy
-            
-            if (0 <= check_x < COLS and 0 <= check_y < ROWS and 
-                game_map.is_walkable(check_x, check_y)):
-                immediate_exits += 1
-        
-        if immediate_exits == 0:
-            return False
-        
-        simulated_bomb = type('obj', (object,), {
-            'grid_x': bomb_grid_x,
-            'grid_y': bomb_grid_y,
-            'owner': self.character,
-            'explosion_range': 2
-        })
-        
-        test_bombs = list(bombs) + [simulated_bomb]
-        
-        for direction in range(4):
-            dx, dy = Direction.DELTAS[direction]
-            
-            for distance in range(1, 4):
-                check_x = grid_x + dx * distance
-                check_y = grid_y + dy * distance
-                
-                if not (0 <= check_x < COLS and 0 <= check_y < ROWS):
-                    break
-                
-                if not game_map.is_walkable(check_x, check_y):
-                    break
-                
-                safe_from_simulated_bomb = not self.is_in_bomb_explosion_path(check_x, check_y, simulated_bomb)
-                
-                if safe_from_simulated_bomb:
-                    return True
-        
-        return immediate_exits >= 2
-
     def should_place_bomb_smart(self, game_map, player, bombs):
         my_bombs = sum(1 for bomb in bombs if bomb.owner == self.character)
         if my_bombs >= self.max_bombs:
@@ -415,68 +340,24 @@ class Enemy:
         
         if 2 <= distance_to_player <= 5:
             if self.will_bomb_hit_player(grid_x, grid_y, player_grid_x, player_grid_y):
-                escape_routes = self.calculate_escape_routes(game_map, bombs, grid_x, grid_y)
-                if len(escape_routes) >= 2:
-                    print(f"🎯 {self.character} vai atacar o jogador! Distância: {distance_to_player}")
+                if self.plan_bomb_escape(game_map, grid_x, grid_y) is not None:
+                    logger.debug("🎯 %s vai atacar o jogador! Distância: %s", self.character, distance_to_player)
                     return random.random() < 0.7
         
         destructible_info = self.find_best_destructible_target(game_map)
         if destructible_info:
-            escape_routes = self.calculate_escape_routes(game_map, bombs, grid_x, grid_y)
-            if len(escape_routes) >= 1:
-                print(f"💎 {self.character} vai quebrar bloco destrutível!")
+            if self.plan_bomb_escape(game_map, grid_x, grid_y) is not None:
+                logger.debug("💎 %s vai quebrar bloco destrutível!", self.character)
                 return random.random() < 0.5
         
         if distance_to_player >= 4:
             if self.is_tactical_position(game_map, player, grid_x, grid_y):
-                escape_routes = self.calculate_escape_routes(game_map, bombs, grid_x, grid_y)
-                if len(escape_routes) >= 2:
-                    print(f"🛡️ {self.character} posicionamento tático!")
+                if self.plan_bomb_escape(game_map, grid_x, grid_y) is not None:
+                    logger.debug("🛡️ %s posicionamento tático!", self.character)
                     return random.random() < 0.3
         
         return False
     
-    def calculate_escape_routes(self, game_map, bombs, bomb_x, bomb_y):
-        escape_routes = []
-        
-        future_bombs = list(bombs)
-        simulated_bomb = type('obj', (object,), {
-            'grid_x': bomb_x,
-            'grid_y': bomb_y,
-            'explosion_range': self.bomb_range,
-            'owner': self.character
-        })()
-        future_bombs.append(simulated_bomb)
-        
-        for direction in range(4):
-            dx, dy = Direction.DELTAS[direction]
-            
-            for distance in range(1, 4):
-                escape_x = bomb_x + dx * distance
-                escape_y = bomb_y + dy * distance
-                
-                if not (0 <= escape_x < COLS and 0 <= escape_y < ROWS):
-                    break
-                
-                if not game_map.is_walkable(escape_x, escape_y):
-                    break
-                
-                is_safe = True
-                for bomb in future_bombs:
-                    if self.is_position_in_bomb_range(escape_x, escape_y, bomb):
-                        is_safe = False
-                        break
-                
-                if is_safe:
-                    escape_routes.append({
-                        'direction': direction,
-                        'distance': distance,
-                        'position': (escape_x, escape_y)
-                    })
-                    break
-        
-        return escape_routes
-    
     def find_best_destructible_target(self, game_map):
         grid_x, grid_y = self.get_grid_pos()
         best_target = None
@@ -577,15 +458,10 @@ class Enemy:
             dx, dy = Direction.DELTAS[direction]
             test_x, test_y = grid_x + dx, grid_y + dy
             
-            if (0 <= test_x < COLS and 0 <= test_y < ROWS and 
-                game_map.is_walkable(test_x, test_y)):
-                safe_from_bombs = True
-                for bomb in bombs:
-                    if self.is_position_in_bomb_range(test_x, test_y, bomb):
-                        safe_from_bombs = False
-                        break
-                if safe_from_bombs:
-                    escape_directions += 1
+            if (0 <= test_x < COLS and 0 <= test_y < ROWS and
+                game_map.is_walkable(test_x, test_y) and
+                not self.danger_map.is_dangerous(test_x, test_y)):
+                escape_directions += 1
         
         if escape_directions < 2:
             return False
@@ -621,61 +497,6 @@ class Enemy:
         
         return False
 
-    def can_safely_escape_own_bomb(self, game_map, bombs, grid_x, grid_y):
-        explosion_range = self.bomb_range
-        
-        for direction in range(4):
-            dx, dy = Direction.DELTAS[direction]
-            
-            safe_distance = 0
-            for i in range(1, explosion_range + 3):
-                check_x = grid_x + dx * i
-                check_y = grid_y + dy * i
-                
-                if not (0 <= check_x < COLS and 0 <= check_y < ROWS):
-                    break
-                if not game_map.is_walkable(check_x, check_y):
-                    break
-                
-                safe_distance += 1
-            
-            if safe_distance >= 3:
-                return True
-        
-        return False
-
-    def has_long_escape_route(self, game_map, bombs, grid_x, grid_y):
-        long_routes = 0
-        
-        for direction in range(4):
-            dx, dy = Direction.DELTAS[direction]
-            route_length = 0
-            
-            for i in range(1, 6):
-                check_x = grid_x + dx * i
-                check_y = grid_y + dy * i
-                
-                if not (0 <= check_x < COLS and 0 <= check_y < ROWS):
-                    break
-                if not game_map.is_walkable(check_x, check_y):
-                    break
-                
-                safe_from_bombs = True
-                for bomb in bombs:
-                    if abs(bomb.grid_x - check_x) + abs(bomb.grid_y - check_y) <= bomb.explosion_range + 1:
-                        safe_from_bombs = False
-                        break
-                
-                if not safe_from_bombs:
-                    break
-                
-                route_length += 1
-            
-            if route_length >= 3:
-                long_routes += 1
-        
-        return long_routes >= 1
-
     def should_place_bomb_ultra_safe(self, game_map, player, bombs):
         if len(bombs) > 0:
             return False
@@ -725,121 +546,6 @@ class Enemy:
         
         return random.random() < 0.01
     
-    def count_escape_routes(self, game_map, bombs, grid_x, grid_y):
-        escape_routes = 0
-        
-        future_bombs = bombs + [type('', (), {
-            'grid_x': grid_x, 
-            'grid_y': grid_y, 
-            'explosion_range': self.bomb_range,
-            'owner': self.character
-        })()]
-        
-        for direction in range(4):
-            dx, dy = Direction.DELTAS[direction]
-            
-            escape_possible = False
-            for escape_distance in range(1, 4):
-                escape_x = grid_x + dx * escape_distance
-                escape_y = grid_y + dy * escape_distance
-                
-                if not (0 <= escape_x < COLS and 0 <= escape_y < ROWS):
-                    break
-                
-                if not game_map.is_walkable(escape_x, escape_y):
-                    break
-                
-                position_safe = True
-                for bomb in future_bombs:
-                    if ((bomb.grid_x == escape_x and abs(bomb.grid_y - escape_y) <= bomb.explosion_range) or
-                        (bomb.grid_y == escape_y and abs(bomb.grid_x - escape_x) <= bomb.explosion_range)):
-                        position_safe = False
-                        break
-                
-                if position_safe:
-                    escape_possible = True
-                    break
-            
-            if escape_possible:
-                escape_routes += 1
-                
-        return escape_routes
-
-    def can_escape_own_bomb(self, game_map, bombs, grid_x, grid_y):
-        max_escape_tiles = 4
-        
-        for direction in range(4):
-            dx, dy = Direction.DELTAS[direction]
-            
-            for distance in range(1, max_escape_tiles + 1):
-                escape_x = grid_x + dx * distance
-                escape_y = grid_y + dy * distance
-                
-                if not (0 <= escape_x < COLS and 0 <= escape_y < ROWS):
-                    break
-                
-                path_clear = True
-                for step in range(1, distance + 1):
-                    check_x = grid_x + dx * step
-                    check_y = grid_y + dy * step
-                    if not game_map.is_walkable(check_x, check_y):
-                        path_clear = False
-                        break
-                
-                if not path_clear:
-                    break
-                
-                if not ((grid_x == escape_x and abs(grid_y - escape_y) <= self.bomb_range) or
-                        (grid_y == escape_y and abs(grid_x - escape_x) <= self.bomb_range)):
-                    safe_from_others = True
-                    for bomb in bombs:
-                        if ((bomb.grid_x == escape_x and abs(bomb.grid_y - escape_y) <= bomb.explosion_range) or
-                            (bomb.grid_y == escape_y and abs(bomb.grid_x - escape_x) <= bomb.explosion_range)):
-                            safe_from_others = False
-                            break
-                    
-                    if safe_from_others:
-                        return True
-        
-        return False
-    
-    def has_any_escape_route(self, game_map, bombs, grid_x, grid_y):
-        max_escape_distance = 3
-        
-        for direction in range(4):
-            dx, dy = Direction.DELTAS[direction]
-            
-            for distance in range(1, max_escape_distance + 1):
-                escape_x = grid_x + dx * distance
-                escape_y = grid_y + dy * distance
-                
-                if not (0 <= escape_x < COLS and 0 <= escape_y < ROWS):
-                    break
-                
-                if not game_map.is_walkable(escape_x, escape_y):
-                    break
-                
-                bomb_danger = False
-                for bomb in bombs:
-                    bomb_distance = abs(escape_x - bomb.grid_x) + abs(escape_y - bomb.grid_y)
-                    if bomb_distance <= bomb.explosion_range:
-                        bomb_danger = True
-                        break
-                
-                if not bomb_danger:
-                    path_clear = True
-                    for step in range(1, distance):
-                        path_x = grid_x + dx * step
-                        path_y = grid_y + dy * step
-                        if not game_map.is_walkable(path_x, path_y):
-                            path_clear = False
-                            break
-                    
-                    if path_clear:
-                        return True
-        
-        return False
-    
     def is_direction_walkable(self, game_map, grid_x, grid_y, dx, dy):
         check_x = grid_x + dx
         check_y = grid_y + dy
@@ -898,7 +604,7 @@ class Enemy:
         valid_directions = [(dir, score) for dir, score in direction_scores.items() if score > -1000]
         
         if not valid_directions:
-            print(f"⚠️ {self.character} nenhuma direção válida encontrada")
+            logger.debug("⚠️ %s nenhuma direção válida encontrada", self.character)
             return None
         
         valid_directions.sort(key=lambda x: x[1], reverse=True)
@@ -908,26 +614,26 @@ class Enemy:
         if best_directions:
             chosen = random.choice(best_directions)
             safety_level = direction_scores[chosen]
-            print(f"🎯 {self.character} direção segura escolhida: {['↑','→','↓','←'][chosen]} (segurança: {safety_level:.1f})")
+            logger.debug("🎯 %s direção segura escolhida: %s (segurança: %.1f)", self.character, DIRECTION_ARROWS[chosen], safety_level)
             return chosen
         
         least_dangerous = valid_directions[0][0]
-        print(f"⚠️ {self.character} escolheu direção menos perigosa: {['↑','→','↓','←'][least_dangerous]}")
+        logger.debug("⚠️ %s escolheu direção menos perigosa: %s", self.character, DIRECTION_ARROWS[least_dangerous])
         return least_dangerous
     
     def calculate_direction_safety(self, game_map, bombs, check_x, check_y, direction):
         safety_score = 100
-        
-        for bomb in bombs:
-            if self.is_position_in_bomb_range(check_x, check_y, bomb):
-                time_left = BOMB_TIMER - (pygame.time.get_ticks() - bomb.timer)
-                if time_left < 1000:
-                    safety_score -= 1000
-                elif time_left < 2000:
-                    safety_score -= 500
-                else:
-                    safety_score -= 200
-        
+
+        time_left = self.danger_map.time_to_blast(check_x, check_y)
+        if time_left is not None:
+            threats = self.danger_map.threat_count(check_x, check_y)
+            if time_left < 1000:
+                safety_score -= 1000 * threats
+            elif time_left < 2000:
+                safety_score -= 500 * threats
+            else:
+                safety_score -= 200 * threats
+
         current_grid_x, current_grid_y = self.get_grid_pos()
         for bomb in bombs:
             current_distance = abs(current_grid_x - bomb.grid_x) + abs(current_grid_y - bomb.grid_y)
@@ -948,17 +654,10 @@ class Enemy:
                 break
             if not game_map.is_walkable(test_x, test_y):
                 break
-            
-            safe_in_path = True
-            for bomb in bombs:
-                if self.is_position_in_bomb_range(test_x, test_y, bomb):
-                    safe_in_path = False
-                    break
-            
-            if safe_in_path:
-                path_depth += 1
-            else:
+            if self.danger_map.is_dangerous(test_x, test_y):
                 break
+
+            path_depth += 1
         
         safety_score += path_depth * 20
         
@@ -985,21 +684,6 @@ class Enemy:
         
         return walkable_neighbors <= 2
     
-    def is_position_in_bomb_range(self, check_x, check_y, bomb):
-        bomb_x, bomb_y = bomb.grid_x, bomb.grid_y
-        
-        if check_y == bomb_y:
-            distance = abs(check_x - bomb_x)
-            if distance <= bomb.explosion_range:
-                return True
-        
-        if check_x == bomb_x:
-            distance = abs(check_y - bomb_y)
-            if distance <= bomb.explosion_range:
-                return True
-        
-        return False
-    
     def get_least_dangerous_direction(self, game_map, bombs, grid_x, grid_y):
         direction_danger = {}
         
@@ -1018,55 +702,68 @@ class Enemy:
     
     def get_attack_direction(self, game_map, player):
         grid_x, grid_y = self.get_grid_pos()
-        player_grid_x, player_grid_y = player.get_grid_pos()
         
-        dx = player_grid_x - grid_x
-        dy = player_grid_y - grid_y
+        if self.player_field is None:
+            return None
         
-        preferred_directions = []
+        distance = self.player_field.distance_at(grid_x, grid_y)
+        if distance is None or distance > 8:
+            return None
         
-        if abs(dx) > abs(dy):
-            if dx > 0:
-                preferred_directions.append(Direction.RIGHT)
-            else:
-                preferred_directions.append(Direction.LEFT)
-            if dy > 0:
-                preferred_directions.append(Direction.DOWN)
-            else:
-                preferred_directions.append(Direction.UP)
+        return self.player_field.next_direction(grid_x, grid_y, self.danger_map.is_dangerous)
+    
+    def can_follow_direction(self, game_map, direction):
+        # Fora do alinhamento o passo direto pode falhar; ainda vale se dá para alinhar primeiro
+        dx, dy = Direction.DELTAS[direction]
+        if game_map.can_move_to(self.x + dx * self.speed, self.y + dy * self.speed, self):
+            return True
+        
+        grid_x, grid_y = self.get_grid_pos()
+        if not game_map.is_walkable(grid_x + dx, grid_y + dy):
+            return False
+        
+        if dx == 0:
+            offset = grid_x * TILE_SIZE - self.x
         else:
-            if dy > 0:
-                preferred_directions.append(Direction.DOWN)
-            else:
-                preferred_directions.append(Direction.UP)
-            if dx > 0:
-                preferred_directions.append(Direction.RIGHT)
-            else:
-                preferred_directions.append(Direction.LEFT)
+            offset = grid_y * TILE_SIZE - self.y
+        return abs(offset) >= self.speed
+    
+    def follow_direction(self, game_map, direction):
+        if self.try_move_in_direction(game_map, direction):
+            return True
         
-        for direction in preferred_directions:
-            dx_test, dy_test = Direction.DELTAS[direction]
-            if self.is_direction_walkable(game_map, grid_x, grid_y, dx_test, dy_test):
-                return direction
+        grid_x, grid_y = self.get_grid_pos()
+        dx, dy = Direction.DELTAS[direction]
         
-        safe_directions = []
-        for direction in range(4):
-            dx_test, dy_test = Direction.DELTAS[direction]
-            if self.is_direction_walkable(game_map, grid_x, grid_y, dx_test, dy_test):
-                safe_directions.append(direction)
+        if dx == 0:
+            offset = grid_x * TILE_SIZE - self.x
+            align_direction = Direction.RIGHT if offset > 0 else Direction.LEFT
+        else:
+            offset = grid_y * TILE_SIZE - self.y
+            align_direction = Direction.DOWN if offset > 0 else Direction.UP
         
-        if safe_directions:
-            opposite_direction = (self.direction + 2) % 4
-            non_opposite_directions = [d for d in safe_directions if d != opposite_direction]
-            if non_opposite_directions:
-                return random.choice(non_opposite_directions)
-            else:
-                return random.choice(safe_directions)
+        if abs(offset) < self.speed:
+            return False
         
-        return self.direction
+        return self.try_move_in_direction(game_map, align_direction)
+    
+    def get_target_field(self, grid_x, grid_y):
+        # Sem bloco destrutível alcançável, explorar vira ir atrás do jogador
+        if self.brick_field is not None and self.brick_field.is_reachable(grid_x, grid_y):
+            return self.brick_field
+        return self.player_field
+    
+    def approaches_target(self, field, grid_x, grid_y, next_x, next_y):
+        if field is None:
+            return False
+        
+        current = field.distance_at(grid_x, grid_y)
+        distance = field.distance_at(next_x, next_y)
+        return current is not None and distance is not None and distance < current
     
     def get_exploration_direction(self, game_map):
         grid_x, grid_y = self.get_grid_pos()
+        field = self.get_target_field(grid_x, grid_y)
         
         direction_scores = {}
         
@@ -1079,32 +776,20 @@ class Enemy:
                 continue
             if not game_map.is_walkable(check_x, check_y):
                 continue
+            if not self.can_follow_direction(game_map, direction):
+                continue
             
             score = 10
             
-            destructible_nearby = 0
-            for search_range in range(1, 4):
-                search_x = check_x + dx * search_range
-                search_y = check_y + dy * search_range
-                
-                if not (0 <= search_x < COLS and 0 <= search_y < ROWS):
-                    break
-                
-                tile_type = game_map.get_tile(search_x, search_y)
-                if tile_type == TileType.WALL:
-                    break
-                elif tile_type == TileType.BRICK:
-                    destructible_nearby += 1
-                    score += 50
-                    break
+            if self.approaches_target(field, grid_x, grid_y, check_x, check_y):
+                score += 50
             
-            if hasattr(self, 'direction') and direction == self.direction:
+            if direction == self.direction:
                 score += 5
             
-            if hasattr(self, 'direction'):
-                opposite_direction = (self.direction + 2) % 4
-                if direction == opposite_direction:
-                    score -= 20
+            opposite_direction = (self.direction + 2) % 4
+            if direction == opposite_direction:
+                score -= 20
             
             direction_scores[direction] = score
         
@@ -1127,8 +812,10 @@ class Enemy:
             return False
         
         try:
-            new_bomb = Bomb(grid_x, grid_y, self.bomb_range, self.character)
+            new_bomb = Bomb(grid_x, grid_y, self.bomb_range, self.character, self.clock)
             bombs.append(new_bomb)
+            if self.danger_map:
+                self.danger_map.add_bomb(new_bomb, BOMB_TIMER)
             self.last_bomb_time = current_time
             return True
         except Exception as e:
@@ -1140,6 +827,17 @@ class Enemy:
         immediate_danger = self.assess_immediate_danger_level(bombs, current_time)
         
         if immediate_danger > 0:
+            escape_route = self.plan_escape(game_map, grid_x, grid_y)
+            if escape_route is not None:
+                direction = escape_route['direction']
+                if direction is None:
+                    direction = self.get_alignment_direction(grid_x, grid_y)
+                if direction is None:
+                    self.is_moving = False
+                    return
+                if self.follow_direction(game_map, direction):
+                    return
+            
             escape_direction = self.find_best_escape_direction(game_map, bombs, grid_x, grid_y, immediate_danger)
             if escape_direction is not None:
                 if self.try_move_in_direction(game_map, escape_direction):
@@ -1152,7 +850,7 @@ class Enemy:
         
         if hasattr(self, 'escape_mode_until') and current_time < self.escape_mode_until:
             if hasattr(self, 'escape_direction') and self.escape_direction is not None:
-                if self.try_move_in_direction(game_map, self.escape_direction):
+                if self.follow_direction(game_map, self.escape_direction):
                     return
                 else:
                     alternative = self.find_alternative_escape_direction(game_map, bombs)
@@ -1160,30 +858,35 @@ class Enemy:
                         self.escape_direction = alternative
                         return
         
+        if self.mode == "attack":
+            attack_direction = self.get_attack_direction(game_map, player)
+            if (attack_direction is not None and not self.moves_into_danger(attack_direction) and
+                    self.follow_direction(game_map, attack_direction)):
+                self.last_direction_change = current_time
+                return
+        
         self.handle_normal_movement(game_map, bombs, current_time)
     
     def assess_immediate_danger_level(self, bombs, current_time):
-        grid_x, grid_y = self.get_grid_pos()
-        max_danger = 0
-        
-        for bomb in bombs:
-            if self.is_position_in_bomb_range(grid_x, grid_y, bomb):
-                time_left = BOMB_TIMER - (current_time - bomb.timer)
-                distance = abs(grid_x - bomb.grid_x) + abs(grid_y - bomb.grid_y)
-                
-                danger_level = 0
-                if time_left < 800:
-                    danger_level = 3
-                elif time_left < 1500:
-                    danger_level = 2
-                elif time_left < 2500 and distance <= 1:
-                    danger_level = 2
-                elif time_left < 2500:
-                    danger_level = 1
-                
-                max_danger = max(max_danger, danger_level)
-        
-        return max_danger
+        threats = []
+        for x, y in self.occupied_cells(self.x, self.y):
+            time_left = self.danger_map.time_to_blast(x, y)
+            if time_left is not None:
+                threats.append((time_left, self.danger_map.distance_to_source(x, y)))
+        
+        if not threats:
+            return 0
+        
+        time_left = min(threat[0] for threat in threats)
+        distance = min(threat[1] for threat in threats)
+        
+        if time_left < 800:
+            return 3
+        elif time_left < 1500:
+            return 2
+        elif time_left < 2500 and distance <= 1:
+            return 2
+        return 1
     
     def find_best_escape_direction(self, game_map, bombs, grid_x, grid_y, danger_level):
         direction_scores = {}
@@ -1202,7 +905,7 @@ class Enemy:
             for bomb in bombs:
                 bomb_distance = abs(next_x - bomb.grid_x) + abs(next_y - bomb.grid_y)
                 
-                if self.is_position_in_bomb_range(next_x, next_y, bomb):
+                if self.danger_map.covers(bomb, next_x, next_y):
                     score -= 200
                 else:
                     score += bomb_distance * 10
@@ -1213,8 +916,11 @@ class Enemy:
                     if new_dist > current_dist:
                         score += 50
             
-            path_length = self.calculate_path_length(game_map, next_x, next_y, direction)
-            score += path_length * 5
+            safe_distance = self.safe_field.distance_at(next_x, next_y)
+            if safe_distance is None:
+                score -= 100
+            else:
+                score += max(0, 10 - safe_distance) * 15
             
             direction_scores[direction] = score
         
@@ -1224,23 +930,6 @@ class Enemy:
         best_direction = max(direction_scores, key=direction_scores.get)
         return best_direction if direction_scores[best_direction] > 0 else None
     
-    def calculate_path_length(self, game_map, start_x, start_y, direction):
-        dx, dy = Direction.DELTAS[direction]
-        length = 0
-        
-        for i in range(1, 5):
-            check_x = start_x + dx * i
-            check_y = start_y + dy * i
-            
-            if not (0 <= check_x < COLS and 0 <= check_y < ROWS):
-                break
-            if not game_map.is_walkable(check_x, check_y):
-                break
-                    
-            length += 1
-        
-        return length
-    
     def is_direction_safer(self, game_map, bombs, direction):
         grid_x, grid_y = self.get_grid_pos()
         dx, dy = Direction.DELTAS[direction]
@@ -1251,14 +940,8 @@ class Enemy:
         if not game_map.is_walkable(next_x, next_y):
             return False
         
-        current_danger = 0
-        new_danger = 0
-        
-        for bomb in bombs:
-            if self.is_position_in_bomb_range(grid_x, grid_y, bomb):
-                current_danger += 1
-            if self.is_position_in_bomb_range(next_x, next_y, bomb):
-                new_danger += 1
+        current_danger = self.danger_map.threat_count(grid_x, grid_y)
+        new_danger = self.danger_map.threat_count(next_x, next_y)
         
         return new_danger < current_danger
     
@@ -1306,13 +989,37 @@ class Enemy:
                 self.direction = new_direction
             self.last_direction_change = current_time
         
-        if not self.try_move_in_direction(game_map, self.direction):
+        if self.moves_into_danger(self.direction):
+            self.is_moving = False
+            return
+        
+        if not self.follow_direction(game_map, self.direction):
             alternative = self.choose_smart_direction(game_map, bombs)
-            if alternative is not None:
+            if alternative is not None and alternative != self.direction:
                 self.direction = alternative
-                self.try_move_in_direction(game_map, alternative)
+                self.follow_direction(game_map, alternative)
                 self.last_direction_change = current_time
     
+    def get_alignment_direction(self, grid_x, grid_y):
+        if self.x != grid_x * TILE_SIZE:
+            return Direction.RIGHT if grid_x * TILE_SIZE > self.x else Direction.LEFT
+        if self.y != grid_y * TILE_SIZE:
+            return Direction.DOWN if grid_y * TILE_SIZE > self.y else Direction.UP
+        return None
+    
+    def occupied_cells(self, pixel_x, pixel_y):
+        left = int(pixel_x // TILE_SIZE)
+        right = int((pixel_x + TILE_SIZE - 1) // TILE_SIZE)
+        top = int(pixel_y // TILE_SIZE)
+        bottom = int((pixel_y + TILE_SIZE - 1) // TILE_SIZE)
+        return {(x, y) for x in (left, right) for y in (top, bottom)}
+    
+    def moves_into_danger(self, direction):
+        dx, dy = Direction.DELTAS[direction]
+        new_cells = self.occupied_cells(self.x + dx * self.speed, self.y + dy * self.speed)
+        new_cells -= self.occupied_cells(self.x, self.y)
+        return any(self.danger_map.is_dangerous(x, y) for x, y in new_cells)
+    
     def can_continue_current_direction(self, game_map, bombs):
         dx, dy = Direction.DELTAS[self.direction]
         new_x = self.x + dx * self.speed
@@ -1333,6 +1040,7 @@ class Enemy:
     
     def choose_smart_direction(self, game_map, bombs):
         grid_x, grid_y = self.get_grid_pos()
+        field = self.get_target_field(grid_x, grid_y)
         direction_scores = {}
         
         for direction in range(4):
@@ -1343,50 +1051,35 @@ class Enemy:
                 continue
             if not game_map.is_walkable(next_x, next_y):
                 continue
+            if not self.can_follow_direction(game_map, direction):
+                continue
             
             score = 50
             
-            for bomb in bombs:
-                distance = abs(next_x - bomb.grid_x) + abs(next_y - bomb.grid_y)
-                if distance <= 3:
-                    score -= (4 - distance) * 20
-            
-            destructible_bonus = self.count_destructible_in_direction(game_map, next_x, next_y, direction)
-            score += destructible_bonus * 30
+            safe_distance = self.safe_field.distance_at(next_x, next_y)
+            if safe_distance is None:
+                score -= 100
+            else:
+                score -= safe_distance * 20
             
-            path_length = self.calculate_path_length(game_map, next_x, next_y, direction)
-            score += path_length * 10
+            if self.approaches_target(field, grid_x, grid_y, next_x, next_y):
+                score += 40
             
             if direction == self.direction:
                 score += 15
+            elif direction == (self.direction + 2) % 4:
+                score -= 20
             
             direction_scores[direction] = score
         
         if not direction_scores:
             return None
         
-        best_direction = max(direction_scores, key=direction_scores.get)
-        return best_direction if direction_scores[best_direction] > 0 else None
-    
-    def count_destructible_in_direction(self, game_map, start_x, start_y, direction):
-        dx, dy = Direction.DELTAS[direction]
-        count = 0
-        
-        for i in range(1, 4):
-            check_x = start_x + dx * i
-            check_y = start_y + dy * i
-            
-            if not (0 <= check_x < COLS and 0 <= check_y < ROWS):
-                break
-            
-            tile_type = game_map.get_tile(check_x, check_y)
-            if tile_type == TileType.WALL:
-                break
-            elif tile_type == TileType.BRICK:
-                count += 1
-                break
+        best_score = max(direction_scores.values())
+        if best_score <= 0:
+            return None
         
-        return count
+        return random.choice([dir for dir, score in direction_scores.items() if score == best_score])
     
     def find_safest_escape_direction(self, game_map, bombs, grid_x, grid_y):
         direction_safety = {}
@@ -1403,13 +1096,11 @@ class Enemy:
                 direction_safety[direction] = -1000
                 continue
             
-            safety_score = 100
-            
+            safety_score = 100 - self.danger_map.threat_count(next_x, next_y) * 500
+
             for bomb in bombs:
                 distance_to_bomb = abs(next_x - bomb.grid_x) + abs(next_y - bomb.grid_y)
-                if self.is_position_in_bomb_range(next_x, next_y, bomb):
-                    safety_score -= 500
-                elif distance_to_bomb <= 3:
+                if distance_to_bomb <= 3 and not self.danger_map.covers(bomb, next_x, next_y):
                     safety_score -= (4 - distance_to_bomb) * 50
             
             for bomb in bombs:
@@ -1498,14 +1189,8 @@ class Enemy:
                 continue
             if not game_map.is_walkable(next_x, next_y):
                 continue
-            
-            is_safe = True
-            for bomb in bombs:
-                if self.is_position_in_bomb_range(next_x, next_y, bomb):
-                    is_safe = False
-                    break
-            
-            if is_safe:
+
+            if not self.danger_map.is_dangerous(next_x, next_y):
                 return direction
         
         best_direction = None
@@ -1521,12 +1206,8 @@ class Enemy:
             if not game_map.is_walkable(next_x, next_y):
                 continue
             
-            danger = 0
-            for bomb in bombs:
-                if self.is_position_in_bomb_range(next_x, next_y, bomb):
-                    distance = abs(next_x - bomb.grid_x) + abs(next_y - bomb.grid_y)
-                    danger += (5 - distance)
-            
+            danger = self.danger_map.threat_count(next_x, next_y) * (5 - self.danger_map.distance_to_source(next_x, next_y))
+
             if danger < min_danger:
                 min_danger = danger
                 best_direction = direction
@@ -1548,14 +1229,8 @@ class Enemy:
     
     def assess_immediate_danger(self, bombs):
         grid_x, grid_y = self.get_grid_pos()
-        
-        for bomb in bombs:
-            if self.is_position_in_bomb_range(grid_x, grid_y, bomb):
-                time_left = BOMB_TIMER - (pygame.time.get_ticks() - bomb.timer)
-                if time_left < 1500:
-                    return True
-        
-        return False
+        time_left = self.danger_map.time_to_blast(grid_x, grid_y)
+        return time_left is not None and time_left < 1500
     
     def get_cautious_direction(self, game_map, bombs, player):
         grid_x, grid_y = self.get_grid_pos()
@@ -1666,7 +1341,7 @@ class Enemy:
                 if (0 <= escape_x < COLS and 0 <= escape_y < ROWS and 
                     game_map.is_walkable(escape_x, escape_y)):
                     
-                    print(f"🎯 {self.character} encontrou bloco destrutível adjacente em ({block_x}, {block_y}) - fuga: {escape_dir}")
+                    logger.debug("🎯 %s encontrou bloco destrutível adjacente em (%s, %s) - fuga: %s", self.character, block_x, block_y, escape_dir)
                     return {
                         'bomb_pos': (grid_x, grid_y),
                         'target_block': (block_x, block_y),
@@ -1686,20 +1361,21 @@ class Enemy:
         return pygame.Rect(self.x, self.y, TILE_SIZE, TILE_SIZE)
 
 class Bomb:
-    def __init__(self, grid_x, grid_y, explosion_range=2, owner="player"):
+    def __init__(self, grid_x, grid_y, explosion_range=2, owner="player", clock=None):
+        self.clock = clock or WALL_CLOCK
         self.grid_x = grid_x
         self.grid_y = grid_y
         self.x = grid_x * TILE_SIZE
         self.y = grid_y * TILE_SIZE
         self.explosion_range = explosion_range
         self.owner = owner
-        self.timer = pygame.time.get_ticks()
+        self.timer = self.clock.get_ticks()
         
         self.animation_timer = 0
         self.blinking = False
     
     def update(self, dt, game_map, player):
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         elapsed = current_time - self.timer
         
         self.animation_timer += dt
@@ -1710,6 +1386,7 @@ class Bomb:
     
     def explode(self, game_map):
         explosion_tiles = []
+        bricks_destroyed = 0
         
         explosion_tiles.append((self.grid_x, self.grid_y))
         game_map.set_tile(self.grid_x, self.grid_y, TileType.EXPLOSION)
@@ -1732,6 +1409,7 @@ class Bomb:
                 if tile_type == TileType.BRICK:
                     game_map.set_tile(x, y, TileType.EXPLOSION)
                     explosion_tiles.append((x, y))
+                    bricks_destroyed += 1
                     if random.random() < 0.3:
                         game_map.add_powerup_at(x, y)
                     break
@@ -1740,19 +1418,21 @@ class Bomb:
                     game_map.set_tile(x, y, TileType.EXPLOSION)
                     explosion_tiles.append((x, y))
         
-        return Explosion(explosion_tiles, self.grid_x, self.grid_y)
+        return Explosion(explosion_tiles, self.grid_x, self.grid_y, self.clock, bricks_destroyed)
 
 class Explosion:
-    def __init__(self, tiles, bomb_x, bomb_y):
+    def __init__(self, tiles, bomb_x, bomb_y, clock=None, bricks_destroyed=0):
+        self.clock = clock or WALL_CLOCK
         self.tiles = tiles
+        self.bricks_destroyed = bricks_destroyed
         self.bomb_x = bomb_x
         self.bomb_y = bomb_y
-        self.timer = pygame.time.get_ticks()
+        self.timer = self.clock.get_ticks()
         self.animation_timer = 0
         self.animation_frame = 0
     
     def update(self, dt, game_map):
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         self.animation_timer += dt
         
         if self.animation_timer > 100:
@@ -0,0 +1,85 @@
+from collections import deque
+import math
+from .constants import *
+
+def tile_travel_time(speed):
+    return math.ceil(TILE_SIZE / max(speed, 1)) * SIM_STEP_MS
+
+def is_window_clear(windows, start, end):
+    for window_start, window_end in windows:
+        if window_start <= end and start <= window_end:
+            return False
+    return True
+
+def is_safe_forever(windows, time):
+    for window_start, window_end in windows:
+        if window_end >= time:
+            return False
+    return True
+
+def plan_escape(game_map, danger_map, start_x, start_y, speed, start_delay=0, pending_blasts=()):
+    step_time = tile_travel_time(speed)
+    pending_blasts = list(pending_blasts)
+
+    def windows_at(x, y):
+        windows = danger_map.windows.get((x, y), [])
+        extra = [(start, end) for cells, start, end in pending_blasts if (x, y) in cells]
+        return windows + extra if extra else windows
+
+    horizon = start_delay
+    for windows in danger_map.windows.values():
+        for _, window_end in windows:
+            horizon = max(horizon, window_end)
+    for _, _, window_end in pending_blasts:
+        horizon = max(horizon, window_end)
+
+    max_steps = int((horizon - start_delay) // step_time) + 2
+
+    queue = deque([(start_x, start_y, 0, None)])
+    visited = {(start_x, start_y, 0)}
+
+    while queue:
+        x, y, steps, first_direction = queue.popleft()
+        time = start_delay + steps * step_time
+
+        if is_safe_forever(windows_at(x, y), time):
+            return {
+                'direction': first_direction,
+                'position': (x, y),
+                'steps': steps,
+                'arrival_time': time
+            }
+
+        if steps >= max_steps:
+            continue
+
+        current_windows = windows_at(x, y)
+        next_time = time + step_time
+
+        if is_window_clear(current_windows, time, next_time):
+            state = (x, y, steps + 1)
+            if state not in visited:
+                visited.add(state)
+                queue.append((x, y, steps + 1, first_direction))
+
+        for direction in range(4):
+            dx, dy = Direction.DELTAS[direction]
+            next_x, next_y = x + dx, y + dy
+
+            if not game_map.is_walkable(next_x, next_y):
+                continue
+
+            state = (next_x, next_y, steps + 1)
+            if state in visited:
+                continue
+
+            if not is_window_clear(current_windows, time, next_time):
+                continue
+            if not is_window_clear(windows_at(next_x, next_y), time, next_time):
+                continue
+
+            visited.add(state)
+            queue.append((next_x, next_y, steps + 1,
+                          direction if first_direction is None else first_direction))
+
+    return None
@@ -0,0 +1,133 @@
+from collections import deque
+import numpy as np
+from .constants import *
+
+UNREACHABLE = -1
+
+class FlowField:
+    def __init__(self, game_map, sources, passable=None):
+        self.game_map = game_map
+
+        if passable is None:
+            passable = game_map.walkable_mask()
+
+        self.distance = np.full((ROWS, COLS), UNREACHABLE, dtype=np.int32)
+        self.build(sources, passable.ravel().tolist())
+
+    def reset(self, sources, passable=None):
+        # Refaz o BFS no mesmo buffer de distâncias
+        if passable is None:
+            passable = self.game_map.walkable_mask()
+        self.build(sources, passable.ravel().tolist())
+
+    def build(self, sources, passable):
+        distance = [UNREACHABLE] * (ROWS * COLS)
+        queue = deque()
+
+        for x, y in sources:
+            if self.in_bounds(x, y):
+                index = y * COLS + x
+                if distance[index] == UNREACHABLE:
+                    distance[index] = 0
+                    queue.append(index)
+
+        while queue:
+            index = queue.popleft()
+            next_distance = distance[index] + 1
+            x = index % COLS
+
+            for neighbor in (
+                index - COLS,
+                index + 1 if x < COLS - 1 else -1,
+                index + COLS,
+                index - 1 if x > 0 else -1
+            ):
+                if 0 <= neighbor < ROWS * COLS and passable[neighbor] and distance[neighbor] == UNREACHABLE:
+                    distance[neighbor] = next_distance
+                    queue.append(neighbor)
+
+        self.distance.reshape(-1)[:] = distance
+
+    def in_bounds(self, x, y):
+        return 0 <= x < COLS and 0 <= y < ROWS
+
+    def distance_at(self, x, y):
+        if not self.in_bounds(x, y):
+            return None
+        distance = self.distance.item(y, x)
+        return None if distance == UNREACHABLE else distance
+
+    def is_reachable(self, x, y):
+        return self.distance_at(x, y) is not None
+
+    def next_direction(self, x, y, blocked=None):
+        current = self.distance_at(x, y)
+        if current is None or current == 0:
+            return None
+
+        best_direction = None
+        best_distance = current
+
+        for direction in range(4):
+            dx, dy = Direction.DELTAS[direction]
+            next_x, next_y = x + dx, y + dy
+
+            distance = self.distance_at(next_x, next_y)
+            if distance is None or distance >= best_distance:
+                continue
+            if blocked and blocked(next_x, next_y):
+                continue
+
+            best_direction = direction
+            best_distance = distance
+
+        return best_direction
+
+def make_field(game_map, sources, passable=None, field=None):
+    if field is None:
+        return FlowField(game_map, sources, passable)
+    field.reset(sources, passable)
+    return field
+
+def build_player_field(game_map, player, passable=None, field=None):
+    return make_field(game_map, [player.get_grid_pos()], passable, field)
+
+def build_safe_field(game_map, danger_map, passable=None, field=None):
+    if passable is None:
+        passable = game_map.walkable_mask()
+
+    if not danger_map.threats.any():
+        field = make_field(game_map, [], passable, field)
+        field.distance[passable] = 0
+        return field
+
+    safe_cells = game_map.free_cells(passable & danger_map.safe_mask())
+    return make_field(game_map, safe_cells, passable, field)
+
+def build_brick_field(game_map, passable=None, field=None):
+    if passable is None:
+        passable = game_map.walkable_mask()
+
+    # Alvos são as casas livres vizinhas de um bloco destrutível: é dali que a bomba o alcança
+    bricks = game_map.grid == TileType.BRICK
+    near_brick = np.zeros_like(bricks)
+    near_brick[1:, :] |= bricks[:-1, :]
+    near_brick[:-1, :] |= bricks[1:, :]
+    near_brick[:, 1:] |= bricks[:, :-1]
+    near_brick[:, :-1] |= bricks[:, 1:]
+
+    return make_field(game_map, game_map.free_cells(passable & near_brick), passable, field)
+
+class FlowFieldCache:
+    # O campo só é refeito quando a chave muda (versão da grade, alvo, ameaças), e no mesmo buffer
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, name, key, build):
+        entry = self.entries.get(name)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+
+        field = build(entry[1] if entry else None)
+        self.entries[name] = (key, field)
+        return field
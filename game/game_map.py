@@ -1,23 +1,39 @@
 
+import logging
 import random
+import numpy as np
+import pygame
 from .constants import *
 from .entities import PowerUp
 
+logger = logging.getLogger(__name__)
+
+WALKABLE_TILES = np.zeros(256, dtype=bool)
+WALKABLE_TILES[[TileType.EMPTY, TileType.POWERUP_BOMB,
+                TileType.POWERUP_RANGE, TileType.POWERUP_SPEED]] = True
+
+STATIC_TILES = np.zeros(256, dtype=bool)
+STATIC_TILES[[TileType.WALL, TileType.BRICK]] = True
+
+COLLISION_TILE_TYPES = np.array([TileType.EMPTY, TileType.BRICK, TileType.WALL], dtype=np.uint8)
+
 class GameMap:
     def __init__(self, sprite_manager=None):
-        self.grid = []
+        self.grid = None
         self.powerups = []
         self.sprite_manager = sprite_manager
+        self.static_layer = None
+        self.static_layer_theme = None
+        self.dirty_static_tiles = set()
+        # Sobe a cada mudança na grade: quem guarda algo derivado dela (campos de fluxo) compara a versão
+        self.version = 0
         self.init_empty_map()
     
     def init_empty_map(self):
       
-        self.grid = []
-        for y in range(ROWS):
-            row = []
-            for x in range(COLS):
-                row.append(TileType.EMPTY)
-            self.grid.append(row)
+        self.grid = np.full((ROWS, COLS), TileType.EMPTY, dtype=np.uint8)
+        self.version += 1
+        self.invalidate_static_layer()
     
     def generate_level(self, level=1):
         
@@ -30,53 +46,61 @@ class GameMap:
             
             new_theme = self.sprite_manager.get_theme_for_level(level)
             self.sprite_manager.set_map_theme(new_theme)
-            print(f"🎨 Nível {level}: Usando tema '{new_theme}'")
+            logger.info("🎨 Nível %s: Usando tema '%s'", level, new_theme)
         
         if (self.sprite_manager and 
             hasattr(self.sprite_manager, 'collision_grid') and
             self.sprite_manager.collision_grid):
             
-            print("🎮 Usando sistema de 3 camadas (fundo + blocos)")
+            logger.info("🎮 Usando sistema de 3 camadas (fundo + blocos)")
            
-            for y in range(ROWS):
-                for x in range(COLS):
-                    if (y < len(self.sprite_manager.collision_grid) and
-                        x < len(self.sprite_manager.collision_grid[y])):
-                        
-                        tile_type = self.sprite_manager.get_tile_type_at(x, y)
-                        self.grid[y][x] = tile_type
+            collision = np.asarray(self.sprite_manager.collision_grid)
+            rows = min(ROWS, collision.shape[0])
+            cols = min(COLS, collision.shape[1])
+            self.grid[:rows, :cols] = COLLISION_TILE_TYPES[np.clip(collision[:rows, :cols], 0, 2)]
        
             self.add_random_powerups(level)
             
         else:
            
-            print("🎮 Usando geração de mapa tradicional (fallback)")
+            logger.info("🎮 Usando geração de mapa tradicional (fallback)")
             self.generate_traditional_level(level)
+        
+        self.version += 1
+    
+    def load_layout(self, grid, powerups):
+        # Mapa já pronto (replays): grade ROWSxCOLS e power-ups como (x, y, tipo)
+        self.init_empty_map()
+        self.grid[:] = np.asarray(grid, dtype=np.uint8).reshape(ROWS, COLS)
+        self.version += 1
+        self.powerups = [PowerUp(x, y, powerup_type) for x, y, powerup_type in powerups]
     
     def generate_traditional_level(self, level=1):
       
-        for y in range(ROWS):
-            for x in range(COLS):
-                
-                if x == 0 or y == 0 or x == COLS - 1 or y == ROWS - 1:
-                    self.grid[y][x] = TileType.WALL
-                
-                elif x % 2 == 0 and y % 2 == 0:
-                    self.grid[y][x] = TileType.WALL
+        ys, xs = np.indices((ROWS, COLS))
+        border = (xs == 0) | (ys == 0) | (xs == COLS - 1) | (ys == ROWS - 1)
+        pillars = (xs % 2 == 0) & (ys % 2 == 0)
+        for x, y in [(1, 1), (COLS - 2, 1), (1, ROWS - 2), (COLS - 2, ROWS - 2)]:
+            pillars[y, x] = False
+        self.grid[border | pillars] = TileType.WALL
         
         
         brick_density = min(0.4 + level * 0.05, 0.7)
         
         for y in range(1, ROWS - 1):
             for x in range(1, COLS - 1):
-                if self.grid[y][x] == TileType.EMPTY:
+                if self.grid[y, x] == TileType.EMPTY:
                     
-                    if not (x <= 2 and y <= 2):
+                    if not self.is_spawn_area(x, y):
                         if random.random() < brick_density:
-                            self.grid[y][x] = TileType.BRICK
+                            self.grid[y, x] = TileType.BRICK
         
         self.add_random_powerups(level)
     
+    def is_spawn_area(self, x, y):
+        
+        return (x <= 2 or x >= COLS - 3) and (y <= 2 or y >= ROWS - 3)
+    
     def add_random_powerups(self, level=1):
        
         powerup_count = min(3 + level, 8)  
@@ -87,7 +111,7 @@ class GameMap:
                 x = random.randint(3, COLS - 4) 
                 y = random.randint(3, ROWS - 4)
                 
-                if self.grid[y][x] == TileType.EMPTY:
+                if self.grid[y, x] == TileType.EMPTY:
                 
                     powerup_types = [TileType.POWERUP_BOMB, TileType.POWERUP_RANGE, TileType.POWERUP_SPEED]
                     powerup_type = random.choice(powerup_types)
@@ -99,7 +123,7 @@ class GameMap:
     def get_tile(self, x, y):
    
         if 0 <= x < COLS and 0 <= y < ROWS:
-            return self.grid[y][x]
+            return self.grid.item(y, x)
         return TileType.WALL  
     
     def has_clear_line_of_sight(self, x1, y1, x2, y2):
@@ -173,13 +197,30 @@ class GameMap:
     def set_tile(self, x, y, tile_type):
       
         if 0 <= x < COLS and 0 <= y < ROWS:
-            self.grid[y][x] = tile_type
+            previous = self.grid.item(y, x)
+            if previous == tile_type:
+                return
+            self.grid[y, x] = tile_type
+            self.version += 1
+            if STATIC_TILES[previous] or STATIC_TILES[tile_type]:
+                self.dirty_static_tiles.add((x, y))
     
     def is_walkable(self, x, y):
        
-        tile = self.get_tile(x, y)
-        return tile in [TileType.EMPTY, TileType.POWERUP_BOMB, 
-                       TileType.POWERUP_RANGE, TileType.POWERUP_SPEED]
+        if 0 <= x < COLS and 0 <= y < ROWS:
+            return bool(WALKABLE_TILES[self.grid.item(y, x)])
+        return False
+    
+    def walkable_mask(self):
+        
+        return WALKABLE_TILES[self.grid]
+    
+    def free_cells(self, mask=None):
+        
+        if mask is None:
+            mask = self.walkable_mask()
+        ys, xs = np.nonzero(mask)
+        return list(zip(xs.tolist(), ys.tolist()))
     
     def can_move_to(self, pixel_x, pixel_y, entity):
         
@@ -285,15 +326,12 @@ class GameMap:
     
     def get_valid_spawn_positions(self, avoid_area_size=3):
         
-        valid_positions = []
+        mask = self.walkable_mask()
+        mask[0, :] = mask[-1, :] = False
+        mask[:, 0] = mask[:, -1] = False
+        mask[:avoid_area_size + 1, :avoid_area_size + 1] = False
         
-        for y in range(1, ROWS - 1):
-            for x in range(1, COLS - 1):
-                if (self.is_walkable(x, y) and 
-                    not (x <= avoid_area_size and y <= avoid_area_size)):
-                    valid_positions.append((x, y))
-        
-        return valid_positions
+        return self.free_cells(mask)
 
     def get_corner_spawn_positions_with_space(self, min_space=3):
      
@@ -318,18 +356,11 @@ class GameMap:
         if not self.is_walkable(center_x, center_y):
             return False
             
-        free_count = 0
-        
-       
-        for dy in range(-min_radius, min_radius + 1):
-            for dx in range(-min_radius, min_radius + 1):
-                check_x = center_x + dx
-                check_y = center_y + dy
-                
-             
-                if 0 <= check_x < COLS and 0 <= check_y < ROWS:
-                    if self.is_walkable(check_x, check_y):
-                        free_count += 1
+        area = self.walkable_mask()[
+            max(0, center_y - min_radius):center_y + min_radius + 1,
+            max(0, center_x - min_radius):center_x + min_radius + 1
+        ]
+        free_count = int(np.count_nonzero(area))
         
        
         total_area = (2 * min_radius + 1) ** 2
@@ -337,48 +368,62 @@ class GameMap:
     
     def count_destructible_blocks(self):
         
-        count = 0
-        for y in range(ROWS):
-            for x in range(COLS):
-                if self.grid[y][x] == TileType.BRICK:
-                    count += 1
-        return count
+        return int(np.count_nonzero(self.grid == TileType.BRICK))
+    
+    def invalidate_static_layer(self):
+        
+        self.static_layer_theme = None
+        self.dirty_static_tiles.clear()
+    
+    def build_static_layer(self, sprite_manager):
+        
+        if self.static_layer is None:
+            self.static_layer = pygame.Surface((COLS * TILE_SIZE, ROWS * TILE_SIZE))
+            if pygame.display.get_surface() is not None:
+                self.static_layer = self.static_layer.convert()
+        
+        if not sprite_manager.draw_background_map(self.static_layer):
+            self.static_layer.fill((34, 139, 34))
+        
+        ys, xs = np.nonzero(STATIC_TILES[self.grid])
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            self.draw_static_tile(sprite_manager, x, y)
+        
+        self.static_layer_theme = getattr(sprite_manager, 'current_theme', 'default')
+        self.dirty_static_tiles.clear()
+    
+    def draw_static_tile(self, sprite_manager, x, y):
+        
+        tile_rect = pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+        
+        if not sprite_manager.draw_background_area(self.static_layer, tile_rect):
+            self.static_layer.fill((34, 139, 34), tile_rect)
+        
+        tile_type = self.grid.item(y, x)
+        if tile_type == TileType.WALL:
+            sprite_manager.draw_sprite(self.static_layer, "wall", tile_rect.x, tile_rect.y)
+        elif tile_type == TileType.BRICK:
+            sprite_manager.draw_sprite(self.static_layer, "brick", tile_rect.x, tile_rect.y)
+    
+    def update_static_layer(self, sprite_manager):
+        
+        theme = getattr(sprite_manager, 'current_theme', 'default')
+        if self.static_layer is None or self.static_layer_theme != theme:
+            self.build_static_layer(sprite_manager)
+            return
+        
+        for x, y in self.dirty_static_tiles:
+            self.draw_static_tile(sprite_manager, x, y)
+        self.dirty_static_tiles.clear()
     
     def render(self, surface, sprite_manager):
        
-        if hasattr(sprite_manager, 'background_map') and sprite_manager.background_map:
-          
-            for y in range(ROWS):
-                for x in range(COLS):
-                    pixel_x = x * TILE_SIZE
-                    pixel_y = y * TILE_SIZE
-                    tile_type = self.grid[y][x]
-                 
-                    if tile_type == TileType.WALL:
-                        sprite_manager.draw_sprite(surface, "wall", pixel_x, pixel_y)
-                    elif tile_type == TileType.BRICK:
-                        sprite_manager.draw_sprite(surface, "brick", pixel_x, pixel_y)
-                    elif tile_type == TileType.EXPLOSION:
-                        sprite_manager.draw_sprite(surface, "explosion", pixel_x, pixel_y)
-        else:
-          
-            for y in range(ROWS):
-                for x in range(COLS):
-                    pixel_x = x * TILE_SIZE
-                    pixel_y = y * TILE_SIZE
-                    tile_type = self.grid[y][x]
-                    
-         
-                    if tile_type == TileType.WALL:
-                        sprite_manager.draw_sprite(surface, "wall", pixel_x, pixel_y)
-                    elif tile_type == TileType.BRICK:
-                        sprite_manager.draw_sprite(surface, "brick", pixel_x, pixel_y)
-                    elif tile_type == TileType.BOMB:
-                       
-                        pass
-                    elif tile_type == TileType.EXPLOSION:
-                        sprite_manager.draw_sprite(surface, "explosion", pixel_x, pixel_y)
-                   
+        self.update_static_layer(sprite_manager)
+        surface.blit(self.static_layer, (0, 0))
+        
+        ys, xs = np.nonzero(self.grid == TileType.EXPLOSION)
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            sprite_manager.draw_sprite(surface, "explosion", x * TILE_SIZE, y * TILE_SIZE)
         
      
         for powerup in self.powerups:
@@ -393,10 +438,8 @@ class GameMap:
     
     def clear_explosions(self):
        
-        for y in range(ROWS):
-            for x in range(COLS):
-                if self.grid[y][x] == TileType.EXPLOSION:
-                    self.grid[y][x] = TileType.EMPTY
+        self.grid[self.grid == TileType.EXPLOSION] = TileType.EMPTY
+        self.version += 1
     
     def get_safe_positions_from_explosions(self, explosion_tiles):
 
@@ -0,0 +1,111 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+
+LOGGER_NAME = "game"
+LOG_FORMAT = "%(message)s"
+RATE_LIMIT_INTERVAL = 1.0
+RATE_LIMIT_BURST = 3
+
+class RateLimitFilter(logging.Filter):
+    # Limita por modelo da mensagem (antes da formatação): "aguardando vez" de todos os
+    # inimigos conta como a mesma mensagem
+    def __init__(self, interval=RATE_LIMIT_INTERVAL, burst=RATE_LIMIT_BURST):
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self.windows = {}
+
+    def filter(self, record):
+        if record.levelno >= logging.ERROR:
+            return True
+
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        window = self.windows.get(key)
+
+        if window is None or now - window[0] >= self.interval:
+            suppressed = window[2] if window else 0
+            self.windows[key] = [now, 1, 0]
+            if suppressed:
+                record.suppressed = suppressed
+            return True
+
+        if window[1] < self.burst:
+            window[1] += 1
+            return True
+
+        window[2] += 1
+        return False
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    # A formatação fica para a thread do QueueListener; o quadro só enfileira o registro
+    def prepare(self, record):
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class SuppressedCountFormatter(logging.Formatter):
+    def format(self, record):
+        message = super().format(record)
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            message += f" (+{suppressed} mensagens iguais suprimidas)"
+        return message
+
+_listener = None
+
+def setup_logging(level=None, stream=None):
+    global _listener
+    logger = logging.getLogger(LOGGER_NAME)
+    if _listener is not None:
+        if level is not None:
+            logger.setLevel(level)
+        return logger
+
+    level = level or os.environ.get("BOOM_LOG_LEVEL", "INFO").upper()
+    log_queue = queue.SimpleQueue()
+
+    console = logging.StreamHandler(stream or sys.stdout)
+    console.setFormatter(SuppressedCountFormatter(LOG_FORMAT))
+
+    handler = DeferredQueueHandler(log_queue)
+    handler.addFilter(RateLimitFilter())
+
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, console)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return logger
+
+def shutdown_logging():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+        logger = logging.getLogger(LOGGER_NAME)
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+
+def reset_after_fork():
+    # A thread do QueueListener não sobrevive ao fork: o processo filho monta a sua com setup_logging
+    global _listener
+    if _listener is not None:
+        _listener = None
+        logger = logging.getLogger(LOGGER_NAME)
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_after_fork)
+
+def set_log_level(level):
+    logging.getLogger(LOGGER_NAME).setLevel(level)
@@ -0,0 +1,147 @@
+import queue
+import random
+import threading
+import numpy as np
+import pygame
+from .tracer import get_tracer
+
+MUSIC_BPM = 132
+MUSIC_STEPS_PER_BAR = 16
+MUSIC_BUFFER_CHUNKS = 3
+MUSIC_VOLUME = 0.5
+MUSIC_BASE_FREQUENCY = 220.0
+
+# Progressão I - V - vi - IV (semitons a partir da tônica, acorde maior/menor)
+MUSIC_PROGRESSION = [(0, 'major'), (7, 'major'), (9, 'minor'), (5, 'major')]
+CHORD_INTERVALS = {'major': [0, 4, 7, 12], 'minor': [0, 3, 7, 12]}
+PENTATONIC = [0, 2, 4, 7, 9, 12, 14, 16]
+
+ARPEGGIO_PATTERNS = [
+    [0, 1, 2, 3, 2, 1, 0, 1, 0, 1, 2, 3, 2, 1, 0, 1],
+    [0, 2, 1, 3, 0, 2, 1, 3, 0, 2, 1, 3, 0, 2, 1, 3],
+    [3, 2, 1, 0, 3, 2, 1, 0, 1, 2, 3, 2, 1, 2, 3, 2]
+]
+
+def note_frequency(semitones):
+    return MUSIC_BASE_FREQUENCY * 2 ** (semitones / 12)
+
+class ChiptuneMusic:
+    def __init__(self, sample_rate=22050, bpm=MUSIC_BPM, seed=None, buffer_chunks=MUSIC_BUFFER_CHUNKS):
+        self.sample_rate = sample_rate
+        self.step_frames = int(sample_rate * 60 / bpm / 4)
+        self.bar_frames = self.step_frames * MUSIC_STEPS_PER_BAR
+        # Gerador próprio: a música não pode consumir o random global da simulação
+        self.rng = random.Random(seed)
+        self.noise_rng = np.random.default_rng(seed)
+        self.buffer = queue.Queue(maxsize=buffer_chunks)
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.bar_index = 0
+        self.tracer = get_tracer()
+        self.playing = False
+        self.underruns = 0
+
+    @property
+    def running(self):
+        return self.thread is not None
+
+    def start(self):
+        if self.running:
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.worker, name="music-synth", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if not self.running:
+            return
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+        self.playing = False
+        while not self.buffer.empty():
+            self.buffer.get_nowait()
+
+    def worker(self):
+        while not self.stop_event.is_set():
+            with self.tracer.span('ChiptuneMusic.synthesize_bar', {'bar': self.bar_index}):
+                chunk = self.synthesize_bar(self.bar_index)
+            self.bar_index += 1
+            while not self.stop_event.is_set():
+                try:
+                    self.buffer.put(chunk, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    def update(self, channel):
+        # Chamado a cada quadro na thread principal: mantém um trecho na fila do canal
+        if not self.running or channel.get_queue() is not None:
+            return
+
+        try:
+            chunk = self.buffer.get_nowait()
+        except queue.Empty:
+            if self.playing and not channel.get_busy():
+                self.underruns += 1
+            return
+
+        sound = pygame.sndarray.make_sound(chunk)
+        if channel.get_busy():
+            channel.queue(sound)
+        else:
+            channel.set_volume(MUSIC_VOLUME)
+            channel.play(sound)
+            self.playing = True
+
+    def envelope(self, frames, decay):
+        attack = min(frames, 40)
+        env = np.exp(-np.arange(frames) * (decay / self.sample_rate))
+        env[:attack] *= np.arange(attack) / attack
+        return env
+
+    def voice(self, frequency, frames, wave_type, decay):
+        t = np.arange(frames) / self.sample_rate
+        phase = t * frequency
+        if wave_type == 'square':
+            wave = np.where(phase % 1.0 < 0.5, 1.0, -1.0)
+        elif wave_type == 'triangle':
+            wave = 2 * np.abs(2 * (phase - np.floor(phase + 0.5))) - 1
+        else:
+            wave = np.sin(2 * np.pi * phase)
+        return wave * self.envelope(frames, decay)
+
+    def synthesize_bar(self, bar_index):
+        root, quality = MUSIC_PROGRESSION[bar_index % len(MUSIC_PROGRESSION)]
+        chord = [root + interval for interval in CHORD_INTERVALS[quality]]
+        step = self.step_frames
+        mix = np.zeros(self.bar_frames)
+
+        # A cada volta da progressão o arpejo e a melodia mudam, mas o compasso sempre fecha no tempo
+        pattern = ARPEGGIO_PATTERNS[(bar_index // len(MUSIC_PROGRESSION)) % len(ARPEGGIO_PATTERNS)]
+        for index, tone in enumerate(pattern):
+            start = index * step
+            mix[start:start + step] += 0.10 * self.voice(note_frequency(chord[tone] + 12), step, 'square', 18)
+
+        for index in range(0, MUSIC_STEPS_PER_BAR, 2):
+            start = index * step
+            mix[start:start + 2 * step] += 0.22 * self.voice(note_frequency(root - 12), 2 * step, 'triangle', 4)
+
+        index = 0
+        while index < MUSIC_STEPS_PER_BAR:
+            length = self.rng.choice([2, 2, 4])
+            if self.rng.random() < 0.7:
+                interval = self.rng.choice(PENTATONIC)
+                frames = min(length, MUSIC_STEPS_PER_BAR - index) * step
+                start = index * step
+                mix[start:start + frames] += 0.08 * self.voice(note_frequency(root + interval + 12), frames, 'sine', 6)
+            index += length
+
+        hat_frames = step // 3
+        hat = self.noise_rng.uniform(-1, 1, hat_frames) * self.envelope(hat_frames, 300)
+        for index in range(2, MUSIC_STEPS_PER_BAR, 4):
+            start = index * step
+            mix[start:start + hat_frames] += 0.05 * hat
+
+        samples = (np.clip(mix, -1, 1) * 32767).astype(np.int16)
+        return np.column_stack((samples, samples))
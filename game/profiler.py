@@ -0,0 +1,145 @@
+import os
+import time
+from collections import deque
+import numpy as np
+import pygame
+from .tracer import get_tracer, NULL_SECTION
+
+PROFILE_WINDOW = 300
+PROFILE_PERCENTILES = (50, 95, 99)
+PROFILE_OVERLAY_REFRESH = 30
+
+class Section:
+    __slots__ = ('profiler', 'name', 'args', 'started')
+
+    def __init__(self, profiler, name, args):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        ended = time.perf_counter()
+        profiler = self.profiler
+        if profiler.enabled:
+            profiler.add(self.name, (ended - self.started) * 1000)
+        # Toda seção medida também vira um span no trace (quando ligado)
+        profiler.tracer.complete(self.name, self.started, ended, self.args)
+        return False
+
+class Profiler:
+    def __init__(self, enabled=False, window=PROFILE_WINDOW, tracer=None):
+        self.enabled = enabled
+        self.tracer = tracer or get_tracer()
+        self.window = window
+        self.samples = {}
+        self.frame_totals = {}
+        self.frame_started = None
+        self.frame_index = 0
+        self.font = None
+        self.overlay = None
+        self.overlay_frame = None
+
+    def section(self, name, args=None):
+        # Desligado, devolve sempre o mesmo objeto vazio: custo de uma chamada por seção
+        if not self.enabled and not self.tracer.enabled:
+            return NULL_SECTION
+        return Section(self, name, args)
+
+    def add(self, name, elapsed_ms):
+        self.frame_totals[name] = self.frame_totals.get(name, 0.0) + elapsed_ms
+
+    def begin_frame(self):
+        if self.enabled or self.tracer.enabled:
+            self.frame_started = time.perf_counter()
+
+    def end_frame(self):
+        if self.frame_started is None:
+            return
+
+        ended = time.perf_counter()
+        self.tracer.complete('frame', self.frame_started, ended, {'frame': self.frame_index})
+        if not self.enabled:
+            self.frame_started = None
+            self.frame_index += 1
+            return
+
+        self.add('frame', (ended - self.frame_started) * 1000)
+        for name, elapsed in self.frame_totals.items():
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen=self.window)
+            self.samples[name].append(elapsed)
+
+        self.frame_totals = {}
+        self.frame_started = None
+        self.frame_index += 1
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.frame_totals = {}
+        self.frame_started = None
+
+    def reset(self):
+        self.samples = {}
+        self.frame_totals = {}
+
+    def stats(self, percentiles=PROFILE_PERCENTILES):
+        result = {}
+        for name, samples in self.samples.items():
+            if not samples:
+                continue
+            values = np.fromiter(samples, dtype=np.float64, count=len(samples))
+            entry = {'count': len(values), 'mean': float(values.mean()), 'max': float(values.max())}
+            for percentile, value in zip(percentiles, np.percentile(values, percentiles)):
+                entry[f'p{percentile}'] = float(value)
+            result[name] = entry
+        return result
+
+    def summary_lines(self):
+        stats = self.stats()
+        names = sorted(stats, key=lambda name: (name != 'frame', -stats[name]['p95']))
+        lines = [f"tempo por quadro em ms (últimos {self.window})",
+                 f"{'seção':<18}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for name in names:
+            entry = stats[name]
+            lines.append(f"{name:<18}{entry['p50']:>7.2f}{entry['p95']:>7.2f}{entry['p99']:>7.2f}")
+        return lines
+
+    def render_overlay(self):
+        if self.font is None:
+            self.font = pygame.font.Font(None, 18)
+
+        lines = self.summary_lines()
+        line_height = self.font.get_linesize()
+        columns = [(0, 0)] + [(index, 110 + index * 45) for index in range(1, 4)]
+
+        rows = [line.split() if index else [line] for index, line in enumerate(lines)]
+        width = max(self.font.size(lines[0])[0], columns[-1][1] + self.font.size("000.00")[0]) + 12
+        panel = pygame.Surface((width, line_height * len(lines) + 8), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+
+        for row_index, row in enumerate(rows):
+            y = 4 + row_index * line_height
+            for column, x in columns[:len(row)]:
+                text = self.font.render(row[column], True, (200, 255, 200))
+                panel.blit(text, (6 + x, y))
+        return panel
+
+    def draw_overlay(self, surface, x=10, y=45):
+        # Percentis e texto só são refeitos a cada PROFILE_OVERLAY_REFRESH quadros
+        if self.overlay is None or self.frame_index - self.overlay_frame >= PROFILE_OVERLAY_REFRESH:
+            self.overlay = self.render_overlay()
+            self.overlay_frame = self.frame_index
+
+        return surface.blit(self.overlay, (x, y))
+
+_default_profiler = None
+
+def get_profiler():
+    global _default_profiler
+    if _default_profiler is None:
+        _default_profiler = Profiler(enabled=os.environ.get("BOOM_PROFILE", "0") == "1")
+    return _default_profiler
@@ -0,0 +1,346 @@
+import argparse
+import bisect
+import logging
+import os
+import struct
+import time
+import zlib
+import numpy as np
+from .constants import *
+from .simulation import GameSimulation
+from .snapshot import take_snapshot, restore_snapshot
+from .log import setup_logging
+
+REPLAY_MAGIC = b"BOOMRPL\0"
+REPLAY_VERSION = 2
+REPLAY_HEADER = struct.Struct("<8sHBB")
+DEFAULT_REPLAY_PATH = "boom_replay.rpl"
+
+# Registros: 'L' início de nível, 'T' sequência de ticks iguais, 'K' keyframe, 'E' fim de nível.
+# No fim do arquivo fica o índice dos keyframes e um rodapé apontando para ele.
+LEVEL_RECORD = struct.Struct("<cHIII")
+TICK_RECORD = struct.Struct("<cBHH")
+KEYFRAME_RECORD = struct.Struct("<cIBI")
+END_RECORD = struct.Struct("<cBIII")
+POWERUP_RECORD = struct.Struct("<BBB")
+INDEX_ENTRY = struct.Struct("<HII")
+INDEX_FOOTER = struct.Struct("<4sII")
+INDEX_MAGIC = b"RIDX"
+
+KEYFRAME_INTERVAL = 600
+FULL_KEYFRAME_EVERY = 8
+
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_UP = 4
+INPUT_DOWN = 8
+INPUT_BOMB = 16
+
+OUTCOMES = [None, GameState.VICTORY, GameState.GAME_OVER]
+
+def encode_inputs(inputs):
+    dx, dy = inputs.get('dx', 0), inputs.get('dy', 0)
+    flags = INPUT_LEFT if dx < 0 else INPUT_RIGHT if dx > 0 else 0
+    flags |= INPUT_UP if dy < 0 else INPUT_DOWN if dy > 0 else 0
+    if inputs.get('bomb'):
+        flags |= INPUT_BOMB
+    return flags
+
+def decode_inputs(flags):
+    dx = -1 if flags & INPUT_LEFT else 1 if flags & INPUT_RIGHT else 0
+    dy = -1 if flags & INPUT_UP else 1 if flags & INPUT_DOWN else 0
+    return {'dx': dx, 'dy': dy, 'bomb': bool(flags & INPUT_BOMB)}
+
+def state_checksum(simulation):
+    # Resumo do estado para conferir se a reprodução seguiu o mesmo caminho da gravação
+    checksum = zlib.crc32(simulation.game_map.grid.tobytes())
+    player = simulation.player
+    values = [player.x, player.y, float(player.lives)]
+    values += [value for enemy in simulation.enemies for value in (enemy.x, enemy.y, float(enemy.alive))]
+    checksum = zlib.crc32(struct.pack(f"<{len(values)}d", *values), checksum)
+    return zlib.crc32(struct.pack("<II", simulation.score, simulation.stats['ticks']), checksum)
+
+class ReplayLevel:
+    def __init__(self, level, score, seed, start_ticks, player_character, enemy_characters, grid, powerups):
+        self.level = level
+        self.score = score
+        self.seed = seed
+        self.start_ticks = start_ticks
+        self.player_character = player_character
+        self.enemy_characters = enemy_characters
+        self.grid = grid
+        self.powerups = powerups
+        self.ticks = []
+        self.keyframe_ticks = []
+        self.keyframe_offsets = []
+        self.end = None
+
+    @property
+    def tick_count(self):
+        return sum(count for _, _, count in self.ticks)
+
+    def inputs(self, start=0, stop=None):
+        tick = 0
+        for flags, dt, count in self.ticks:
+            if stop is not None and tick >= stop:
+                break
+            first = max(start - tick, 0)
+            last = count if stop is None else min(count, stop - tick)
+            if last > first:
+                inputs = decode_inputs(flags)
+                for _ in range(first, last):
+                    yield inputs, dt
+            tick += count
+
+class ReplayRecorder:
+    def __init__(self, path=DEFAULT_REPLAY_PATH, keyframe_interval=KEYFRAME_INTERVAL):
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.data = bytearray(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, COLS, ROWS))
+        self.run = None
+        self.simulation = None
+        self.ticks = 0
+        self.levels = 0
+        self.level_ticks = 0
+        self.index = []
+        self.previous_keyframe = None
+        self.keyframes_in_level = 0
+
+    def start_level(self, simulation):
+        self.simulation = simulation
+        self.levels += 1
+        self.level_ticks = 0
+        self.previous_keyframe = None
+        self.keyframes_in_level = 0
+
+        game_map = simulation.game_map
+        characters = [simulation.player.character] + [enemy.character for enemy in simulation.enemies]
+        self.data += LEVEL_RECORD.pack(b'L', simulation.level, simulation.score, simulation.seed,
+                                       simulation.clock.get_ticks())
+        self.data.append(len(characters))
+        self.data += bytes(Characters.ALL.index(character) for character in characters)
+        self.data += game_map.grid.tobytes()
+        self.data.append(len(game_map.powerups))
+        for powerup in game_map.powerups:
+            self.data += POWERUP_RECORD.pack(powerup.grid_x, powerup.grid_y, powerup.type)
+
+    def record_tick(self, inputs, dt):
+        if self.simulation is None:
+            return
+
+        # Chamado antes do passo: o keyframe guarda o estado depois de level_ticks passos
+        if self.level_ticks and self.level_ticks % self.keyframe_interval == 0:
+            self.write_keyframe()
+
+        # Ticks seguidos com a mesma entrada e o mesmo dt viram um único registro
+        key = (encode_inputs(inputs), int(dt))
+        if self.run and self.run[0] == key and self.run[1] < 0xFFFF:
+            self.run[1] += 1
+        else:
+            self.flush_run()
+            self.run = [key, 1]
+        self.ticks += 1
+        self.level_ticks += 1
+
+    def flush_run(self):
+        if self.run:
+            (flags, dt), count = self.run
+            self.data += TICK_RECORD.pack(b'T', flags, dt, count)
+            self.run = None
+
+    def write_keyframe(self):
+        self.flush_run()
+        state = take_snapshot(self.simulation)
+
+        # Delta: o keyframe anterior serve de dicionário do zlib, então só o que mudou ocupa espaço.
+        # A cada FULL_KEYFRAME_EVERY um keyframe completo limita a cadeia que a busca precisa abrir.
+        full = self.previous_keyframe is None or self.keyframes_in_level % FULL_KEYFRAME_EVERY == 0
+        if full:
+            payload = zlib.compress(state)
+        else:
+            compressor = zlib.compressobj(zdict=self.previous_keyframe)
+            payload = compressor.compress(state) + compressor.flush()
+
+        self.index.append((self.levels - 1, self.level_ticks, len(self.data)))
+        self.data += KEYFRAME_RECORD.pack(b'K', self.level_ticks, full, len(payload))
+        self.data += payload
+        self.previous_keyframe = state
+        self.keyframes_in_level += 1
+
+    def end_level(self):
+        # Precisa ser chamado antes de a simulação ser reaproveitada (novo nível ou prévia do menu)
+        self.flush_run()
+        simulation = self.simulation
+        if simulation is None:
+            return
+        self.data += END_RECORD.pack(b'E', OUTCOMES.index(simulation.outcome), simulation.score,
+                                     simulation.stats['ticks'], state_checksum(simulation))
+        self.simulation = None
+
+    def save(self, path=None):
+        path = path or self.path
+        self.end_level()
+        if not self.levels:
+            return None
+
+        index = b"".join(INDEX_ENTRY.pack(*entry) for entry in self.index)
+        footer = INDEX_FOOTER.pack(INDEX_MAGIC, len(self.data), len(self.index))
+
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as replay_file:
+            replay_file.write(self.data)
+            replay_file.write(index)
+            replay_file.write(footer)
+        os.replace(temp_path, path)
+
+        size = len(self.data) + len(index) + len(footer)
+        print(f"🎬 Replay salvo: {path} ({self.levels} nível(is), {self.ticks} ticks, "
+              f"{len(self.index)} keyframes, {size} bytes)")
+        return path
+
+class Replay:
+    def __init__(self, data, levels):
+        self.data = data
+        self.levels = levels
+
+    def keyframe_state(self, record, position):
+        offset = record.keyframe_offsets[position]
+        _, _, full, size = KEYFRAME_RECORD.unpack_from(self.data, offset)
+        start = offset + KEYFRAME_RECORD.size
+        payload = self.data[start:start + size]
+        if full:
+            return zlib.decompress(payload)
+
+        decompressor = zlib.decompressobj(zdict=self.keyframe_state(record, position - 1))
+        return decompressor.decompress(payload) + decompressor.flush()
+
+    def seek(self, level_index, tick):
+        # Parte do keyframe mais próximo antes do tick e simula só o que falta
+        record = self.levels[level_index]
+        position = bisect.bisect_right(record.keyframe_ticks, tick) - 1
+        if position < 0:
+            simulation = start_replay_level(record)
+            start = 0
+        else:
+            simulation = restore_snapshot(self.keyframe_state(record, position))
+            start = record.keyframe_ticks[position]
+
+        for inputs, dt in record.inputs(start, tick):
+            simulation.step(inputs, dt)
+        return simulation
+
+def load_replay(path):
+    with open(path, "rb") as replay_file:
+        data = replay_file.read()
+
+    magic, version, cols, rows = REPLAY_HEADER.unpack_from(data, 0)
+    if magic != REPLAY_MAGIC or version != REPLAY_VERSION or (cols, rows) != (COLS, ROWS):
+        raise ValueError(f"Replay inválido ou de outra versão: {path}")
+
+    index_magic, index_offset, index_count = INDEX_FOOTER.unpack_from(data, len(data) - INDEX_FOOTER.size)
+    if index_magic != INDEX_MAGIC:
+        raise ValueError(f"Replay sem índice (gravação interrompida?): {path}")
+
+    levels = []
+    offset = REPLAY_HEADER.size
+    while offset < index_offset:
+        tag = data[offset:offset + 1]
+        if tag == b'L':
+            _, level, score, seed, start_ticks = LEVEL_RECORD.unpack_from(data, offset)
+            offset += LEVEL_RECORD.size
+            count = data[offset]
+            characters = [Characters.ALL[index] for index in data[offset + 1:offset + 1 + count]]
+            offset += 1 + count
+            grid = np.frombuffer(data, dtype=np.uint8, count=ROWS * COLS, offset=offset).reshape(ROWS, COLS)
+            offset += ROWS * COLS
+            powerups = [POWERUP_RECORD.unpack_from(data, offset + 1 + index * POWERUP_RECORD.size)
+                        for index in range(data[offset])]
+            offset += 1 + len(powerups) * POWERUP_RECORD.size
+            levels.append(ReplayLevel(level, score, seed, start_ticks, characters[0], characters[1:],
+                                      grid.copy(), powerups))
+        elif tag == b'T':
+            _, flags, dt, count = TICK_RECORD.unpack_from(data, offset)
+            offset += TICK_RECORD.size
+            levels[-1].ticks.append((flags, dt, count))
+        elif tag == b'K':
+            _, _, _, size = KEYFRAME_RECORD.unpack_from(data, offset)
+            offset += KEYFRAME_RECORD.size + size
+        elif tag == b'E':
+            _, outcome, score, ticks, checksum = END_RECORD.unpack_from(data, offset)
+            offset += END_RECORD.size
+            levels[-1].end = (OUTCOMES[outcome], score, ticks, checksum)
+        else:
+            raise ValueError(f"Registro desconhecido no replay {path} (posição {offset})")
+
+    # Os keyframes vêm do índice no fim do arquivo, não da varredura
+    for entry in range(index_count):
+        level_index, tick, keyframe_offset = INDEX_ENTRY.unpack_from(data, index_offset + entry * INDEX_ENTRY.size)
+        levels[level_index].keyframe_ticks.append(tick)
+        levels[level_index].keyframe_offsets.append(keyframe_offset)
+    return Replay(data, levels)
+
+def start_replay_level(record, simulation=None):
+    simulation = simulation or GameSimulation()
+    simulation.clock.reset(record.start_ticks)
+    simulation.score = record.score
+    simulation.start_level(record.level, record.player_character, record.enemy_characters,
+                           seed=record.seed, layout=(record.grid, record.powerups))
+    return simulation
+
+def play_level(record, simulation=None):
+    simulation = start_replay_level(record, simulation)
+    for inputs, dt in record.inputs():
+        simulation.step(inputs, dt)
+    return simulation
+
+def verify_level(record, simulation):
+    if record.end is None:
+        return None
+    outcome, score, ticks, checksum = record.end
+    return (simulation.outcome, simulation.score, simulation.stats['ticks'],
+            state_checksum(simulation)) == (outcome, score, ticks, checksum)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m game.replay",
+                                     description="Reproduz um replay sem janela, na velocidade máxima")
+    parser.add_argument("replay", nargs="?", default=DEFAULT_REPLAY_PATH)
+    parser.add_argument("--level", type=int, default=None, help="reproduz só o N-ésimo nível gravado (1 = primeiro)")
+    parser.add_argument("--seek", type=int, default=None, metavar="TICK",
+                        help="vai direto ao tick do nível escolhido em --level partindo do keyframe mais próximo")
+    parser.add_argument("--verbose", action="store_true", help="mostra o log da simulação")
+    args = parser.parse_args(argv)
+    setup_logging(logging.DEBUG if args.verbose else logging.WARNING)
+
+    replay = load_replay(args.replay)
+    if args.seek is not None:
+        level_index = (args.level or 1) - 1
+        record = replay.levels[level_index]
+        started = time.perf_counter()
+        simulation = replay.seek(level_index, args.seek)
+        elapsed = (time.perf_counter() - started) * 1000
+        position = bisect.bisect_right(record.keyframe_ticks, args.seek) - 1
+        keyframe = record.keyframe_ticks[position] if position >= 0 else 0
+        print(f"⏩ Nível {record.level}, tick {simulation.stats['ticks']} em {elapsed:.1f}ms "
+              f"(keyframe do tick {keyframe}) - pontuação {simulation.score}, vidas {simulation.player.lives}, "
+              f"inimigos vivos {sum(1 for enemy in simulation.enemies if enemy.alive)}")
+        return 0
+
+    levels = replay.levels
+    if args.level is not None:
+        levels = levels[args.level - 1:args.level]
+
+    diverged = False
+    for record in levels:
+        started = time.perf_counter()
+        simulation = play_level(record)
+        elapsed = (time.perf_counter() - started) * 1000
+        matches = verify_level(record, simulation)
+        status = "✅ confere" if matches else "⚠️ sem fim gravado" if matches is None else "❌ divergiu"
+        diverged = diverged or matches is False
+        print(f"🎬 Nível {record.level}: {record.tick_count} ticks em {elapsed:.0f}ms "
+              f"({record.tick_count / max(elapsed, 0.001):.1f} ticks/ms, {len(record.keyframe_ticks)} keyframes) - "
+              f"{simulation.outcome or 'em andamento'}, pontuação {simulation.score} {status}")
+    return 1 if diverged else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,236 @@
+import argparse
+import contextlib
+import json
+import logging
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from .constants import *
+from .entities import Enemy
+from .simulation import GameSimulation, EnemyBombCoordinator
+from .log import setup_logging, set_log_level
+from .replay import ReplayRecorder
+
+PLAYER_CONTROLLERS = ["ai", "random", "idle"]
+
+class ControllerRandom:
+    # Os controladores (e a IA emprestada dos inimigos) sorteiam num estado próprio: o random
+    # global pertence à simulação e precisa seguir igual na gravação e no replay
+    def __init__(self, seed):
+        self.state = random.Random(seed).getstate()
+        self.outer = None
+
+    def __enter__(self):
+        self.outer = random.getstate()
+        random.setstate(self.state)
+        return self
+
+    def __exit__(self, *exc):
+        self.state = random.getstate()
+        random.setstate(self.outer)
+        return False
+
+class IdlePlayerController:
+    def __init__(self, simulation):
+        self.simulation = simulation
+
+    def get_inputs(self, dt):
+        return {'dx': 0, 'dy': 0, 'bomb': False}
+
+class RandomPlayerController:
+    def __init__(self, simulation):
+        self.simulation = simulation
+        self.direction = random.randint(0, 3)
+        self.ticks_until_turn = 0
+
+    def get_inputs(self, dt):
+        self.ticks_until_turn -= 1
+        if self.ticks_until_turn <= 0:
+            self.direction = random.randint(0, 3)
+            self.ticks_until_turn = random.randint(20, 90)
+
+        dx, dy = Direction.DELTAS[self.direction]
+        return {'dx': dx, 'dy': dy, 'bomb': random.random() < 0.01}
+
+class PlayerAgent(Enemy):
+    def check_powerup_collection(self, game_map):
+        pass
+
+class EnemyAIPlayerController:
+    def __init__(self, simulation):
+        self.simulation = simulation
+        player = simulation.player
+        grid_x, grid_y = player.get_grid_pos()
+        self.agent = PlayerAgent(grid_x, grid_y, player.character, simulation.clock)
+        self.coordinator = EnemyBombCoordinator(simulation.clock)
+
+    def get_inputs(self, dt):
+        simulation = self.simulation
+        player = simulation.player
+        targets = [enemy for enemy in simulation.enemies if enemy.alive]
+        if not targets:
+            return {'dx': 0, 'dy': 0, 'bomb': False}
+
+        target = min(targets, key=lambda enemy: abs(enemy.x - player.x) + abs(enemy.y - player.y))
+
+        agent = self.agent
+        agent.x, agent.y = player.x, player.y
+        agent.speed = player.speed
+        agent.bomb_range = player.bomb_range
+        agent.max_bombs = player.max_bombs
+
+        bombs = list(simulation.bombs)
+        self.coordinator.clear_current_bomber()
+        danger_map = simulation.threat_map('agent')
+        target_field, safe_field, brick_field = simulation.navigation_fields(target, danger_map, 'agent')
+        agent.update(dt, simulation.game_map, target, bombs, self.coordinator, danger_map,
+                     target_field, safe_field, brick_field)
+
+        dx = (agent.x > player.x) - (agent.x < player.x)
+        dy = (agent.y > player.y) - (agent.y < player.y)
+        return {'dx': dx, 'dy': dy, 'bomb': len(bombs) > len(simulation.bombs)}
+
+def create_controller(name, simulation):
+    if name == "idle":
+        return IdlePlayerController(simulation)
+    elif name == "random":
+        return RandomPlayerController(simulation)
+    return EnemyAIPlayerController(simulation)
+
+def run_match(seed, controller="ai", max_ticks=18000, player_character=Characters.FINN, verbose=False,
+              record_dir=None, on_tick=None):
+    random.seed(seed)
+
+    # O handler de log escreve no stdout original, então o redirect não o silencia
+    set_log_level(logging.DEBUG if verbose else logging.ERROR)
+    started = time.perf_counter()
+
+    with contextlib.ExitStack() as stack:
+        output = sys.stdout if verbose else stack.enter_context(open(os.devnull, "w"))
+        stack.enter_context(contextlib.redirect_stdout(output))
+        simulation = GameSimulation()
+        enemy_characters = [char for char in Characters.ALL if char != player_character]
+        simulation.start_level(1, player_character, enemy_characters)
+        controller_random = ControllerRandom(seed)
+        with controller_random:
+            player_controller = create_controller(controller, simulation)
+        recorder = None
+        if record_dir:
+            recorder = ReplayRecorder(os.path.join(record_dir, f"match_{seed}.rpl"))
+            recorder.start_level(simulation)
+
+        while simulation.outcome is None and simulation.stats['ticks'] < max_ticks:
+            with controller_random:
+                inputs = player_controller.get_inputs(SIM_STEP_MS)
+            if recorder:
+                recorder.record_tick(inputs, SIM_STEP_MS)
+            simulation.step(inputs, SIM_STEP_MS)
+            if on_tick:
+                on_tick(simulation)
+
+        if recorder:
+            recorder.save()
+
+    if simulation.outcome == GameState.VICTORY:
+        winner = "player"
+    elif simulation.outcome == GameState.GAME_OVER:
+        winner = "enemies"
+    else:
+        winner = "draw"
+
+    result = {
+        'seed': seed,
+        'controller': controller,
+        'winner': winner,
+        'score': simulation.score,
+        'enemies_alive': sum(1 for enemy in simulation.enemies if enemy.alive),
+        'player_lives': simulation.player.lives,
+        'wall_time_ms': round((time.perf_counter() - started) * 1000, 1)
+    }
+    result.update(simulation.stats)
+    result['deaths'] = simulation.stats['player_deaths'] + simulation.stats['enemy_deaths']
+    return result
+
+def check_match(seed, max_ticks=3000, still_limit=600, **match_options):
+    # Regressão da IA: nenhum inimigo vivo pode ficar parado por mais de still_limit ticks
+    # seguidos, e a partida precisa ter alguma bomba colocada
+    problems = []
+    positions = {}
+    moved_at = {}
+
+    def observe(simulation):
+        ticks = simulation.stats['ticks']
+        for index, enemy in enumerate(simulation.enemies):
+            if not enemy.alive:
+                continue
+            position = (enemy.x, enemy.y)
+            if positions.get(index) != position:
+                positions[index] = position
+                moved_at[index] = ticks
+            elif ticks - moved_at[index] == still_limit:
+                problems.append(f"{enemy.character} parado em {position} desde o tick {moved_at[index]}")
+
+    result = run_match(seed, max_ticks=max_ticks, on_tick=observe, **match_options)
+    if result['bombs_placed'] == 0:
+        problems.append(f"nenhuma bomba em {result['ticks']} ticks")
+    return problems
+
+def run_batch(matches, output_path, first_seed=0, workers=None, **match_options):
+    seeds = range(first_seed, first_seed + matches)
+    summary = {"player": 0, "enemies": 0, "draw": 0}
+    total_ticks = 0
+
+    # Cada processo do pool sobe o próprio QueueListener
+    with ProcessPoolExecutor(max_workers=workers, initializer=setup_logging) as executor, open(output_path, "w") as output:
+        futures = [executor.submit(run_match, seed, **match_options) for seed in seeds]
+        for future in futures:
+            result = future.result()
+            output.write(json.dumps(result) + "\n")
+            summary[result['winner']] += 1
+            total_ticks += result['ticks']
+
+    return summary, total_ticks
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m game.sim",
+                                     description="Executa partidas somente com IA em paralelo")
+    parser.add_argument("-n", "--matches", type=int, default=100)
+    parser.add_argument("-o", "--output", default="sim_results.jsonl")
+    parser.add_argument("--seed", type=int, default=0, help="semente da primeira partida")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: todos os núcleos)")
+    parser.add_argument("--controller", choices=PLAYER_CONTROLLERS, default="ai",
+                        help="quem controla o jogador: ai (IA de inimigo), random ou idle")
+    parser.add_argument("--max-ticks", type=int, default=18000)
+    parser.add_argument("--character", choices=Characters.ALL, default=Characters.FINN)
+    parser.add_argument("--verbose", action="store_true", help="mostra o log das partidas")
+    parser.add_argument("--record-dir", default=None,
+                        help="grava um replay por partida nesta pasta (match_<semente>.rpl)")
+    parser.add_argument("--check", action="store_true",
+                        help="verifica se os inimigos se movem e colocam bombas (3000 ticks por partida)")
+    args = parser.parse_args(argv)
+    setup_logging()
+    if args.check:
+        failures = 0
+        for seed in range(args.seed, args.seed + args.matches):
+            problems = check_match(seed, controller=args.controller, player_character=args.character)
+            failures += bool(problems)
+            print(f"{'❌' if problems else '✅'} semente {seed}" + "".join(f"\n   {problem}" for problem in problems))
+        sys.exit(1 if failures else 0)
+    if args.record_dir:
+        os.makedirs(args.record_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    summary, total_ticks = run_batch(
+        args.matches, args.output, first_seed=args.seed, workers=args.workers,
+        controller=args.controller, max_ticks=args.max_ticks,
+        player_character=args.character, verbose=args.verbose, record_dir=args.record_dir
+    )
+    elapsed = time.perf_counter() - started
+
+    print(f"🏁 {args.matches} partidas em {elapsed:.1f}s ({total_ticks} ticks) -> {args.output}")
+    print(f"   Jogador: {summary['player']} | Inimigos: {summary['enemies']} | Empates: {summary['draw']}")
+
+if __name__ == "__main__":
+    main()
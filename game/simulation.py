@@ -0,0 +1,357 @@
+import logging
+import random
+from .constants import *
+from .clock import SimulationClock, WALL_CLOCK
+from .danger_map import DangerMap
+from .flow_field import build_player_field, build_safe_field, build_brick_field, FlowFieldCache
+from .game_map import GameMap
+from .entities import Player, Enemy, Bomb, Explosion
+from .profiler import get_profiler
+
+logger = logging.getLogger(__name__)
+
+class EnemyBombCoordinator:
+    def __init__(self, clock=None):
+        self.clock = clock or WALL_CLOCK
+        self.current_bomber = None
+        self.bomb_cooldown_time = 0
+
+    def can_enemy_place_bomb(self, enemy, enemies, bombs, game_map, danger_map=None):
+        if self.current_bomber is not None and self.current_bomber != enemy:
+            return False
+
+        if self.clock.get_ticks() < self.bomb_cooldown_time:
+            return False
+
+        return self.is_safe_to_bomb(enemy, enemies, bombs, game_map, danger_map)
+
+    def register_bomb_placement(self, enemy):
+        self.current_bomber = enemy
+        self.bomb_cooldown_time = self.clock.get_ticks() + 3000
+
+    def clear_current_bomber(self):
+        if self.current_bomber and self.clock.get_ticks() > self.bomb_cooldown_time:
+            self.current_bomber = None
+
+    def is_safe_to_bomb(self, enemy, enemies, bombs, game_map, danger_map=None):
+        # A mesma rota de fuga que o inimigo usa ao colocar a bomba (BFS no tempo, com curvas)
+        if danger_map is not None:
+            enemy.danger_map = danger_map
+        elif enemy.danger_map is None:
+            enemy.danger_map = DangerMap(game_map, bombs, self.clock.get_ticks())
+
+        grid_x, grid_y = enemy.get_grid_pos()
+        return enemy.plan_bomb_escape(game_map, grid_x, grid_y) is not None
+
+class GameSimulation:
+    PLAYER_SPAWN = (1, 2)
+
+    def __init__(self, sprite_manager=None, clock=None, profiler=None):
+        self.clock = clock or SimulationClock()
+        self.profiler = profiler or get_profiler()
+        self.game_map = GameMap(sprite_manager)
+        self.score = 0
+        self.level = 1
+        self.seed = None
+
+        self.player = None
+        self.enemies = []
+        self.bombs = []
+        self.explosions = []
+
+        self.enemy_bomb_coordinator = EnemyBombCoordinator(self.clock)
+        self.flow_fields = FlowFieldCache()
+        self.danger_maps = {}
+
+        self.outcome = None
+        self.events = []
+        self.stats = self.new_stats()
+
+    def new_stats(self):
+        return {
+            'ticks': 0,
+            'bombs_placed': 0,
+            'bricks_destroyed': 0,
+            'player_deaths': 0,
+            'enemy_deaths': 0
+        }
+
+    def start_level(self, level, player_character, enemy_characters, seed=None, layout=None):
+        self.level = level
+        self.outcome = None
+        self.events = []
+        self.stats = self.new_stats()
+
+        if layout is None:
+            self.game_map.generate_level(level)
+        else:
+            self.game_map.load_layout(*layout)
+
+        # Depois do mapa, todo sorteio do nível sai desta semente: um replay guarda o mapa
+        # pronto e a semente, sem depender de como o mapa foi gerado
+        self.seed = random.getrandbits(32) if seed is None else seed
+        random.seed(self.seed)
+        self.enemy_bomb_coordinator = EnemyBombCoordinator(self.clock)
+
+        self.player = Player(*self.PLAYER_SPAWN, player_character)
+        self.create_enemies(enemy_characters)
+
+        self.bombs = []
+        self.explosions = []
+
+    def create_enemies(self, enemy_characters):
+        self.enemies = []
+
+        corner_positions = [
+            (COLS - 2, 1),
+            (1, ROWS - 2),
+            (COLS - 2, ROWS - 2),
+        ]
+
+        corner_names = ["superior direito", "inferior esquerdo", "inferior direito"]
+
+        logger.info("🎯 Criando inimigos nas posições garantidas dos cantos:")
+
+        for i, character in enumerate(enemy_characters[:3]):
+            if i < len(corner_positions):
+                x, y = corner_positions[i]
+
+                if (0 <= x < COLS and 0 <= y < ROWS and
+                    self.game_map.is_walkable(x, y)):
+
+                    enemy = Enemy(x, y, character, self.clock)
+                    self.enemies.append(enemy)
+                    logger.info("🤖 Inimigo %s criado no canto %s: (%s, %s) ✅", character, corner_names[i], x, y)
+                else:
+                    logger.error("❌ ERRO: Posição (%s, %s) ainda não é walkable - verificar geração do mapa", x, y)
+            else:
+                logger.warning("⚠️ Limite de posições atingido - %s não foi criado", character)
+
+        logger.info("🎯 Total de inimigos criados: %s", len(self.enemies))
+
+    def spawn_preview(self, player_character, enemy_characters):
+        self.game_map.generate_level(1)
+
+        self.player = Player(*self.PLAYER_SPAWN, player_character)
+
+        self.enemies = []
+        positions = self.game_map.get_valid_spawn_positions()
+
+        for character in enemy_characters[:3]:
+            if positions:
+                pos = random.choice(positions)
+                positions.remove(pos)
+                self.enemies.append(Enemy(pos[0], pos[1], character, self.clock))
+
+    def step_preview(self, dt):
+        self.clock.advance(dt)
+        self.update_enemies(dt)
+
+    def step(self, inputs, dt):
+        self.events = []
+
+        if self.outcome is not None or not self.player:
+            return self.events
+
+        self.clock.advance(dt)
+        self.stats['ticks'] += 1
+
+        if inputs.get('bomb'):
+            self.place_bomb()
+
+        profiler = self.profiler
+        with profiler.section('update_player'):
+            self.update_player(inputs, dt)
+
+        self.update_enemies(dt)
+
+        with profiler.section('update_bombs'):
+            self.update_bombs(dt)
+
+        with profiler.section('update_explosions'):
+            self.update_explosions(dt)
+
+        if self.game_map.update_powerups(dt, self.player):
+            self.score += 50
+            self.events.append('powerup')
+
+        with profiler.section('check_collisions'):
+            self.check_collisions()
+
+        self.check_win_lose_conditions()
+
+        return self.events
+
+    def update_player(self, inputs, dt):
+        if not self.player:
+            return
+
+        self.player.update(dt)
+
+        dx = inputs.get('dx', 0)
+        dy = inputs.get('dy', 0)
+
+        if dx != 0 or dy != 0:
+            self.player.move(dx, dy, self.game_map, self.bombs)
+
+    def navigation_fields(self, target, danger_map, name='player'):
+        game_map = self.game_map
+        version = game_map.version
+        threats = (tuple(self.bombs), tuple(self.explosions))
+
+        target_field = self.flow_fields.get(name, (version, target.get_grid_pos()),
+                                            lambda field: build_player_field(game_map, target, field=field))
+        safe_field = self.flow_fields.get('safe', (version, threats),
+                                          lambda field: build_safe_field(game_map, danger_map, field=field))
+        brick_field = self.flow_fields.get('brick', version,
+                                           lambda field: build_brick_field(game_map, field=field))
+        return target_field, safe_field, brick_field
+
+    def threat_map(self, name='enemies'):
+        # Um DangerMap por consumidor, reconstruído nos mesmos arrays. Sem bombas nem explosões
+        # e sem mudança na grade desde o último tick, o mapa vazio serve como está
+        current_time = self.clock.get_ticks()
+        key = (self.game_map.version, tuple(self.bombs), tuple(self.explosions))
+        cached = self.danger_maps.get(name)
+
+        if cached is None:
+            danger_map = DangerMap(self.game_map, self.bombs, current_time, self.explosions)
+        else:
+            previous_key, danger_map = cached
+            if previous_key == key and not key[1] and not key[2] and not danger_map.bomb_cells:
+                danger_map.current_time = current_time
+            else:
+                danger_map.reset(self.bombs, current_time, self.explosions)
+
+        self.danger_maps[name] = (key, danger_map)
+        return danger_map
+
+    def update_enemies(self, dt):
+        self.enemy_bomb_coordinator.clear_current_bomber()
+        bombs_before = len(self.bombs)
+        danger_map = self.threat_map()
+
+        player_field, safe_field, brick_field = self.navigation_fields(self.player, danger_map)
+
+        for enemy in self.enemies[:]:
+            if enemy.alive:
+                with self.profiler.section('Enemy.update', {'character': enemy.character}):
+                    enemy.update(dt, self.game_map, self.player, self.bombs,
+                                 self.enemy_bomb_coordinator, danger_map,
+                                 player_field, safe_field, brick_field)
+
+        self.stats['bombs_placed'] += len(self.bombs) - bombs_before
+
+    def update_bombs(self, dt):
+        for bomb in self.bombs[:]:
+            should_explode = bomb.update(dt, self.game_map, self.player)
+
+            if should_explode:
+                explosion = bomb.explode(self.game_map)
+                self.explosions.append(explosion)
+                self.stats['bricks_destroyed'] += explosion.bricks_destroyed
+                self.bombs.remove(bomb)
+                if logger.isEnabledFor(logging.DEBUG):
+                    own_bombs = sum(1 for b in self.bombs if b.owner == self.player.character)
+                    logger.debug("💥 Bomba explodiu! Bombas restantes: %s/%s", own_bombs, self.player.max_bombs)
+                self.events.append('explosion')
+
+    def update_explosions(self, dt):
+        for explosion in self.explosions[:]:
+            explosion_ended = explosion.update(dt, self.game_map)
+            if explosion_ended:
+                self.explosions.remove(explosion)
+
+    def check_collisions(self):
+        if not self.player:
+            return
+
+        player_rect = self.player.get_rect()
+
+        for explosion in self.explosions:
+            bomb_pixel_x = explosion.bomb_x * TILE_SIZE
+            bomb_pixel_y = explosion.bomb_y * TILE_SIZE
+
+            if self.game_map.can_explosion_reach_player(bomb_pixel_x, bomb_pixel_y, self.player.x, self.player.y):
+                player_grid_x = int(self.player.x // TILE_SIZE)
+                player_grid_y = int(self.player.y // TILE_SIZE)
+
+                for tile_x, tile_y in explosion.tiles:
+                    if tile_x == player_grid_x and tile_y == player_grid_y:
+                        self.player_hit()
+                        return
+
+        for enemy in self.enemies:
+            if enemy.alive and player_rect.colliderect(enemy.get_rect()):
+                if self.game_map.has_clear_line_of_sight(self.player.x, self.player.y, enemy.x, enemy.y):
+                    self.player_hit()
+                    return
+
+        for enemy in self.enemies[:]:
+            if not enemy.alive:
+                continue
+
+            for explosion in self.explosions:
+                bomb_pixel_x = explosion.bomb_x * TILE_SIZE
+                bomb_pixel_y = explosion.bomb_y * TILE_SIZE
+
+                if self.game_map.can_explosion_reach_player(bomb_pixel_x, bomb_pixel_y, enemy.x, enemy.y):
+                    enemy_grid_x = int(enemy.x // TILE_SIZE)
+                    enemy_grid_y = int(enemy.y // TILE_SIZE)
+
+                    for tile_x, tile_y in explosion.tiles:
+                        if tile_x == enemy_grid_x and tile_y == enemy_grid_y:
+                            enemy.alive = False
+                            self.score += 100
+                            self.stats['enemy_deaths'] += 1
+                            break
+
+    def check_win_lose_conditions(self):
+        if not self.player or self.outcome is not None:
+            return
+
+        if self.player.lives <= 0:
+            self.outcome = GameState.GAME_OVER
+            return
+
+        alive_enemies = [enemy for enemy in self.enemies if enemy.alive]
+        if len(alive_enemies) == 0:
+            self.outcome = GameState.VICTORY
+            self.score += 500 * self.level
+
+    def place_bomb(self):
+        if not self.player:
+            return False
+
+        player_bombs = [bomb for bomb in self.bombs if bomb.owner == self.player.character]
+        if len(player_bombs) >= self.player.max_bombs:
+            logger.debug("🚫 Limite de bombas atingido! (%s/%s)", len(player_bombs), self.player.max_bombs)
+            return False
+
+        grid_x, grid_y = self.player.get_grid_pos()
+
+        for bomb in self.bombs:
+            if bomb.grid_x == grid_x and bomb.grid_y == grid_y:
+                return False
+
+        new_bomb = Bomb(grid_x, grid_y, self.player.bomb_range, self.player.character, self.clock)
+        self.bombs.append(new_bomb)
+        logger.debug("💣 Bomba criada! Total: %s/%s", len(player_bombs) + 1, self.player.max_bombs)
+
+        self.stats['bombs_placed'] += 1
+        self.events.append('bomb_placed')
+        return True
+
+    def player_hit(self):
+        if not self.player:
+            return
+
+        self.player.lives -= 1
+        self.stats['player_deaths'] += 1
+        self.events.append('player_hit')
+
+        if self.player.lives > 0:
+            self.player.x = self.PLAYER_SPAWN[0] * TILE_SIZE
+            self.player.y = self.PLAYER_SPAWN[1] * TILE_SIZE
+        else:
+            self.outcome = GameState.GAME_OVER
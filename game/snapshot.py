@@ -0,0 +1,171 @@
+import random
+import struct
+import numpy as np
+from .constants import *
+from .entities import Player, Enemy, Bomb, Explosion, PowerUp
+from .simulation import GameSimulation
+
+SNAPSHOT_MAGIC = b"BSNP"
+SNAPSHOT_VERSION = 1
+
+# Layout fixo: cabeçalho, grade (ROWS*COLS bytes), estado do random, depois um registro por entidade
+SNAPSHOT_HEADER = struct.Struct("<4sHBBHIIIBIHHHHbIBBBB")
+RANDOM_STATE = struct.Struct("<625I?d")
+PLAYER_RECORD = struct.Struct("<ddBdBBbB?")
+ENEMY_RECORD = struct.Struct("<ddBdBI??BBIIIBbI")
+BOMB_RECORD = struct.Struct("<BBBBII?")
+EXPLOSION_RECORD = struct.Struct("<BBBIIBB")
+POWERUP_RECORD = struct.Struct("<BBBIB")
+
+OUTCOMES = [None, GameState.VICTORY, GameState.GAME_OVER]
+ENEMY_MODES = ["explore", "attack", "flee"]
+MISSING = -1
+
+def take_snapshot(simulation):
+    game_map = simulation.game_map
+    coordinator = simulation.enemy_bomb_coordinator
+    bomber = coordinator.current_bomber
+    stats = simulation.stats
+    enemies = simulation.enemies
+
+    data = bytearray(SNAPSHOT_HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, COLS, ROWS,
+        simulation.level, simulation.score, simulation.seed or 0, simulation.clock.get_ticks(),
+        OUTCOMES.index(simulation.outcome),
+        stats['ticks'], stats['bombs_placed'], stats['bricks_destroyed'],
+        stats['player_deaths'], stats['enemy_deaths'],
+        enemies.index(bomber) if bomber in enemies else MISSING, coordinator.bomb_cooldown_time,
+        len(enemies), len(simulation.bombs), len(simulation.explosions), len(game_map.powerups)
+    ))
+    data += game_map.grid.tobytes()
+
+    _, internal, gauss_next = random.getstate()
+    data += RANDOM_STATE.pack(*internal, gauss_next is not None, gauss_next or 0.0)
+
+    player = simulation.player
+    data += PLAYER_RECORD.pack(player.x, player.y, Characters.ALL.index(player.character), player.speed,
+                               player.max_bombs, player.bomb_range, player.lives, player.direction,
+                               player.is_moving)
+
+    for enemy in enemies:
+        data += ENEMY_RECORD.pack(
+            enemy.x, enemy.y, Characters.ALL.index(enemy.character), enemy.speed, enemy.direction,
+            enemy.last_direction_change, enemy.alive, enemy.is_moving, enemy.max_bombs, enemy.bomb_range,
+            enemy.last_bomb_time, enemy.bomb_cooldown, enemy.spawn_time, ENEMY_MODES.index(enemy.mode),
+            MISSING if enemy.escape_direction is None else enemy.escape_direction, enemy.escape_mode_until
+        )
+
+    for bomb in simulation.bombs:
+        data += BOMB_RECORD.pack(bomb.grid_x, bomb.grid_y, bomb.explosion_range,
+                                 Characters.ALL.index(bomb.owner), bomb.timer, bomb.animation_timer,
+                                 bomb.blinking)
+
+    for explosion in simulation.explosions:
+        data += EXPLOSION_RECORD.pack(explosion.bomb_x, explosion.bomb_y, explosion.bricks_destroyed,
+                                      explosion.timer, explosion.animation_timer, explosion.animation_frame,
+                                      len(explosion.tiles))
+        data += bytes(coordinate for tile in explosion.tiles for coordinate in tile)
+
+    for powerup in game_map.powerups:
+        data += POWERUP_RECORD.pack(powerup.grid_x, powerup.grid_y, powerup.type,
+                                    powerup.animation_timer, powerup.animation_frame)
+    return bytes(data)
+
+def restore_snapshot(data, simulation=None):
+    simulation = simulation or GameSimulation()
+
+    (magic, version, cols, rows, level, score, seed, clock_ticks, outcome,
+     ticks, bombs_placed, bricks_destroyed, player_deaths, enemy_deaths, bomber, bomber_cooldown,
+     enemy_count, bomb_count, explosion_count, powerup_count) = SNAPSHOT_HEADER.unpack_from(data, 0)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or (cols, rows) != (COLS, ROWS):
+        raise ValueError(f"Snapshot inválido ou de outra versão ({version})")
+
+    clock = simulation.clock
+    clock.reset(clock_ticks)
+    simulation.level = level
+    simulation.score = score
+    simulation.seed = seed
+    simulation.outcome = OUTCOMES[outcome]
+    simulation.events = []
+    simulation.stats = {
+        'ticks': ticks,
+        'bombs_placed': bombs_placed,
+        'bricks_destroyed': bricks_destroyed,
+        'player_deaths': player_deaths,
+        'enemy_deaths': enemy_deaths
+    }
+
+    offset = SNAPSHOT_HEADER.size
+    game_map = simulation.game_map
+    game_map.load_layout(np.frombuffer(data, dtype=np.uint8, count=ROWS * COLS, offset=offset), [])
+    offset += ROWS * COLS
+
+    state = RANDOM_STATE.unpack_from(data, offset)
+    random.setstate((3, state[:625], state[626] if state[625] else None))
+    offset += RANDOM_STATE.size
+
+    x, y, character, speed, max_bombs, bomb_range, lives, direction, is_moving = PLAYER_RECORD.unpack_from(data, offset)
+    offset += PLAYER_RECORD.size
+    player = Player(0, 0, Characters.ALL[character])
+    player.x, player.y, player.speed = x, y, speed
+    player.max_bombs, player.bomb_range, player.lives = max_bombs, bomb_range, lives
+    player.direction, player.is_moving = direction, is_moving
+    simulation.player = player
+
+    # As entidades são montadas sem __init__: o construtor do inimigo sorteia e registraria log
+    enemies = []
+    for _ in range(enemy_count):
+        (x, y, character, speed, direction, last_direction_change, alive, is_moving, max_bombs, bomb_range,
+         last_bomb_time, bomb_cooldown, spawn_time, mode, escape_direction,
+         escape_mode_until) = ENEMY_RECORD.unpack_from(data, offset)
+        offset += ENEMY_RECORD.size
+        enemy = Enemy.__new__(Enemy)
+        enemy.__dict__.update({
+            'clock': clock, 'x': x, 'y': y, 'character': Characters.ALL[character], 'speed': speed,
+            'direction': direction, 'last_direction_change': last_direction_change, 'alive': alive,
+            'is_moving': is_moving, 'max_bombs': max_bombs, 'bomb_range': bomb_range,
+            'last_bomb_time': last_bomb_time, 'bomb_cooldown': bomb_cooldown, 'spawn_time': spawn_time,
+            'mode': ENEMY_MODES[mode],
+            'escape_direction': None if escape_direction == MISSING else escape_direction,
+            'escape_mode_until': escape_mode_until,
+            'danger_map': None, 'player_field': None, 'safe_field': None,
+            'brick_field': None
+        })
+        enemies.append(enemy)
+    simulation.enemies = enemies
+
+    bombs = []
+    for _ in range(bomb_count):
+        grid_x, grid_y, explosion_range, owner, timer, animation_timer, blinking = BOMB_RECORD.unpack_from(data, offset)
+        offset += BOMB_RECORD.size
+        bomb = Bomb(grid_x, grid_y, explosion_range, Characters.ALL[owner], clock)
+        bomb.timer, bomb.animation_timer, bomb.blinking = timer, animation_timer, blinking
+        bombs.append(bomb)
+    simulation.bombs = bombs
+
+    explosions = []
+    for _ in range(explosion_count):
+        (bomb_x, bomb_y, bricks, timer, animation_timer, animation_frame,
+         tile_count) = EXPLOSION_RECORD.unpack_from(data, offset)
+        offset += EXPLOSION_RECORD.size
+        coordinates = data[offset:offset + tile_count * 2]
+        offset += tile_count * 2
+        tiles = [(coordinates[index], coordinates[index + 1]) for index in range(0, len(coordinates), 2)]
+        explosion = Explosion(tiles, bomb_x, bomb_y, clock, bricks)
+        explosion.timer, explosion.animation_timer, explosion.animation_frame = timer, animation_timer, animation_frame
+        explosions.append(explosion)
+    simulation.explosions = explosions
+
+    powerups = []
+    for _ in range(powerup_count):
+        grid_x, grid_y, powerup_type, animation_timer, animation_frame = POWERUP_RECORD.unpack_from(data, offset)
+        offset += POWERUP_RECORD.size
+        powerup = PowerUp(grid_x, grid_y, powerup_type)
+        powerup.animation_timer, powerup.animation_frame = animation_timer, animation_frame
+        powerups.append(powerup)
+    game_map.powerups = powerups
+
+    coordinator = simulation.enemy_bomb_coordinator
+    coordinator.current_bomber = enemies[bomber] if bomber != MISSING else None
+    coordinator.bomb_cooldown_time = bomber_cooldown
+    return simulation
@@ -0,0 +1,56 @@
+import math
+import pygame
+from .constants import *
+
+class SpriteAtlas:
+    def __init__(self, cell_size=TILE_SIZE):
+        self.cell_size = cell_size
+        self.surface = None
+        self.pending = {}
+        self.regions = {}
+        self.views = {}
+
+    def add(self, key, sprite):
+        if sprite is None:
+            return False
+
+        width, height = sprite.get_size()
+        if width > self.cell_size or height > self.cell_size:
+            return False
+
+        self.pending[key] = sprite
+        return True
+
+    def build(self):
+        if not self.pending:
+            return None
+
+        count = len(self.pending)
+        columns = math.ceil(math.sqrt(count))
+        rows = math.ceil(count / columns)
+
+        surface = pygame.Surface((columns * self.cell_size, rows * self.cell_size), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        surface.fill((0, 0, 0, 0))
+
+        self.regions = {}
+        for index, (key, sprite) in enumerate(self.pending.items()):
+            cell_x = (index % columns) * self.cell_size
+            cell_y = (index // columns) * self.cell_size
+            surface.blit(sprite, (cell_x, cell_y), special_flags=pygame.BLEND_RGBA_MAX)
+            self.regions[key] = pygame.Rect((cell_x, cell_y), sprite.get_size())
+
+        self.surface = surface
+        self.pending = {}
+        self.views = {key: surface.subsurface(rect) for key, rect in self.regions.items()}
+        return surface
+
+    def get(self, key):
+        return self.views.get(key)
+
+    def __contains__(self, key):
+        return key in self.views
+
+    def __len__(self):
+        return len(self.views)
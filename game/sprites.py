@@ -1,25 +1,427 @@
 import pygame
 import os
 import random
+import time
+from collections import OrderedDict
 from .constants import *
+from .sprite_atlas import SpriteAtlas
+from .asset_cache import SpriteCache
+from .asset_pack import get_asset_source
+from .tracer import get_tracer
+from .asset_loader import (AssetLoader, LOAD_PRIORITY_URGENT, LOAD_PRIORITY_MENU,
+                           LOAD_PRIORITY_MATCH, LOAD_PRIORITY_THEMES)
+
+CHARACTER_SPRITE_FILES = {
+    Characters.FINN: {
+        'idle': {
+            'down': "images/finn_idle.png",
+            'up': "images/finn_idle_up.png", 
+            'left': "images/finn_idle_left.png",
+            'right': "images/finn_idle_right.png"
+        },
+        'walk': {
+            'down': ["images/finn_walk_down_01.png", "images/finn_walk_down_02.png"],
+            'up': ["images/finn_walk_up_01.png", "images/finn_walk_up_02.png"],
+            'left': ["images/finn_walk_left_01.png", "images/finn_walk_left_02.png"],
+            'right': ["images/finn_walk_right_01.png", "images/finn_walk_right_02.png"]
+        }
+    },
+    Characters.JAKE: {
+        'idle': {
+            'down': "images/jake_idle_down.png",
+            'up': "images/jake_idle_up.png", 
+            'left': "images/jake_idle_left.png",
+            'right': "images/jake_idle_right.png"
+        },
+        'walk': {
+            'down': ["images/jake_walk_down_01.png", "images/jake_walk_down_02.png"],
+            'up': ["images/jake_walk_up_01.png", "images/jake_walk_up_02.png"],
+            'left': ["images/jake_walk_left_01.png", "images/jake_walk_left_02.png"],
+            'right': ["images/jake_walk_right_01.png", "images/jake_walk_right_02.png"]
+        }
+    },
+    Characters.MARCELINE: {
+        'idle': {
+            'down': "images/marceline_idle_down.png",
+            'up': "images/marceline_idle_up.png", 
+            'left': "images/marceline_idle_left.png",
+            'right': "images/marceline_idle_right.png"
+        },
+        'walk': {
+            'down': ["images/marceline_walk_down_01.png", "images/marceline_walk_down_02.png"],
+            'up': ["images/marceline_walk_up_01.png", "images/marceline_walk_up_02.png"],
+            'left': ["images/marceline_walk_left_01.png", "images/marceline_walk_left_02.png"],
+            'right': ["images/marceline_walk_right_01.png", "images/marceline_walk_right_02.png"]
+        }
+    },
+    Characters.PRINCESS_LUMP: {
+        'idle': {
+            'down': "images/princess_lump_idle_down.png",
+            'up': "images/princess_lump_idle_up.png", 
+            'left': "images/princess_lump_idle_left.png",
+            'right': "images/princess_lump_idle_right.png"
+        },
+        'walk': {
+            'down': ["images/princess_lump_walk_down_01.png", "images/princess_lump_walk_down_02.png"],
+            'up': ["images/princess_lump_walk_up_01.png", "images/princess_lump_walk_up_02.png"],
+            'left': ["images/princess_lump_walk_left_01.png", "images/princess_lump_walk_left_02.png"],
+            'right': ["images/princess_lump_walk_right_01.png", "images/princess_lump_walk_right_02.png"]
+        }
+    },
+    Characters.FIRE_PRINCESS: {
+        'idle': {
+            'down': "images/fire_princess_idle_down.png",
+            'up': "images/fire_princess_idle_up.png", 
+            'left': "images/fire_princess_idle_left.png",
+            'right': "images/fire_princess_idle_right.png"
+        },
+        'walk': {
+            'down': ["images/fire_princess_walk_down_01.png", "images/fire_princess_walk_down_02.png"],
+            'up': ["images/fire_princess_walk_up_01.png", "images/fire_princess_walk_up_02.png"],
+            'left': ["images/fire_princess_walk_left_01.png", "images/fire_princess_walk_left_02.png"],
+            'right': ["images/fire_princess_walk_right_01.png", "images/fire_princess_walk_right_02.png"]
+        }
+    },
+    Characters.JELLYBEAN_PRINCESS: {
+        'idle': {
+            'down': "images/jellybean_princess_idle_down.png",
+            'up': "images/jellybean_princess_idle_up.png", 
+            'left': "images/jellybean_princess_idle_left.png",
+            'right': "images/jellybean_princess_idle_right.png"
+        },
+        'walk': {
+            'down': ["images/jellybean_princess_walk_down_01.png", "images/jellybean_princess_walk_down_02.png"],
+            'up': ["images/jellybean_princess_walk_up_01.png", "images/jellybean_princess_walk_up_02.png"],
+            'left': ["images/jellybean_princess_walk_left_01.png", "images/jellybean_princess_walk_left_02.png"],
+            'right': ["images/jellybean_princess_walk_right_01.png", "images/jellybean_princess_walk_right_02.png"]
+        }
+    }
+}
+
+CHARACTER_BOMB_FILES = {
+    Characters.FINN: "images/bomba_finn.png",
+    Characters.JAKE: "images/bomb_jake.png", 
+    Characters.MARCELINE: "images/bomba_marceline.png",
+    Characters.PRINCESS_LUMP: "images/bomba_princess_lump.png",
+    Characters.FIRE_PRINCESS: "images/bomba_fire_princess.png",
+    Characters.JELLYBEAN_PRINCESS: "images/bomba_princess_jellybean.png"
+}
+
+POWERUP_FILES = {
+    "powerup_bomb": "images/power_up_extra_bomb.png",
+    "powerup_range": "images/power_up_fire_power.png", 
+    "powerup_speed": "images/power_up_speed.png"
+}
+
+MAP_THEME_FILES = {
+    "default": {
+        'background': "images/mapa.png",
+        'wall': "images/bloco-estrutural.png", 
+        'brick': "images/bloco-destrutivel.png"
+    },
+    "candy": {
+        'background': "images/mapa_reino_doce.png",
+        'wall': "images/bloco-estrutural-reino-doce.png",
+        'brick': "images/bloco-destrutivel-reino-doce.png"
+    },
+    "fire": {
+        'background': "images/mapa-reino-fogo.png",
+        'wall': "images/bloco-estrutural-reino-fogo.png",
+        'brick': "images/bloco-destrutivel-reino-fogo.png"
+    }
+}
+
+EXPLOSION_FILE = "images/explosion.png"
+
+LOAD_WORKERS = min(8, os.cpu_count() or 1)
+THEME_MEMORY_BUDGET = int(float(os.environ.get("BOOM_THEME_BUDGET_MB", "4")) * 1024 * 1024)
+
+def sprite_variant_for(character):
+    return "jake" if character == Characters.JAKE else "proportional"
+
+def character_image_requests(character):
+    sprite_files = CHARACTER_SPRITE_FILES[character]
+    variant = sprite_variant_for(character)
+    paths = list(sprite_files['idle'].values())
+    for frames in sprite_files['walk'].values():
+        paths.extend(frames)
+    return [(path, variant, TILE_SIZE) for path in paths]
+
+def theme_image_requests(theme_name):
+    theme_paths = MAP_THEME_FILES[theme_name]
+    return [
+        (theme_paths['background'], "background", (SCREEN_WIDTH, SCREEN_HEIGHT)),
+        (theme_paths['wall'], "proportional", TILE_SIZE),
+        (theme_paths['brick'], "proportional", TILE_SIZE)
+    ]
+
+def tile_image_requests(paths):
+    return [(path, "proportional", TILE_SIZE) for path in paths]
+
+def character_group(character):
+    return ('character', character)
+
+def preview_group(character):
+    return ('preview', character)
+
+def theme_group(theme_name):
+    return ('theme', theme_name)
+
+def surface_bytes(surface):
+    width, height = surface.get_size()
+    return width * height * surface.get_bytesize()
 
 class SpriteManager:
-    def __init__(self):
+    def __init__(self, background_loading=False, theme_memory_budget=THEME_MEMORY_BUDGET):
         self.images = {}
         self.images_loaded = {}
-        self.load_images()
+        self.atlas = SpriteAtlas(TILE_SIZE)
+        self.atlas_dirty = False
+        self.assets = get_asset_source()
+        self.sprite_cache = SpriteCache(assets=self.assets)
+        self.tracer = get_tracer()
+        self.load_times = {}
+        self.reported_loads = set()
+        
+        self.character_bombs = {}
+        self.map_themes = {}
+        self.current_theme = "default"
+        self.background_map = None
+        self.theme_memory_budget = theme_memory_budget
+        self.theme_usage = OrderedDict()
+        self.evicted_backgrounds = set()
+        self.generate_simple_collision_grid()
+        
+        self.loader = AssetLoader(self.decode_image, LOAD_WORKERS)
+        self.register_asset_groups()
+        # Só a leitura/decodificação roda nas threads (o pygame solta o GIL no decode do PNG);
+        # convert_alpha e o redimensionamento ficam na thread principal em load_scaled_sprite
+        self.loader.start()
+        
+        if not background_loading:
+            self.load_images()
+    
+    def register_asset_groups(self):
+        loaders = {
+            Characters.FINN: self.load_finn_directional_sprites,
+            Characters.JAKE: self.load_jake_directional_sprites,
+            Characters.MARCELINE: self.load_marceline_directional_sprites,
+            Characters.PRINCESS_LUMP: self.load_princesa_directional_sprites,
+            Characters.FIRE_PRINCESS: self.load_fire_princess_directional_sprites,
+            Characters.JELLYBEAN_PRINCESS: self.load_jellybean_princess_directional_sprites
+        }
+        
+        # Menu primeiro (só a prévia de cada herói), depois o que toda partida usa.
+        # Conjuntos completos de personagens e os outros reinos são carregados sob demanda
+        for character in Characters.ALL:
+            self.add_asset_group(preview_group(character), LOAD_PRIORITY_MENU,
+                                 character_image_requests(character)[:1],
+                                 lambda character=character: self.load_character_preview(character))
+        
+        self.add_asset_group('effects', LOAD_PRIORITY_MATCH, tile_image_requests([EXPLOSION_FILE]),
+                             self.create_basic_sprites)
+        self.add_asset_group('bombs', LOAD_PRIORITY_MATCH, tile_image_requests(CHARACTER_BOMB_FILES.values()),
+                             self.load_character_bombs)
+        self.add_asset_group('powerups', LOAD_PRIORITY_MATCH, tile_image_requests(POWERUP_FILES.values()),
+                             self.load_powerup_sprites)
+        
+        for character in Characters.ALL:
+            self.add_asset_group(character_group(character), LOAD_PRIORITY_MATCH,
+                                 character_image_requests(character), loaders[character], lazy=True)
+        
+        first_theme = self.get_theme_for_level(1)
+        for theme_name in MAP_THEME_FILES:
+            self.add_asset_group(theme_group(theme_name), LOAD_PRIORITY_MATCH, theme_image_requests(theme_name),
+                                 lambda theme_name=theme_name: self.load_theme(theme_name),
+                                 lazy=theme_name != first_theme)
+    
+    def add_asset_group(self, name, priority, requests, finalize, lazy=False):
+        requests = [request for request in requests if self.assets.exists(request[0])]
+        
+        def finalize_group():
+            with self.tracer.span('SpriteManager.finalize_group', {'group': str(name)}):
+                finalize()
+            self.atlas_dirty = True
+        
+        return self.loader.add_group(name, priority, requests, finalize_group, lazy=lazy)
     
     def load_images(self):
-        self.load_finn_directional_sprites()
-        self.load_jake_directional_sprites()
-        self.load_marceline_directional_sprites()
-        self.load_princesa_directional_sprites()
-        self.load_fire_princess_directional_sprites()
-        self.load_jellybean_princess_directional_sprites()
-        self.create_basic_sprites()
-        self.load_character_bombs()
-        self.load_powerup_sprites()
-        self.load_background_map()
+        with self.tracer.span('SpriteManager.load_images'):
+            self.wait_until_ready(self.loader.groups)
+    
+    def match_asset_groups(self, characters, level=1):
+        groups = [character_group(character) for character in characters]
+        groups += ['effects', 'bombs', 'powerups', theme_group(self.get_theme_for_level(level))]
+        return groups
+    
+    def request_assets(self, groups, priority=LOAD_PRIORITY_URGENT):
+        self.loader.prioritize(groups, priority)
+    
+    def prefetch_theme(self, level):
+        self.request_assets([theme_group(self.get_theme_for_level(level))], LOAD_PRIORITY_THEMES)
+    
+    def is_ready(self, groups):
+        return self.loader.is_ready(groups)
+    
+    def wait_until_ready(self, groups, timeout=None):
+        groups = list(groups)
+        if not self.loader.is_ready(groups) and not self.loader.wait(groups, timeout):
+            return False
+        
+        if self.atlas_dirty:
+            with self.tracer.span('SpriteManager.build_sprite_atlas'):
+                self.build_sprite_atlas()
+            self.report_load_times()
+        return True
+    
+    def pump_loading(self, budget_ms=4.0):
+        return self.loader.pump(budget_ms)
+    
+    def loading_progress(self):
+        return self.loader.progress()
+    
+    def cleanup(self):
+        self.loader.close()
+    
+    def load_character_preview(self, character):
+        # O conjunto completo pode ter chegado antes da prévia
+        if self.loader.is_ready([character_group(character)]):
+            return
+        
+        path = CHARACTER_SPRITE_FILES[character]['idle']['down']
+        try:
+            sprite = self.load_scaled_sprite(path, sprite_variant_for(character))
+        except Exception as e:
+            print(f"❌ Erro ao carregar prévia de {character}: {e}")
+            return
+        
+        self.images[character] = {
+            'idle': {'down': sprite},
+            'walk': {},
+            'current_direction': 'down',
+            'current_state': 'idle',
+            'current_frame': 0,
+            'animation_speed': 8
+        }
+        self.images_loaded[character] = True
+    
+    def decode_image(self, path, variant, size):
+        started = time.perf_counter()
+        pixel_format = "RGB" if variant == "background" else "RGBA"
+        cache_key = self.sprite_cache.make_key(path, variant, size, pixel_format)
+        
+        sprite = self.sprite_cache.load(cache_key)
+        if sprite is not None:
+            image, from_cache = sprite, True
+        else:
+            image, from_cache = self.assets.load_image(path), False
+        
+        ended = time.perf_counter()
+        self.tracer.complete('SpriteManager.decode_image', started, ended, {'path': path, 'cache': from_cache})
+        return image, from_cache, cache_key, (ended - started) * 1000
+    
+    def report_load_times(self, slowest=5):
+        new_loads = {path: elapsed for path, elapsed in self.load_times.items() if path not in self.reported_loads}
+        if not new_loads:
+            return
+        self.reported_loads.update(new_loads)
+        
+        print(f"⏱️ {len(new_loads)} imagens carregadas "
+              f"({sum(new_loads.values()):.1f}ms somando cada asset, {LOAD_WORKERS} threads)")
+        
+        ranking = sorted(new_loads.items(), key=lambda item: item[1], reverse=True)
+        for path, elapsed in ranking[:slowest]:
+            print(f"   🐢 {path}: {elapsed:.1f}ms")
+    
+    def build_sprite_atlas(self):
+        atlas = self.atlas
+        
+        for character in Characters.ALL:
+            character_data = self.images.get(character)
+            if not character_data or 'idle' not in character_data:
+                continue
+            for direction, sprite in character_data['idle'].items():
+                atlas.add((character, 'idle', direction, 0), sprite)
+            for direction, frames in character_data['walk'].items():
+                for frame, sprite in enumerate(frames):
+                    atlas.add((character, 'walk', direction, frame), sprite)
+        
+        for character, sprite in self.character_bombs.items():
+            atlas.add(('bomb', character), sprite)
+        
+        for name in ["bomb", "explosion", "powerup_bomb", "powerup_range", "powerup_speed"]:
+            if self.images_loaded.get(name, False):
+                atlas.add((name, 'default'), self.images[name]['default'])
+        
+        for theme_name, theme_data in self.map_themes.items():
+            for tile_name in ['wall', 'brick']:
+                atlas.add((theme_name, tile_name), theme_data[tile_name])
+        
+        if atlas.build() is None:
+            return False
+        
+        def view(key, sprite):
+            return atlas.get(key) if key in atlas else sprite
+        
+        for character in Characters.ALL:
+            character_data = self.images.get(character)
+            if not character_data or 'idle' not in character_data:
+                continue
+            for direction, sprite in character_data['idle'].items():
+                character_data['idle'][direction] = view((character, 'idle', direction, 0), sprite)
+            for direction, frames in character_data['walk'].items():
+                character_data['walk'][direction] = [
+                    view((character, 'walk', direction, frame), sprite) for frame, sprite in enumerate(frames)
+                ]
+        
+        for character, sprite in self.character_bombs.items():
+            self.character_bombs[character] = view(('bomb', character), sprite)
+        
+        for name in ["bomb", "explosion", "powerup_bomb", "powerup_range", "powerup_speed"]:
+            if self.images_loaded.get(name, False):
+                self.images[name]['default'] = view((name, 'default'), self.images[name]['default'])
+        
+        for theme_name, theme_data in self.map_themes.items():
+            for tile_name in ['wall', 'brick']:
+                theme_data[tile_name] = view((theme_name, tile_name), theme_data[tile_name])
+        
+        if self.current_theme in self.map_themes:
+            self.apply_map_theme(self.map_themes[self.current_theme])
+        self.atlas_dirty = False
+        
+        width, height = atlas.surface.get_size()
+        print(f"✅ Atlas de sprites montado: {len(atlas)} sprites em {width}x{height}")
+        return True
+    
+    def get_atlas_sprite(self, character, state, direction, frame=0):
+        return self.atlas.get((character, state, direction, frame))
+    
+    def load_scaled_sprite(self, path, variant="proportional", size=TILE_SIZE):
+        prefetched = self.loader.take((path, variant))
+        if prefetched is None:
+            prefetched = self.decode_image(path, variant, size)
+        image, from_cache, cache_key, decode_ms = prefetched
+        
+        started = time.perf_counter()
+        if from_cache:
+            sprite = image
+            if variant != "background" and pygame.display.get_surface() is not None:
+                sprite = sprite.convert_alpha()
+        else:
+            sprite = self.process_sprite(image, variant, size)
+            self.sprite_cache.store(cache_key, sprite)
+        
+        self.load_times[path] = decode_ms + (time.perf_counter() - started) * 1000
+        return sprite
+    
+    def process_sprite(self, image, variant, size):
+        if variant == "background":
+            return pygame.transform.scale(image, size)
+        
+        image = image.convert_alpha()
+        if variant == "jake":
+            return self.scale_jake_sprite(image)
+        return self.scale_sprite_proportional(image, size)
     
     def scale_sprite_proportional(self, sprite, target_size):
         original_width, original_height = sprite.get_size()
@@ -66,20 +468,7 @@ class SpriteManager:
         return sprite
     
     def load_finn_directional_sprites(self):
-        finn_sprites = {
-            'idle': {
-                'down': "images/finn_idle.png",
-                'up': "images/finn_idle_up.png", 
-                'left': "images/finn_idle_left.png",
-                'right': "images/finn_idle_right.png"
-            },
-            'walk': {
-                'down': ["images/finn_walk_down_01.png", "images/finn_walk_down_02.png"],
-                'up': ["images/finn_walk_up_01.png", "images/finn_walk_up_02.png"],
-                'left': ["images/finn_walk_left_01.png", "images/finn_walk_left_02.png"],
-                'right': ["images/finn_walk_right_01.png", "images/finn_walk_right_02.png"]
-            }
-        }
+        finn_sprites = CHARACTER_SPRITE_FILES[Characters.FINN]
         
         loaded_sprites = {
             'idle': {},
@@ -91,10 +480,9 @@ class SpriteManager:
         }
         
         for direction, path in finn_sprites['idle'].items():
-            if os.path.exists(path):
+            if self.assets.exists(path):
                 try:
-                    sprite = pygame.image.load(path).convert_alpha()
-                    sprite = self.scale_sprite_proportional(sprite, TILE_SIZE)
+                    sprite = self.load_scaled_sprite(path)
                     loaded_sprites['idle'][direction] = sprite
                     print(f"✅ Finn idle {direction} carregado: {path}")
                 except Exception as e:
@@ -105,10 +493,9 @@ class SpriteManager:
         for direction, paths in finn_sprites['walk'].items():
             loaded_sprites['walk'][direction] = []
             for i, path in enumerate(paths):
-                if os.path.exists(path):
+                if self.assets.exists(path):
                     try:
-                        sprite = pygame.image.load(path).convert_alpha()
-                        sprite = self.scale_sprite_proportional(sprite, TILE_SIZE)
+                        sprite = self.load_scaled_sprite(path)
                         loaded_sprites['walk'][direction].append(sprite)
                         print(f"✅ Finn walk {direction} frame {i+1} carregado: {path}")
                     except Exception as e:
@@ -128,20 +515,7 @@ class SpriteManager:
             print("❌ Nenhum sprite do Finn foi carregado")
     
     def load_jake_directional_sprites(self):
-        jake_sprites = {
-            'idle': {
-                'down': "images/jake_idle_down.png",
-                'up': "images/jake_idle_up.png", 
-                'left': "images/jake_idle_left.png",
-                'right': "images/jake_idle_right.png"
-            },
-            'walk': {
-                'down': ["images/jake_walk_down_01.png", "images/jake_walk_down_02.png"],
-                'up': ["images/jake_walk_up_01.png", "images/jake_walk_up_02.png"],
-                'left': ["images/jake_walk_left_01.png", "images/jake_walk_left_02.png"],
-                'right': ["images/jake_walk_right_01.png", "images/jake_walk_right_02.png"]
-            }
-        }
+        jake_sprites = CHARACTER_SPRITE_FILES[Characters.JAKE]
         
         loaded_sprites = {
             'idle': {},
@@ -153,7 +527,7 @@ class SpriteManager:
         }
         
         for direction, path in jake_sprites['idle'].items():
-            if os.path.exists(path):
+            if self.assets.exists(path):
                 try:
                     sprite = self.load_jake_sprite_optimized(path)
                     loaded_sprites['idle'][direction] = sprite
@@ -166,7 +540,7 @@ class SpriteManager:
         for direction, paths in jake_sprites['walk'].items():
             loaded_sprites['walk'][direction] = []
             for i, path in enumerate(paths):
-                if os.path.exists(path):
+                if self.assets.exists(path):
                     try:
                         sprite = self.load_jake_sprite_optimized(path)
                         loaded_sprites['walk'][direction].append(sprite)
@@ -188,8 +562,9 @@ class SpriteManager:
             print("❌ Nenhum sprite do Jake foi carregado")
     
     def load_jake_sprite_optimized(self, path):
-        sprite = pygame.image.load(path).convert_alpha()
-        
+        return self.load_scaled_sprite(path, "jake")
+    
+    def scale_jake_sprite(self, sprite):
         original_width, original_height = sprite.get_size()
         
         if original_width <= 30 and original_height <= 35:
@@ -218,20 +593,7 @@ class SpriteManager:
         return sprite
     
     def load_marceline_directional_sprites(self):
-        marceline_sprites = {
-            'idle': {
-                'down': "images/marceline_idle_down.png",
-                'up': "images/marceline_idle_up.png", 
-                'left': "images/marceline_idle_left.png",
-                'right': "images/marceline_idle_right.png"
-            },
-            'walk': {
-                'down': ["images/marceline_walk_down_01.png", "images/marceline_walk_down_02.png"],
-                'up': ["images/marceline_walk_up_01.png", "images/marceline_walk_up_02.png"],
-                'left': ["images/marceline_walk_left_01.png", "images/marceline_walk_left_02.png"],
-                'right': ["images/marceline_walk_right_01.png", "images/marceline_walk_right_02.png"]
-            }
-        }
+        marceline_sprites = CHARACTER_SPRITE_FILES[Characters.MARCELINE]
         
         loaded_sprites = {
             'idle': {},
@@ -243,10 +605,9 @@ class SpriteManager:
         }
         
         for direction, path in marceline_sprites['idle'].items():
-            if os.path.exists(path):
+            if self.assets.exists(path):
                 try:
-                    sprite = pygame.image.load(path).convert_alpha()
-                    sprite = self.scale_sprite_proportional(sprite, TILE_SIZE)
+                    sprite = self.load_scaled_sprite(path)
                     loaded_sprites['idle'][direction] = sprite
                     print(f"✅ Marceline idle {direction} carregado: {path}")
                 except Exception as e:
@@ -257,10 +618,9 @@ class SpriteManager:
         for direction, paths in marceline_sprites['walk'].items():
             loaded_sprites['walk'][direction] = []
             for i, path in enumerate(paths):
-                if os.path.exists(path):
+                if self.assets.exists(path):
                     try:
-                        sprite = pygame.image.load(path).convert_alpha()
-                        sprite = self.scale_sprite_proportional(sprite, TILE_SIZE)
+                        sprite = self.load_scaled_sprite(path)
                         loaded_sprites['walk'][direction].append(sprite)
                         print(f"✅ Marceline walk {direction} frame {i+1} carregado: {path}")
                     except Exception as e:
@@ -280,20 +640,7 @@ class SpriteManager:
             print("❌ Nenhum sprite da Marceline foi carregado")
     
     def load_princesa_directional_sprites(self):
-        princesa_sprites = {
-            'idle': {
-                'down': "images/princess_lump_idle_down.png",
-                'up': "images/princess_lump_idle_up.png", 
-                'left': "images/princess_lump_idle_left.png",
-                'right': "images/princess_lump_idle_right.png"
-            },
-            'walk': {
-                'down': ["images/princess_lump_walk_down_01.png", "images/princess_lump_walk_down_02.png"],
-                'up': ["images/princess_lump_walk_up_01.png", "images/princess_lump_walk_up_02.png"],
-                'left': ["images/princess_lump_walk_left_01.png", "images/princess_lump_walk_left_02.png"],
-                'right': ["images/princess_lump_walk_right_01.png", "images/princess_lump_walk_right_02.png"]
-            }
-        }
+        princesa_sprites = CHARACTER_SPRITE_FILES[Characters.PRINCESS_LUMP]
         
         loaded_sprites = {
             'idle': {},
@@ -305,10 +652,9 @@ class SpriteManager:
         }
         
         for direction, path in princesa_sprites['idle'].items():
-            if os.path.exists(path):
+            if self.assets.exists(path):
                 try:
-                    sprite = pygame.image.load(path).convert_alpha()
-                    sprite = self.scale_sprite_proportional(sprite, TILE_SIZE)
+                    sprite = self.load_scaled_sprite(path)
                     loaded_sprites['idle'][direction] = sprite
                     print(f"✅ Princesa idle {direction} carregado: {path}")
                 except Exception as e:
@@ -319,10 +665,9 @@ class SpriteManager:
         for direction, paths in princesa_sprites['walk'].items():
             loaded_sprites['walk'][direction] = []
             for i, path in enumerate(paths):
-                if os.path.exists(path):
+                if self.assets.exists(path):
                     try:
-                        sprite = pygame.image.load(path).convert_alpha()
-                        sprite = self.scale_sprite_proportional(sprite, TILE_SIZE)
+                        sprite = self.load_scaled_sprite(path)
                         loaded_sprites['walk'][direction].append(sprite)
                         print(f"✅ Princesa walk {direction} frame {i+1} carregado: {path}")
                     except Exception as e:
@@ -342,20 +687,7 @@ class SpriteManager:
             print("❌ Nenhum sprite da Princesa foi carregado")
     
     def load_fire_princess_directional_sprites(self):
-        fire_princess_sprites = {
-            'idle': {
-                'down': "images/fire_princess_idle_down.png",
-                'up': "images/fire_princess_idle_up.png", 
-                'left': "images/fire_princess_idle_left.png",
-                'right': "images/fire_princess_idle_right.png"
-            },
-            'walk': {
-                'down': ["images/fire_princess_walk_down_01.png", "images/fire_princess_walk_down_02.png"],
-                'up': ["images/fire_princess_walk_up_01.png", "images/fire_princess_walk_up_02.png"],
-                'left': ["images/fire_princess_walk_left_01.png", "images/fire_princess_walk_left_02.png"],
-                'right': ["images/fire_princess_walk_right_01.png", "images/fire_princess_walk_right_02.png"]
-            }
-        }
+        fire_princess_sprites = CHARACTER_SPRITE_FILES[Characters.FIRE_PRINCESS]
         
         loaded_sprites = {
             'idle': {},
@@ -367,10 +699,9 @@ class SpriteManager:
         }
         
         for direction, path in fire_princess_sprites['idle'].items():
-            if os.path.exists(path):
+            if self.assets.exists(path):
                 try:
-                    sprite = pygame.image.load(path).convert_alpha()
-                    sprite = self.scale_sprite_proportional(sprite, TILE_SIZE)
+                    sprite = self.load_scaled_sprite(path)
                     loaded_sprites['idle'][direction] = sprite
                     print(f"✅ Fire Princess idle {direction} carregado: {path}")
                 except Exception as e:
@@ -381,10 +712,9 @@ class SpriteManager:
         for direction, paths in fire_princess_sprites['walk'].items():
             loaded_sprites['walk'][direction] = []
             for i, path in enumerate(paths):
-                if os.path.exists(path):
+                if self.assets.exists(path):
                     try:
-                        sprite = pygame.image.load(path).convert_alpha()
-                        sprite = self.scale_sprite_proportional(sprite, TILE_SIZE)
+                        sprite = self.load_scaled_sprite(path)
                         loaded_sprites['walk'][direction].append(sprite)
                         print(f"✅ Fire Princess walk {direction} frame {i+1} carregado: {path}")
                     except Exception as e:
@@ -404,20 +734,7 @@ class SpriteManager:
             print("❌ Nenhum sprite da Fire Princess foi carregado")
     
     def load_jellybean_princess_directional_sprites(self):
-        jellybean_princess_sprites = {
-            'idle': {
-                'down': "images/jellybean_princess_idle_down.png",
-                'up': "images/jellybean_princess_idle_up.png", 
-                'left': "images/jellybean_princess_idle_left.png",
-                'right': "images/jellybean_princess_idle_right.png"
-            },
-            'walk': {
-                'down': ["images/jellybean_princess_walk_down_01.png", "images/jellybean_princess_walk_down_02.png"],
-                'up': ["images/jellybean_princess_walk_up_01.png", "images/jellybean_princess_walk_up_02.png"],
-                'left': ["images/jellybean_princess_walk_left_01.png", "images/jellybean_princess_walk_left_02.png"],
-                'right': ["images/jellybean_princess_walk_right_01.png", "images/jellybean_princess_walk_right_02.png"]
-            }
-        }
+        jellybean_princess_sprites = CHARACTER_SPRITE_FILES[Characters.JELLYBEAN_PRINCESS]
         
         loaded_sprites = {
             'idle': {},
@@ -429,10 +746,9 @@ class SpriteManager:
         }
         
         for direction, path in jellybean_princess_sprites['idle'].items():
-            if os.path.exists(path):
+            if self.assets.exists(path):
                 try:
-                    sprite = pygame.image.load(path).convert_alpha()
-                    sprite = self.scale_sprite_proportional(sprite, TILE_SIZE)
+                    sprite = self.load_scaled_sprite(path)
                     loaded_sprites['idle'][direction] = sprite
                     print(f"✅ Jellybean Princess idle {direction} carregado: {path}")
                 except Exception as e:
@@ -443,10 +759,9 @@ class SpriteManager:
         for direction, paths in jellybean_princess_sprites['walk'].items():
             loaded_sprites['walk'][direction] = []
             for i, path in enumerate(paths):
-                if os.path.exists(path):
+                if self.assets.exists(path):
                     try:
-                        sprite = pygame.image.load(path).convert_alpha()
-                        sprite = self.scale_sprite_proportional(sprite, TILE_SIZE)
+                        sprite = self.load_scaled_sprite(path)
                         loaded_sprites['walk'][direction].append(sprite)
                         print(f"✅ Jellybean Princess walk {direction} frame {i+1} carregado: {path}")
                     except Exception as e:
@@ -466,34 +781,21 @@ class SpriteManager:
             print("❌ Nenhum sprite da Jellybean Princess foi carregado")
     
     def load_princess_sprite_optimized(self, path, princess_name):
-        sprite = pygame.image.load(path).convert_alpha()
-        
-        sprite = self.scale_sprite_proportional(sprite, TILE_SIZE)
+        sprite = self.load_scaled_sprite(path)
         
-        original_width, original_height = pygame.image.load(path).get_size()
         new_width, new_height = sprite.get_size()
         
-        print(f"✅ {princess_name} - Tamanho original: {original_width}x{original_height}, Novo: {new_width}x{new_height} (TILE_SIZE={TILE_SIZE})")
+        print(f"✅ {princess_name} - Tamanho: {new_width}x{new_height} (TILE_SIZE={TILE_SIZE})")
         
         return sprite
     
     def load_character_bombs(self):
-        bomb_files = {
-            Characters.FINN: "images/bomba_finn.png",
-            Characters.JAKE: "images/bomb_jake.png", 
-            Characters.MARCELINE: "images/bomba_marceline.png",
-            Characters.PRINCESS_LUMP: "images/bomba_princess_lump.png",
-            Characters.FIRE_PRINCESS: "images/bomba_fire_princess.png",
-            Characters.JELLYBEAN_PRINCESS: "images/bomba_princess_jellybean.png"
-        }
-        
         self.character_bombs = {}
         
-        for character, bomb_path in bomb_files.items():
-            if os.path.exists(bomb_path):
+        for character, bomb_path in CHARACTER_BOMB_FILES.items():
+            if self.assets.exists(bomb_path):
                 try:
-                    bomb_sprite = pygame.image.load(bomb_path).convert_alpha()
-                    bomb_sprite = self.scale_sprite_proportional(bomb_sprite, TILE_SIZE)
+                    bomb_sprite = self.load_scaled_sprite(bomb_path)
                     
                     self.character_bombs[character] = bomb_sprite
                     print(f"✅ Bomba do {Characters.NAMES.get(character, character)} carregada: {bomb_path}")
@@ -508,17 +810,10 @@ class SpriteManager:
         print(f"✅ {len([b for b in self.character_bombs.values() if b is not None])} bombas de personagem carregadas")
 
     def load_powerup_sprites(self):
-        powerup_files = {
-            "powerup_bomb": "images/power_up_extra_bomb.png",
-            "powerup_range": "images/power_up_fire_power.png", 
-            "powerup_speed": "images/power_up_speed.png"
-        }
-        
-        for powerup_name, powerup_path in powerup_files.items():
-            if os.path.exists(powerup_path):
+        for powerup_name, powerup_path in POWERUP_FILES.items():
+            if self.assets.exists(powerup_path):
                 try:
-                    powerup_sprite = pygame.image.load(powerup_path).convert_alpha()
-                    powerup_sprite = self.scale_sprite_proportional(powerup_sprite, TILE_SIZE)
+                    powerup_sprite = self.load_scaled_sprite(powerup_path)
                     
                     self.images[powerup_name] = {'default': powerup_sprite}
                     self.images_loaded[powerup_name] = True
@@ -531,43 +826,59 @@ class SpriteManager:
                 print(f"⚠️ Power-up não encontrado: {powerup_path}")
                 self.images_loaded[powerup_name] = False
         
-        print(f"✅ {len([name for name in powerup_files.keys() if self.images_loaded.get(name, False)])} sprites de power-up carregadas")
+        print(f"✅ {len([name for name in POWERUP_FILES.keys() if self.images_loaded.get(name, False)])} sprites de power-up carregadas")
 
-    def load_background_map(self):
-        self.map_themes = {}
-        self.current_theme = "default"
-        
-        self.load_map_theme("default", {
-            'background': "images/mapa.png",
-            'wall': "images/bloco-estrutural.png", 
-            'brick': "images/bloco-destrutivel.png"
-        })
+    def load_theme(self, theme_name):
+        self.load_map_theme(theme_name, MAP_THEME_FILES[theme_name])
+        self.touch_theme(theme_name)
         
-        self.load_map_theme("candy", {
-            'background': "images/mapa_reino_doce.png",
-            'wall': "images/bloco-estrutural-reino-doce.png",
-            'brick': "images/bloco-destrutivel-reino-doce.png"
-        })
-        
-        self.load_map_theme("fire", {
-            'background': "images/mapa-reino-fogo.png",
-            'wall': "images/bloco-estrutural-reino-fogo.png",
-            'brick': "images/bloco-destrutivel-reino-fogo.png"
-        })
-        
-        self.set_map_theme("default")
+        if theme_name == self.current_theme:
+            self.set_map_theme(theme_name)
+    
+    def touch_theme(self, theme_name):
+        self.theme_usage[theme_name] = True
+        self.theme_usage.move_to_end(theme_name)
+        self.enforce_theme_budget()
+    
+    def enforce_theme_budget(self):
+        # LRU: libera primeiro os fundos (800x600) dos temas usados há mais tempo, nunca o atual
+        loaded = [(name, surface_bytes(self.map_themes[name]['background']))
+                  for name in self.theme_usage
+                  if self.map_themes.get(name, {}).get('background') is not None]
+        total = sum(size for _, size in loaded)
+        
+        for theme_name, size in loaded:
+            if total <= self.theme_memory_budget:
+                break
+            if theme_name == self.current_theme:
+                continue
+            
+            self.map_themes[theme_name]['background'] = None
+            self.evicted_backgrounds.add(theme_name)
+            total -= size
+            print(f"🧹 Fundo do tema '{theme_name}' liberado da memória ({size // 1024} KB)")
+    
+    def reload_theme_background(self, theme_name):
+        path = MAP_THEME_FILES[theme_name]['background']
+        self.evicted_backgrounds.discard(theme_name)
         
-        self.generate_simple_collision_grid()
+        try:
+            self.map_themes[theme_name]['background'] = self.load_scaled_sprite(
+                path, "background", (SCREEN_WIDTH, SCREEN_HEIGHT)
+            )
+            print(f"♻️ Fundo do tema '{theme_name}' recarregado: {path}")
+        except Exception as e:
+            print(f"❌ Erro ao recarregar fundo do tema '{theme_name}': {e}")
     
     def load_map_theme(self, theme_name, theme_paths):
         theme_data = {}
         
         background_path = theme_paths['background']
-        if os.path.exists(background_path):
+        if self.assets.exists(background_path):
             try:
-                from .constants import SCREEN_WIDTH, SCREEN_HEIGHT
-                map_image = pygame.image.load(background_path)
-                theme_data['background'] = pygame.transform.scale(map_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
+                theme_data['background'] = self.load_scaled_sprite(
+                    background_path, "background", (SCREEN_WIDTH, SCREEN_HEIGHT)
+                )
                 print(f"✅ Fundo do tema '{theme_name}' carregado: {background_path}")
             except Exception as e:
                 print(f"❌ Erro ao carregar fundo do tema '{theme_name}': {e}")
@@ -577,10 +888,9 @@ class SpriteManager:
             theme_data['background'] = None
         
         wall_path = theme_paths['wall']
-        if os.path.exists(wall_path):
+        if self.assets.exists(wall_path):
             try:
-                wall_image = pygame.image.load(wall_path).convert_alpha()
-                theme_data['wall'] = self.scale_sprite_proportional(wall_image, TILE_SIZE)
+                theme_data['wall'] = self.load_scaled_sprite(wall_path)
                 print(f"✅ Blocos estruturais do tema '{theme_name}' carregados: {wall_path}")
             except Exception as e:
                 print(f"❌ Erro ao carregar blocos estruturais do tema '{theme_name}': {e}")
@@ -590,10 +900,9 @@ class SpriteManager:
             theme_data['wall'] = None
         
         brick_path = theme_paths['brick']
-        if os.path.exists(brick_path):
+        if self.assets.exists(brick_path):
             try:
-                brick_image = pygame.image.load(brick_path).convert_alpha()
-                theme_data['brick'] = self.scale_sprite_proportional(brick_image, TILE_SIZE)
+                theme_data['brick'] = self.load_scaled_sprite(brick_path)
                 print(f"✅ Blocos destrutíveis do tema '{theme_name}' carregados: {brick_path}")
             except Exception as e:
                 print(f"❌ Erro ao carregar blocos destrutíveis do tema '{theme_name}': {e}")
@@ -605,23 +914,15 @@ class SpriteManager:
         self.map_themes[theme_name] = theme_data
     
     def set_map_theme(self, theme_name):
+        if theme_name not in self.map_themes and theme_group(theme_name) in self.loader.groups:
+            self.wait_until_ready([theme_group(theme_name)])
+        
         if theme_name in self.map_themes:
             self.current_theme = theme_name
-            theme_data = self.map_themes[theme_name]
-            
-            self.background_map = theme_data['background']
-            
-            if theme_data['wall']:
-                self.images['wall'] = {'default': theme_data['wall']}
-                self.images_loaded['wall'] = True
-            
-            if theme_data['brick']:
-                self.images['brick'] = {'default': theme_data['brick']}
-                self.images_loaded['brick'] = True
-            
-            if theme_data['background']:
-                self.images['background_map'] = {'default': theme_data['background']}
-                self.images_loaded['background_map'] = True
+            if theme_name in self.evicted_backgrounds:
+                self.reload_theme_background(theme_name)
+            self.touch_theme(theme_name)
+            self.apply_map_theme(self.map_themes[theme_name])
             
             print(f"🎨 Tema de mapa alterado para: {theme_name}")
             return True
@@ -629,6 +930,21 @@ class SpriteManager:
             print(f"❌ Tema '{theme_name}' não encontrado!")
             return False
     
+    def apply_map_theme(self, theme_data):
+        self.background_map = theme_data['background']
+        
+        if theme_data['wall']:
+            self.images['wall'] = {'default': theme_data['wall']}
+            self.images_loaded['wall'] = True
+        
+        if theme_data['brick']:
+            self.images['brick'] = {'default': theme_data['brick']}
+            self.images_loaded['brick'] = True
+        
+        if theme_data['background']:
+            self.images['background_map'] = {'default': theme_data['background']}
+            self.images_loaded['background_map'] = True
+    
     def get_theme_for_level(self, level):
         if level % 3 == 1:
             return "default"
@@ -837,12 +1153,11 @@ class SpriteManager:
         self.load_explosion_sprite()
 
     def load_explosion_sprite(self):
-        explosion_path = "images/explosion.png"
+        explosion_path = EXPLOSION_FILE
         
-        if os.path.exists(explosion_path):
+        if self.assets.exists(explosion_path):
             try:
-                explosion_sprite = pygame.image.load(explosion_path).convert_alpha()
-                explosion_sprite = self.scale_sprite_proportional(explosion_sprite, TILE_SIZE)
+                explosion_sprite = self.load_scaled_sprite(explosion_path)
                 
                 self.images['explosion'] = {'default': explosion_sprite}
                 self.images_loaded['explosion'] = True
@@ -909,6 +1224,12 @@ class SpriteManager:
             return True
         return False
     
+    def draw_background_area(self, surface, rect):
+        if self.images_loaded.get('background_map', False) and self.background_map:
+            surface.blit(self.background_map, rect.topleft, rect)
+            return True
+        return False
+    
     def draw_sprite(self, surface, sprite_name, x, y, size=TILE_SIZE, **kwargs):
         if sprite_name == "bomb" and 'character' in kwargs:
             character = kwargs['character']
@@ -0,0 +1,120 @@
+import json
+import os
+import threading
+import time
+
+MAX_TRACE_EVENTS = 1_000_000
+DEFAULT_TRACE_PATH = "boom_trace.json"
+
+class NullSection:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_SECTION = NullSection()
+
+class Span:
+    __slots__ = ('tracer', 'name', 'args', 'started')
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.complete(self.name, self.started, time.perf_counter(), self.args)
+        return False
+
+class Tracer:
+    def __init__(self, path=None, max_events=MAX_TRACE_EVENTS):
+        self.path = None
+        self.max_events = max_events
+        self.events = []
+        self.thread_names = {}
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+        self.dropped = 0
+        if path:
+            self.start(path)
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def start(self, path=DEFAULT_TRACE_PATH):
+        self.path = path
+        self.events = []
+        self.thread_names = {}
+        self.dropped = 0
+        self.origin = time.perf_counter()
+        print(f"🧵 Gravando trace em {path}")
+
+    def span(self, name, args=None):
+        if self.path is None:
+            return NULL_SECTION
+        return Span(self, name, args)
+
+    def timestamp(self, moment):
+        return (moment - self.origin) * 1_000_000
+
+    def record(self, event):
+        if len(self.events) >= self.max_events:
+            self.dropped += 1
+            return
+
+        tid = threading.get_ident()
+        if tid not in self.thread_names:
+            self.thread_names[tid] = threading.current_thread().name
+        event['pid'] = self.pid
+        event['tid'] = tid
+        self.events.append(event)
+
+    def complete(self, name, started, ended, args=None):
+        if self.path is None:
+            return
+        event = {'name': name, 'ph': 'X', 'ts': self.timestamp(started), 'dur': (ended - started) * 1_000_000}
+        if args:
+            event['args'] = args
+        self.record(event)
+
+    def instant(self, name, args=None):
+        if self.path is None:
+            return
+        event = {'name': name, 'ph': 'i', 's': 't', 'ts': self.timestamp(time.perf_counter())}
+        if args:
+            event['args'] = args
+        self.record(event)
+
+    def save(self, path=None):
+        path = path or self.path
+        if path is None:
+            return None
+
+        metadata = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': tid, 'args': {'name': name}}
+            for tid, name in self.thread_names.items()
+        ]
+        trace = {'traceEvents': metadata + list(self.events), 'displayTimeUnit': 'ms'}
+
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as trace_file:
+            json.dump(trace, trace_file, separators=(",", ":"))
+        os.replace(temp_path, path)
+
+        print(f"🧵 Trace salvo: {path} ({len(self.events)} eventos"
+              + (f", {self.dropped} descartados" if self.dropped else "") + ")")
+        return path
+
+_default_tracer = None
+
+def get_tracer():
+    global _default_tracer
+    if _default_tracer is None:
+        _default_tracer = Tracer(os.environ.get("BOOM_TRACE") or None)
+    return _default_tracer
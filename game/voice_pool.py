@@ -0,0 +1,63 @@
+import itertools
+import pygame
+
+class Voice:
+    def __init__(self, channel):
+        self.channel = channel
+        self.name = None
+        self.priority = 0
+        self.started = 0
+
+    def is_active(self):
+        if self.name is not None and not self.channel.get_busy():
+            self.name = None
+        return self.name is not None
+
+class VoicePool:
+    def __init__(self, channel_ids):
+        self.voices = [Voice(pygame.mixer.Channel(channel_id)) for channel_id in channel_ids]
+        self.sequence = itertools.count()
+        self.triggered = set()
+        self.stats = {'played': 0, 'coalesced': 0, 'stolen': 0, 'dropped': 0}
+
+    def new_tick(self):
+        self.triggered.clear()
+
+    def play(self, name, sound, priority=0, max_voices=1):
+        # Sons iguais disparados no mesmo tick viram uma voz só
+        if name in self.triggered:
+            self.stats['coalesced'] += 1
+            return None
+        self.triggered.add(name)
+
+        active = [voice for voice in self.voices if voice.is_active()]
+        same_sound = [voice for voice in active if voice.name == name]
+
+        if len(same_sound) >= max_voices:
+            voice = min(same_sound, key=lambda voice: voice.started)
+            self.stats['stolen'] += 1
+        else:
+            voice = next((voice for voice in self.voices if voice.name is None), None)
+            if voice is None:
+                candidates = [voice for voice in active if voice.priority <= priority]
+                if not candidates:
+                    self.stats['dropped'] += 1
+                    return None
+                voice = min(candidates, key=lambda voice: (voice.priority, voice.started))
+                self.stats['stolen'] += 1
+
+        voice.channel.play(sound)
+        voice.name = name
+        voice.priority = priority
+        voice.started = next(self.sequence)
+        self.stats['played'] += 1
+        return voice.channel
+
+    def active_count(self, name=None):
+        return len([voice for voice in self.voices
+                    if voice.is_active() and (name is None or voice.name == name)])
+
+    def stop(self):
+        for voice in self.voices:
+            voice.channel.stop()
+            voice.name = None
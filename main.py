@@ -1,5 +1,6 @@
 import sys
 import os
+import argparse
 
 
 try:
@@ -20,8 +21,44 @@ except ImportError:
     sys.exit(1)
 
 from game.bomberman_game import BombermanGame
+from game.log import setup_logging
+from game.tracer import DEFAULT_TRACE_PATH
+from game.replay import DEFAULT_REPLAY_PATH
+
+def parse_speed(value):
+    # 0 = sem limite de quadros
+    if value == "max":
+        return 0
+    try:
+        speed = int(value)
+    except ValueError:
+        speed = 0
+    if speed <= 0:
+        raise argparse.ArgumentTypeError(f"velocidade inválida: {value!r} (use um inteiro positivo ou max)")
+    return speed
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="BOOM na Terra de Ooo")
+    parser.add_argument("--speed", type=parse_speed, default=1,
+                        help="velocidade da simulação: 1, 2, 4 ou max (sem limite)")
+    parser.add_argument("--render-every", type=int, default=1,
+                        help="renderiza apenas 1 a cada N quadros")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="atualiza só as regiões alteradas da tela (bom para renderização por software)")
+    parser.add_argument("--profile", action="store_true",
+                        help="mede o tempo de cada subsistema por quadro (F3 mostra o painel)")
+    parser.add_argument("--trace", nargs="?", const=DEFAULT_TRACE_PATH, default=None, metavar="ARQUIVO",
+                        help=f"grava um trace (Chrome Trace Event JSON) dos quadros e da inicialização "
+                             f"(padrão: {DEFAULT_TRACE_PATH})")
+    parser.add_argument("--record", nargs="?", const=DEFAULT_REPLAY_PATH, default=None, metavar="ARQUIVO",
+                        help=f"grava as entradas e sementes das partidas para reprodução com python -m game.replay "
+                             f"(padrão: {DEFAULT_REPLAY_PATH})")
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+    time_scale = args.speed
+    setup_logging()
 
     pygame.init()
     pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
@@ -37,7 +74,9 @@ def main():
     except:
         pass  
 
-    game = BombermanGame(screen)
+    game = BombermanGame(screen, time_scale=time_scale, render_every=args.render_every,
+                         dirty_rects=args.dirty_rects, profile=args.profile,
+                         trace=args.trace, record=args.record)
     game.run()
     pygame.quit()
     sys.exit()